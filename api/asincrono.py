@@ -0,0 +1,95 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from proyectos.condicional import ahuella
+from .condicional import relaciones_expandidas
+from .paginacion import PaginacionCursor
+from .precarga import aplicar_precarga
+
+
+# Lectura de la API con vistas async de Django (DRF no tiene vistas async). Bajo ASGI la
+# petición no ocupa un hilo mientras espera a la base de datos: cada consulta va por el
+# ORM asíncrono. Responden lo mismo que las vistas genéricas de DRF equivalentes, JSON
+# idéntico, mismos permisos (visible_to), paginación por cursor, ?fields / ?expand y
+# ETag / 304, pero solo en JSON (sin API navegable ni ?exportar).
+
+def _autenticar(request):
+    # Los autenticadores configurados en DRF (JWT y sesión), igual que en las vistas síncronas.
+    # Se ejecuta en un hilo: la sesión y la caché de permisos usan la base de datos.
+    drf_request = Request(request, authenticators=[clase() for clase in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    usuario = drf_request.user
+    if not usuario.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    return drf_request, usuario
+
+
+def _error(error, drf_request=None):
+    # Mismo cuerpo que el manejador de excepciones de DRF
+    datos = error.detail if isinstance(error.detail, (list, dict)) else {'detail': error.detail}
+    response = HttpResponse(JSONRenderer().render(datos), status=error.status_code, content_type='application/json')
+    if isinstance(error, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        # Como DRF: 401 con WWW-Authenticate si el primer autenticador lo define, si no 403
+        cabecera = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]().authenticate_header(drf_request)
+        if cabecera:
+            response['WWW-Authenticate'] = cabecera
+        else:
+            response.status_code = 403
+    return response
+
+
+class LecturaAsincronaView(View):
+    # GET de lista (sin pk) y de detalle (con pk) de `modelo` con `serializer_class`.
+    # Cada petición hace: autenticación (en un hilo), la consulta de la huella para el
+    # ETag y, si no hay 304, la página o el objeto con su precarga (ORM asíncrono).
+    modelo = None
+    serializer_class = None
+    pagination_class = PaginacionCursor
+    dependencias_condicionales = ('usuario',)
+    metodos_replica = ('GET', 'HEAD')  # Solo lectura: puede ir a una réplica (basedatos/router.py)
+
+    async def get(self, request, pk=None, *args, **kwargs):
+        try:
+            drf_request, usuario = await sync_to_async(_autenticar)(request)
+        except exceptions.APIException as error:
+            return _error(error, Request(request))
+
+        contexto = {'request': drf_request, 'view': self}
+        serializer = self.serializer_class(context=contexto)
+        queryset = aplicar_precarga(self.modelo.objects.visible_to(usuario), serializer)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+
+        relaciones = tuple(relaciones_expandidas(serializer))
+        extra = (request.get_full_path(), 'json')
+        etag, ultima = await ahuella(queryset, relaciones, extra, self.dependencias_condicionales)
+        if pk is not None and not relaciones and ultima is not None:
+            ultima = int(ultima.timestamp())
+        else:
+            ultima = None
+
+        response = get_conditional_response(request, etag=etag, last_modified=ultima)
+        if response is None:
+            if pk is None:
+                paginador = self.pagination_class()
+                pagina = await paginador.apaginate_queryset(queryset, drf_request, self)
+                datos = self.serializer_class(pagina, many=True, context=contexto).data
+                datos = paginador.get_paginated_response(datos).data
+            else:
+                objeto = await queryset.afirst()
+                if objeto is None:
+                    return _error(exceptions.NotFound())
+                datos = self.serializer_class(objeto, context=contexto).data
+            response = HttpResponse(JSONRenderer().render(datos), content_type='application/json')
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if ultima is not None:
+                response['Last-Modified'] = http_date(ultima)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
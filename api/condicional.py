@@ -0,0 +1,59 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import serializers
+
+from proyectos.condicional import huella
+
+
+def relaciones_expandidas(serializer, prefijo=''):
+    # Rutas ORM de las relaciones de Meta.expandibles que la petición pidió (?expand=)
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    rutas = []
+    for nombre in getattr(serializer.Meta, 'expandibles', []):
+        campo = serializer.fields.get(nombre)
+        if campo is not None:
+            ruta = prefijo + campo.source
+            rutas.append(ruta)
+            rutas.extend(relaciones_expandidas(campo, ruta + '__'))
+    return rutas
+
+
+class CondicionalMixin:
+    # Para vistas genéricas de DRF: ETag (y Last-Modified en el detalle) a partir de
+    # proyectos.condicional.huella. Si el cliente ya tiene la versión actual se responde
+    # 304 antes de serializar. Los usuarios anidados no cuelgan de las filas: entran a la
+    # huella como dependencia (MAX(fecha_actualizacion) y COUNT de la tabla).
+    # La comprobación usa get_queryset(): los permisos por objeto no se evalúan en un 304.
+    dependencias_condicionales = ('usuario',)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._condicional(request, queryset, False, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup]})
+        return self._condicional(request, queryset, True, super().retrieve, *args, **kwargs)
+
+    def _condicional(self, request, queryset, detalle, vista, *args, **kwargs):
+        relaciones = tuple(relaciones_expandidas(self.get_serializer()))
+        extra = (
+            request.get_full_path(),  # fields, expand, cursor, exportar...
+            request.accepted_renderer.format,
+        )
+        etag, ultima = huella(queryset, relaciones, extra, self.dependencias_condicionales)
+        if detalle and not relaciones and ultima is not None:
+            ultima = int(ultima.timestamp())  # Las fechas HTTP tienen resolución de segundos
+        else:
+            ultima = None  # En listados un borrado no mueve la fecha máxima: solo vale el ETag
+
+        response = get_conditional_response(request, etag=etag, last_modified=ultima)
+        if response is None:
+            response = vista(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if ultima is not None:
+                response['Last-Modified'] = http_date(ultima)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
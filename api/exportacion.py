@@ -0,0 +1,23 @@
+from proyectos.exportar import respuesta_exportacion
+
+
+class ExportacionMixin:
+    # Para ListAPIView: ?exportar=json|ndjson|csv devuelve todo el listado (sin paginar)
+    # en flujo. Se recorre el queryset con .iterator() por bloques, que conserva el
+    # prefetch_related del planificador, y se serializa objeto por objeto.
+    tamano_bloque_exportacion = 500
+
+    def list(self, request, *args, **kwargs):
+        formato = request.query_params.get('exportar')
+        if not formato:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        columnas = list(serializer.fields)
+        # Un solo serializador para todas las filas: los campos se resuelven una vez
+        filas = (
+            serializer.to_representation(objeto)
+            for objeto in queryset.iterator(chunk_size=self.tamano_bloque_exportacion)
+        )
+        return respuesta_exportacion(filas, formato, columnas, queryset.model._meta.model_name)
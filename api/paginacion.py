@@ -0,0 +1,45 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PaginacionCursor(CursorPagination):
+    # Paginación por llave (keyset): WHERE fecha_creacion < cursor en lugar de OFFSET,
+    # así que el costo de cada página no crece con la posición en la tabla.
+    # Los empates en fecha_creacion los resuelve DRF dentro del cursor; -id fija el orden.
+    ordering = ('-fecha_creacion', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # Para vistas async: la misma lógica de CursorPagination.paginate_queryset, pero la
+        # página se lee con el ORM asíncrono. Una primera pasada solo averigua el recorte
+        # (orden, filtro por posición y OFFSET); la segunda recibe las filas ya leídas.
+        try:
+            return self.paginate_queryset(_ConsultaDiferida(queryset), request, view)
+        except _Recorte as recorte:
+            filas = [fila async for fila in recorte.queryset]
+        return self.paginate_queryset(_ConsultaDiferida(queryset, filas), request, view)
+
+
+class _Recorte(Exception):
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+
+class _ConsultaDiferida:
+    # Ocupa el lugar del queryset en paginate_queryset: encadena order_by() y filter() y al
+    # recortar devuelve las filas leídas o, si aún no las hay, entrega el recorte en _Recorte
+    def __init__(self, queryset, filas=None):
+        self.queryset = queryset
+        self.filas = filas
+
+    def order_by(self, *campos):
+        return _ConsultaDiferida(self.queryset.order_by(*campos), self.filas)
+
+    def filter(self, *args, **kwargs):
+        return _ConsultaDiferida(self.queryset.filter(*args, **kwargs), self.filas)
+
+    def __getitem__(self, recorte):
+        if self.filas is None:
+            raise _Recorte(self.queryset[recorte])
+        return self.filas
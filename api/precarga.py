@@ -0,0 +1,64 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+# Planificador de precarga: recorre el árbol de un serializador y arma los
+# select_related / prefetch_related necesarios para que serializar N objetos
+# cueste un número constante de consultas (una por cada relación "muchos").
+
+def _campos(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer.Meta.model, serializer.fields.values()
+
+
+def planificar_precarga(serializer, prefijo=''):
+    """Devuelve (select_related, prefetch_related) para el serializador dado."""
+    modelo, campos = _campos(serializer)
+    select, prefetch = [], []
+
+    for campo in campos:
+        if campo.write_only or campo.source == '*' or '.' in campo.source:
+            continue
+        try:
+            relacion = modelo._meta.get_field(campo.source)
+        except Exception:
+            continue  # Propiedades o métodos del modelo: nada que precargar
+        if not relacion.is_relation:
+            continue
+
+        ruta = prefijo + campo.source
+        anidado = isinstance(campo, (serializers.BaseSerializer, serializers.ManyRelatedField))
+        if relacion.many_to_many or relacion.one_to_many:
+            if isinstance(campo, serializers.ListSerializer) and isinstance(campo.child, serializers.ModelSerializer):
+                # Relación "muchos" anidada: su propio queryset con su propio plan
+                queryset = aplicar_precarga(campo.child.Meta.model._default_manager.all(), campo.child)
+                prefetch.append(Prefetch(ruta, queryset=queryset))
+            elif anidado:
+                prefetch.append(ruta)
+        elif isinstance(campo, serializers.ModelSerializer):
+            # FK / OneToOne anidado: se resuelve con un JOIN y se sigue bajando
+            select.append(ruta)
+            sub_select, sub_prefetch = planificar_precarga(campo, prefijo=ruta + '__')
+            select.extend(sub_select)
+            prefetch.extend(sub_prefetch)
+        elif not isinstance(campo, serializers.PrimaryKeyRelatedField):
+            # StringRelatedField, SlugRelatedField...: necesitan la fila relacionada
+            select.append(ruta)
+    return select, prefetch
+
+
+def aplicar_precarga(queryset, serializer):
+    select, prefetch = planificar_precarga(serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class PrecargaMixin:
+    # Para vistas genéricas de DRF: aplica al queryset el plan del serializador de la vista
+
+    def get_queryset(self):
+        return aplicar_precarga(super().get_queryset(), self.get_serializer())
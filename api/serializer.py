@@ -1,11 +1,54 @@
 from rest_framework import serializers
 from usuarios.models import Usuario
 from proyectos.models import Proyecto, Tarea, Comentario
+from notificaciones.models import Notificacion
+from auditoria.models import RegistroCambio
 
 # from .serializers import RegisterSerializer
 from rest_framework.permissions import AllowAny
 
 
+class CamposDinamicosMixin:
+    # Permite respuestas parciales desde la URL:
+    #   ?fields=id,nombre            -> solo esos campos en el nivel superior
+    #   ?expand=tareas.comentarios   -> incluye las relaciones listadas en Meta.expandibles
+    # Las relaciones expandibles se omiten salvo que se pidan, lo que también
+    # evita sus consultas (ver api.precarga). Sin request en el contexto se devuelve todo.
+
+    def get_fields(self):
+        campos = super().get_fields()
+        request = self.context.get('request')
+        if request is None:
+            return campos
+
+        parametros = getattr(request, 'query_params', request.GET)
+        ruta = self._ruta()
+        expand = set()
+        for valor in parametros.get('expand', '').split(','):
+            partes = [p for p in valor.strip().split('.') if p]
+            # 'tareas.comentarios' implica 'tareas'
+            expand.update('.'.join(partes[:i]) for i in range(1, len(partes) + 1))
+
+        for nombre in getattr(self.Meta, 'expandibles', []):
+            if f'{ruta}.{nombre}'.lstrip('.') not in expand:
+                campos.pop(nombre, None)
+
+        fields = parametros.get('fields')
+        if fields and not ruta and request.method in ('GET', 'HEAD'):
+            permitidos = {f.strip() for f in fields.split(',')}
+            campos = {nombre: campo for nombre, campo in campos.items() if nombre in permitidos}
+        return campos
+
+    def _ruta(self):
+        # Nombre del campo anidado desde la raíz, p. ej. 'tareas.comentarios'
+        nombres, nodo = [], self
+        while nodo.parent is not None:
+            if nodo.field_name:
+                nombres.append(nodo.field_name)
+            nodo = nodo.parent
+        return '.'.join(reversed(nombres))
+
+
 class BasicUsuarioSerializer(serializers.ModelSerializer):
     class Meta:
         model = Usuario
@@ -13,7 +56,7 @@ class BasicUsuarioSerializer(serializers.ModelSerializer):
 
 
 # Serializador para Comentario
-class ComentarioSerializer(serializers.ModelSerializer):
+class ComentarioSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     autor = BasicUsuarioSerializer(read_only=True) # Muestra el usuario completo, no solo el ID
     # Si se quiere permitir que se asigne el autor al crear, tendrías que usar:
     # autor = serializers.PrimaryKeyRelatedField(queryset=Usuario.objects.all(), required=False, allow_null=True)
@@ -25,7 +68,7 @@ class ComentarioSerializer(serializers.ModelSerializer):
 
 
 # Serializador para Tarea
-class TareaSerializer(serializers.ModelSerializer):
+class TareaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     asignado_a = BasicUsuarioSerializer(read_only=True) # Muestra el usuario asignado
     creado_por = BasicUsuarioSerializer(read_only=True) # Muestra el usuario creador
     # Si se quiere que se pueda asignar a un usuario por ID al crear/editar:
@@ -41,10 +84,11 @@ class TareaSerializer(serializers.ModelSerializer):
             'fecha_creacion', 'fecha_actualizacion', 'comentarios'
         ]
         read_only_fields = ['fecha_creacion', 'fecha_actualizacion', 'creado_por', 'comentarios']
+        expandibles = ['comentarios']  # Solo con ?expand=comentarios
 
 
 # Serializador para Proyecto
-class ProyectoSerializer(serializers.ModelSerializer):
+class ProyectoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     creado_por = BasicUsuarioSerializer(read_only=True) # Muestra el usuario creador
     colaboradores = BasicUsuarioSerializer(many=True, read_only=True) # Lista de colaboradores
     # Si se quiere que se puedan asignar colaboradores por ID al crear/editar:
@@ -60,6 +104,7 @@ class ProyectoSerializer(serializers.ModelSerializer):
             'fecha_creacion', 'fecha_actualizacion', 'tareas'
         ]
         read_only_fields = ['fecha_creacion', 'fecha_actualizacion', 'creado_por', 'tareas']
+        expandibles = ['tareas']  # Solo con ?expand=tareas (o tareas.comentarios)
 
     # Método para manejar el campo de colaboradores al crear/actualizar
     # DRF automáticamente gestiona las relaciones ManyToMany si los IDs están en el campo
@@ -75,4 +120,32 @@ class ProyectoSerializer(serializers.ModelSerializer):
         instance = super().update(instance, validated_data)
         if colaboradores_data is not None:
             instance.colaboradores.set(colaboradores_data)
-        return instance
\ No newline at end of file
+        return instance
+
+# Serializador para la carga masiva de tareas (TareaMasivaAPIView)
+class TareaMasivaSerializer(serializers.ModelSerializer):
+    # Las FK llegan como ids y la vista verifica su existencia en bloque,
+    # así validar N tareas no cuesta N consultas.
+    id = serializers.IntegerField(required=False)
+    proyecto = serializers.IntegerField(source='proyecto_id')
+    asignado_a = serializers.IntegerField(source='asignado_a_id', required=False, allow_null=True)
+
+    class Meta:
+        model = Tarea
+        fields = ['id', 'proyecto', 'nombre', 'descripcion', 'estado', 'fecha_vencimiento', 'asignado_a']
+
+
+# Serializador para la bandeja de notificaciones
+class NotificacionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notificacion
+        fields = ['id', 'tipo', 'mensaje', 'tarea', 'leida', 'fecha_creacion']
+        read_only_fields = fields
+
+
+# Serializador para el diario de cambios (solo lectura)
+class RegistroCambioSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RegistroCambio
+        fields = ['id', 'modelo', 'objeto_id', 'accion', 'cambios', 'usuario', 'fecha']
+        read_only_fields = fields
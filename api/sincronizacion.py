@@ -0,0 +1,107 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from proyectos.models import Proyecto, Tarea, Comentario, RegistroBorrado
+from .precarga import aplicar_precarga
+from .serializer import ProyectoSerializer, TareaSerializer, ComentarioSerializer
+
+
+# Sincronización incremental: "todo lo que cambió desde el cursor".
+# Cada fuente se recorre por llave (fecha, id) en orden ascendente, y el cursor guarda
+# la última posición entregada de cada una. Solo se entregan filas con fecha anterior a
+# ahora - MARGEN: una transacción que sella fecha_actualizacion = t y confirma más tarde
+# seguirá entrando si confirma antes de t + MARGEN. Así el cursor solo avanza y ninguna
+# escritura concurrente queda detrás de él. El precio es ver los cambios MARGEN segundos tarde.
+# fecha_actualizacion la fija Django al guardar: el margen también cubre el desfase de
+# reloj entre servidores.
+# Cada usuario recibe solo lo que ve (visible_to). Las lápidas no se filtran (son solo
+# ids). Quien entra a un proyecto recibe el proyecto, cuya fecha cambia con los
+# colaboradores, pero no sus tareas anteriores: el cliente debe sincronizar de nuevo
+# sin cursor cuando aparece un proyecto que no tenía.
+
+MARGEN = timedelta(seconds=getattr(settings, 'SINCRONIZACION_MARGEN', 5))
+RETENCION = timedelta(days=getattr(settings, 'SINCRONIZACION_RETENCION_DIAS', 30))
+
+# Con USE_TZ = False (settings-server.py) las fechas de la base son ingenuas
+INICIO = datetime(1970, 1, 1, tzinfo=dt_timezone.utc if settings.USE_TZ else None)
+
+# nombre en la respuesta -> (modelo, campo de fecha, serializador)
+FUENTES = {
+    'proyectos': (Proyecto, 'fecha_actualizacion', ProyectoSerializer),
+    'tareas': (Tarea, 'fecha_actualizacion', TareaSerializer),
+    'comentarios': (Comentario, 'fecha_actualizacion', ComentarioSerializer),
+    'borrados': (RegistroBorrado, 'fecha_borrado', None),
+}
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+def leer_cursor(texto):
+    """Decodifica el cursor opaco; sin cursor se empieza desde el principio."""
+    if not texto:
+        return {nombre: (INICIO, 0) for nombre in FUENTES}
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(texto.encode()))
+        posiciones = {nombre: (datetime.fromisoformat(datos[nombre][0]), int(datos[nombre][1])) for nombre in FUENTES}
+    except (ValueError, KeyError, TypeError, IndexError):
+        raise CursorInvalido('Cursor de sincronización inválido.')
+    if any(timezone.is_aware(fecha) != settings.USE_TZ for fecha, _ in posiciones.values()):
+        raise CursorInvalido('Cursor de sincronización inválido.')
+    return posiciones
+
+
+def crear_cursor(posiciones):
+    datos = {nombre: [fecha.isoformat(), ident] for nombre, (fecha, ident) in posiciones.items()}
+    return base64.urlsafe_b64encode(json.dumps(datos, separators=(',', ':')).encode()).decode()
+
+
+def cursor_caducado(posiciones):
+    # Las lápidas más antiguas que RETENCION se purgan: ese cliente debe sincronizar desde cero
+    fecha = posiciones['borrados'][0]
+    return fecha != INICIO and fecha < timezone.now() - RETENCION
+
+
+def _pagina(queryset, campo, posicion, corte, limite):
+    fecha, ident = posicion
+    queryset = queryset.filter(
+        Q(**{f'{campo}__gt': fecha}) | Q(**{campo: fecha, 'pk__gt': ident}),
+        **{f'{campo}__lt': corte},
+    ).order_by(campo, 'pk')
+    filas = list(queryset[:limite + 1])
+    if len(filas) > limite:
+        filas = filas[:limite]
+        return filas, (getattr(filas[-1], campo), filas[-1].pk), True
+    # Todo lo anterior al corte ya se entregó; max() mantiene el cursor monótono
+    # aunque el reloj de otro servidor vaya atrasado
+    return filas, max(posicion, (corte, 0)), False
+
+
+def sincronizar(posiciones, limite, contexto):
+    """Cambios posteriores a `posiciones` (ver leer_cursor), hasta `limite` filas por fuente.
+
+    El cliente aplica primero las altas/ediciones y luego los borrados. Si 'mas' es True
+    debe volver a pedir de inmediato con el nuevo cursor.
+    """
+    corte = timezone.now() - MARGEN
+    respuesta, nuevas, mas = {}, {}, False
+    for nombre, (modelo, campo, clase) in FUENTES.items():
+        queryset = modelo._default_manager.all()
+        if clase is not None:
+            queryset = aplicar_precarga(queryset.visible_to(contexto['request'].user), clase(context=contexto))
+        filas, nuevas[nombre], truncado = _pagina(queryset, campo, posiciones[nombre], corte, limite)
+        mas = mas or truncado
+        if clase is not None:
+            respuesta[nombre] = clase(filas, many=True, context=contexto).data
+        else:
+            borrados = {modelo: [] for modelo, _ in RegistroBorrado.MODELO_CHOICES}
+            for fila in filas:
+                borrados[fila.modelo].append(fila.objeto_id)
+            respuesta[nombre] = borrados
+    return {'cursor': crear_cursor(nuevas), 'mas': mas, **respuesta}
@@ -1,3 +1,118 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from proyectos.models import Comentario, Proyecto, Tarea
+from usuarios.models import Usuario
+
+
+class TareaMasivaIdsTests(APITestCase):
+    url = '/api/tareas/masivo/'
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        proyecto = Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.usuario)
+        self.tarea = Tarea.objects.create(proyecto=proyecto, nombre='T1', creado_por=self.usuario)
+        self.client.force_authenticate(self.usuario)
+
+    def test_ids_invalidos_responden_400(self):
+        for ids in (['abc'], [1.5], 'abc', [], [None], [True], [10 ** 30], {'1': 1}):
+            for metodo in ('delete', 'patch'):
+                with self.subTest(ids=ids, metodo=metodo):
+                    response = getattr(self.client, metodo)(self.url, {'ids': ids, 'estado': 'completada'},
+                                                            format='json')
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('ids', response.data)
+        self.assertTrue(Tarea.objects.filter(pk=self.tarea.pk).exists())
+
+    def test_ids_limitados_a_max_elementos(self):
+        response = self.client.delete(self.url, {'ids': list(range(1, 5002))}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_ids_como_texto_numerico(self):
+        response = self.client.delete(self.url, {'ids': [str(self.tarea.pk)]}, format='json')
+        self.assertEqual(response.data, {'eliminadas': 1})
+
+
+class DatosVisibilidad:
+    # El colaborador participa en "propio"; "otro" es de un usuario ajeno
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dueno = Usuario.objects.create_user('dueno', password='clave', rol='colaborador')
+        cls.colaborador = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        cls.ajeno = Usuario.objects.create_user('ajeno', password='clave', rol='colaborador')
+        cls.propio = Proyecto.objects.create(nombre='Propio', fecha_inicio=date(2025, 1, 1), creado_por=cls.dueno)
+        cls.propio.colaboradores.add(cls.colaborador)
+        cls.otro = Proyecto.objects.create(nombre='Otro', fecha_inicio=date(2025, 1, 1), creado_por=cls.ajeno)
+        cls.tarea_propia = Tarea.objects.create(proyecto=cls.propio, nombre='Tarea propia', creado_por=cls.dueno)
+        cls.tarea_otra = Tarea.objects.create(proyecto=cls.otro, nombre='Tarea otra', creado_por=cls.ajeno)
+        cls.comentario_otro = Comentario.objects.create(tarea=cls.tarea_otra, autor=cls.ajeno, contenido='b')
+
+    def setUp(self):
+        self.client.force_authenticate(self.colaborador)
+
+
+class VisibilidadAPITests(DatosVisibilidad, APITestCase):
+
+    def test_detalle_de_objetos_ajenos_responde_404(self):
+        for url in (f'/api/proyectos/{self.otro.pk}/', f'/api/tareas/{self.tarea_otra.pk}/',
+                    f'/api/comentarios/{self.comentario_otro.pk}/'):
+            for metodo in ('get', 'patch', 'delete'):
+                with self.subTest(url=url, metodo=metodo):
+                    response = getattr(self.client, metodo)(url, {'nombre': 'X', 'contenido': 'X'}, format='json')
+                    self.assertEqual(response.status_code, 404)
+        self.otro.refresh_from_db()
+        self.assertEqual(self.otro.nombre, 'Otro')
+        self.assertTrue(Comentario.objects.filter(pk=self.comentario_otro.pk).exists())
+
+    def test_detalle_asincrono_de_objetos_ajenos_responde_404(self):
+        for url in (f'/api/async/proyectos/{self.otro.pk}/', f'/api/async/tareas/{self.tarea_otra.pk}/',
+                    f'/api/async/comentarios/{self.comentario_otro.pk}/'):
+            with self.subTest(url=url):
+                self.client.force_login(self.colaborador)
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_detalle_de_objetos_propios(self):
+        response = self.client.get(f'/api/tareas/{self.tarea_propia.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.tarea_propia.pk)
+
+
+class TareaMasivaVisibilidadTests(DatosVisibilidad, APITestCase):
+    url = '/api/tareas/masivo/'
+
+    def test_patch_por_ids_con_tarea_ajena_responde_400(self):
+        # Igual que la forma de lista: todo o nada, con el índice de cada id que no existe
+        response = self.client.patch(self.url, {'ids': [self.tarea_propia.pk, self.tarea_otra.pk],
+                                                'estado': 'completado'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'errores': [{'indice': 1, 'errores': {'id': ['No existe.']}}]})
+        self.assertFalse(Tarea.objects.filter(estado='completado').exists())
+
+    def test_patch_por_ids_visibles(self):
+        response = self.client.patch(self.url, {'ids': [self.tarea_propia.pk], 'estado': 'completado'},
+                                     format='json')
+        self.assertEqual(response.data, {'actualizadas': 1})
+        self.tarea_propia.refresh_from_db()
+        self.assertEqual(self.tarea_propia.estado, 'completado')
+
+    def test_patch_por_lista_con_tarea_ajena_responde_400(self):
+        response = self.client.patch(self.url, [{'id': self.tarea_propia.pk, 'nombre': 'A'},
+                                                {'id': self.tarea_otra.pk, 'nombre': 'B'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'errores': [{'indice': 1, 'errores': {'id': ['No existe.']}}]})
+        self.tarea_propia.refresh_from_db()
+        self.assertEqual(self.tarea_propia.nombre, 'Tarea propia')
+
+    def test_delete_no_borra_tareas_ajenas(self):
+        response = self.client.delete(self.url, {'ids': [self.tarea_otra.pk]}, format='json')
+        self.assertEqual(response.data, {'eliminadas': 0})
+        self.assertTrue(Tarea.objects.filter(pk=self.tarea_otra.pk).exists())
+
+    def test_post_en_proyecto_ajeno_responde_400(self):
+        response = self.client.post(self.url, [{'proyecto': self.propio.pk, 'nombre': 'A'},
+                                               {'proyecto': self.otro.pk, 'nombre': 'B'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errores'], [{'indice': 1, 'errores': {'proyecto': ['No existe.']}}])
+        self.assertFalse(Tarea.objects.filter(nombre__in=['A', 'B']).exists())
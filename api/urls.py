@@ -0,0 +1,74 @@
+from django.urls import path
+
+from auditoria.views import RegistroCambioListAPIView
+from busqueda.views import BusquedaAPIView
+from rendimiento.views import (
+    MetricasAPIView,
+    MetricasPrometheusAPIView,
+    PerfilListAPIView,
+    PerfilActivarAPIView,
+    PerfilDetalleAPIView,
+    PerfilDescargaAPIView,
+)
+from notificaciones.views import (
+    NotificacionListAPIView,
+    NotificacionNoLeidasAPIView,
+    NotificacionMarcarLeidaAPIView,
+)
+
+# Las vistas de API viven en proyectos/views.py
+from proyectos.views import (
+    ProyectoListCreateAPIView,
+    ProyectoRetrieveUpdateDestroyAPIView,
+    TareaListCreateAPIView,
+    TareaRetrieveUpdateDestroyAPIView,
+    TareaMasivaAPIView,
+    SincronizacionAPIView,
+    EstadisticasAPIView,
+    EstadisticasProyectoAPIView,
+    ComentarioListCreateAPIView,
+    ComentarioRetrieveUpdateDestroyAPIView,
+    ProyectoLecturaAsyncView,
+    TareaLecturaAsyncView,
+    ComentarioLecturaAsyncView,
+)
+
+urlpatterns = [
+    path('proyectos/', ProyectoListCreateAPIView.as_view(), name='api_proyecto_list_create'),
+    path('proyectos/<int:pk>/', ProyectoRetrieveUpdateDestroyAPIView.as_view(),
+         name='api_proyecto_retrieve_update_destroy'),
+    path('tareas/', TareaListCreateAPIView.as_view(), name='api_tarea_list_create'),
+    path('tareas/<int:pk>/', TareaRetrieveUpdateDestroyAPIView.as_view(),
+         name='api_tarea_retrieve_update_destroy'),
+    path('tareas/masivo/', TareaMasivaAPIView.as_view(), name='api_tarea_masivo'),
+    path('comentarios/', ComentarioListCreateAPIView.as_view(), name='api_comentario_list_create'),
+    path('comentarios/<int:pk>/', ComentarioRetrieveUpdateDestroyAPIView.as_view(),
+         name='api_comentario_retrieve_update_destroy'),
+    # Solo lectura con vistas async, para servir por ASGI (uvicorn gestionProyecto.asgi:application)
+    path('async/proyectos/', ProyectoLecturaAsyncView.as_view(), name='api_async_proyecto_list'),
+    path('async/proyectos/<int:pk>/', ProyectoLecturaAsyncView.as_view(), name='api_async_proyecto_detail'),
+    path('async/tareas/', TareaLecturaAsyncView.as_view(), name='api_async_tarea_list'),
+    path('async/tareas/<int:pk>/', TareaLecturaAsyncView.as_view(), name='api_async_tarea_detail'),
+    path('async/comentarios/', ComentarioLecturaAsyncView.as_view(), name='api_async_comentario_list'),
+    path('async/comentarios/<int:pk>/', ComentarioLecturaAsyncView.as_view(), name='api_async_comentario_detail'),
+
+    path('sincronizar/', SincronizacionAPIView.as_view(), name='api_sincronizar'),
+    path('estadisticas/', EstadisticasAPIView.as_view(), name='api_estadisticas'),
+    path('estadisticas/proyectos/<int:pk>/', EstadisticasProyectoAPIView.as_view(),
+         name='api_estadisticas_proyecto'),
+
+    path('notificaciones/', NotificacionListAPIView.as_view(), name='api_notificacion_list'),
+    path('notificaciones/no-leidas/', NotificacionNoLeidasAPIView.as_view(), name='api_notificacion_no_leidas'),
+    path('notificaciones/leer/', NotificacionMarcarLeidaAPIView.as_view(), name='api_notificacion_leer'),
+
+    path('auditoria/', RegistroCambioListAPIView.as_view(), name='api_auditoria_list'),
+    path('buscar/', BusquedaAPIView.as_view(), name='api_buscar'),
+    path('metricas/', MetricasAPIView.as_view(), name='api_metricas'),
+    path('metricas/prometheus/', MetricasPrometheusAPIView.as_view(), name='api_metricas_prometheus'),
+    path('perfiles/', PerfilListAPIView.as_view(), name='api_perfil_list'),
+    path('perfiles/activar/', PerfilActivarAPIView.as_view(), name='api_perfil_activar'),
+    path('perfiles/<str:perfil>/', PerfilDetalleAPIView.as_view(), name='api_perfil_detalle'),
+    path('perfiles/<str:perfil>/pstats/', PerfilDescargaAPIView.as_view(formato='pstats'), name='api_perfil_pstats'),
+    path('perfiles/<str:perfil>/colapsado/', PerfilDescargaAPIView.as_view(formato='colapsado'),
+         name='api_perfil_colapsado'),
+]
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import RegistroCambio, RegistroCambioArchivo
+
+
+class DiarioAdmin(admin.ModelAdmin):
+    # Solo lectura: el diario no se edita a mano
+    list_display = ('fecha', 'modelo', 'objeto_id', 'accion', 'usuario')
+    list_filter = ('modelo', 'accion')
+    search_fields = ('=objeto_id',)
+    date_hierarchy = 'fecha'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(RegistroCambio, DiarioAdmin)
+admin.site.register(RegistroCambioArchivo, DiarioAdmin)
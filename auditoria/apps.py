@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class AuditoriaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'auditoria'
+    verbose_name = "Auditoría"
+
+    def ready(self):
+        # Diario de cambios de Proyecto, Tarea y Usuario a partir de sus señales
+        from . import signals  # noqa: F401
@@ -0,0 +1,118 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class EscritorLotes:
+    # Escribe los RegistroCambio fuera de la petición: las señales encolan en memoria
+    # y un hilo por proceso los inserta con bulk_create cada `intervalo` segundos o cada
+    # `tamano_lote` registros. Si la cola se llena, quien encola vacía la cola él mismo
+    # (contrapresión en lugar de perder registros). Un lote que no se pudo escribir (p. ej.
+    # SQLite bloqueado) no se descarta: vuelve al frente y el hilo lo reintenta con espera
+    # creciente. Al salir del proceso se vacía lo pendiente.
+
+    def __init__(self, tamano_lote=200, intervalo=1.0, maximo=10000):
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self._cola = queue.Queue(maxsize=maximo)
+        self._reintentos = deque()  # Registros de lotes fallidos, antes que los de la cola
+        self._candado = threading.Lock()
+        self._pid = None
+
+    def encolar(self, registro):
+        if not getattr(settings, 'AUDITORIA_ASINCRONA', True):
+            if not self._escribir([registro]):
+                self._arrancar()  # Queda en _reintentos para el hilo
+            return
+        self._arrancar()
+        try:
+            self._cola.put_nowait(registro)
+        except queue.Full:
+            self.vaciar()
+            try:
+                self._cola.put_nowait(registro)
+            except queue.Full:
+                self._reintentos.append(registro)  # La base no acepta escrituras: espera con los fallidos
+
+    def vaciar(self):
+        """Escribe ya todo lo pendiente (salida del proceso, comandos, pruebas)."""
+        while True:
+            lote = self._tomar(bloquear=False)
+            if not lote:
+                return True
+            if not self._escribir(lote):
+                return False  # Lo que falta sigue en _reintentos
+
+    def _vaciar_al_salir(self):
+        if not self.vaciar():
+            logger.error('Se pierden %d registros de auditoría sin escribir al salir del proceso',
+                         len(self._reintentos) + self._cola.qsize())
+
+    def _arrancar(self):
+        # Un hilo por proceso; tras un fork (gunicorn --preload) el hilo del padre no existe
+        if self._pid == os.getpid():
+            return
+        with self._candado:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._bucle, name='auditoria-escritor', daemon=True).start()
+                self._pid = os.getpid()
+
+    def _tomar(self, bloquear):
+        lote = []
+        try:
+            while len(lote) < self.tamano_lote:
+                lote.append(self._reintentos.popleft())
+        except IndexError:
+            pass
+        try:
+            if bloquear and not lote:
+                lote.append(self._cola.get(timeout=self.intervalo))
+            while len(lote) < self.tamano_lote:
+                lote.append(self._cola.get_nowait())
+        except queue.Empty:
+            pass
+        return lote
+
+    def _bucle(self):
+        espera = self.intervalo
+        while True:
+            lote = self._tomar(bloquear=True)
+            if not lote:
+                continue
+            if self._escribir(lote):
+                espera = self.intervalo
+            else:
+                time.sleep(espera)
+                espera = min(espera * 2, 60)
+            close_old_connections()  # El hilo conserva su conexión: que respete CONN_MAX_AGE
+
+    def _escribir(self, lote, reintentos=3):
+        # False si no se pudo: el lote vuelve al frente de _reintentos, en el mismo orden
+        from .models import RegistroCambio
+        for intento in range(reintentos):
+            try:
+                RegistroCambio.objects.bulk_create(lote, batch_size=self.tamano_lote)
+                return True
+            except Exception:
+                if intento == reintentos - 1:
+                    logger.exception('No se pudieron escribir %d registros de auditoría; se reintentará', len(lote))
+                    self._reintentos.extendleft(reversed(lote))
+                    return False
+                close_old_connections()
+                time.sleep(0.1 * 2 ** intento)  # p. ej. SQLite bloqueado por otra escritura
+
+
+escritor = EscritorLotes(
+    tamano_lote=getattr(settings, 'AUDITORIA_TAMANO_LOTE', 200),
+    intervalo=getattr(settings, 'AUDITORIA_INTERVALO', 1.0),
+)
+atexit.register(escritor._vaciar_al_salir)
@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from auditoria.escritor import escritor
+from auditoria.models import RegistroCambio, RegistroCambioArchivo
+
+CAMPOS = ['modelo', 'objeto_id', 'accion', 'cambios', 'usuario_id', 'fecha']
+
+
+# Con --archivo las filas se escriben antes de confirmar el borrado; si el borrado falla
+# (bloqueo, deadlock con el escritor) siguen en la tabla y la siguiente ejecución las vuelve a
+# leer. <archivo>.ultimo_id guarda el último id escrito y lo que no pase de él no se repite.
+
+def _leer_ultimo(ruta):
+    try:
+        with open(f'{ruta}.ultimo_id', encoding='utf-8') as marca:
+            return int(marca.read())
+    except FileNotFoundError:
+        return 0
+
+
+def _guardar_ultimo(ruta, ultimo):
+    temporal = f'{ruta}.ultimo_id.tmp'
+    with open(temporal, 'w', encoding='utf-8') as marca:
+        marca.write(str(ultimo))
+        marca.flush()
+        os.fsync(marca.fileno())
+    os.replace(temporal, f'{ruta}.ultimo_id')
+
+
+class Command(BaseCommand):
+    help = ('Mueve los registros de auditoría más antiguos que --dias de la tabla caliente a '
+            'RegistroCambioArchivo (o a un archivo .jsonl.gz con --archivo), por lotes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=90, help='Antigüedad a partir de la cual se archiva')
+        parser.add_argument('--lote', type=int, default=5000, help='Filas movidas por transacción')
+        parser.add_argument('--archivo', help='Exporta a este .jsonl.gz en lugar de a la tabla de archivo')
+
+    def handle(self, *args, **options):
+        escritor.vaciar()
+        corte = timezone.now() - timedelta(days=options['dias'])
+        salida = gzip.open(options['archivo'], 'at', encoding='utf-8') if options['archivo'] else None
+        ultimo = _leer_ultimo(options['archivo']) if salida is not None else 0
+        movidos = 0
+        try:
+            while True:
+                # Lotes por id (clave primaria): cada transacción es corta y no bloquea al escritor
+                with transaction.atomic():
+                    filas = list(RegistroCambio.objects.filter(fecha__lt=corte)
+                                 .order_by('id').values('id', *CAMPOS)[:options['lote']])
+                    if not filas:
+                        break
+                    if salida is not None:
+                        for fila in filas:
+                            if fila['id'] > ultimo:
+                                salida.write(json.dumps(fila, cls=DjangoJSONEncoder) + '\n')
+                        salida.flush()
+                        ultimo = max(ultimo, filas[-1]['id'])
+                        _guardar_ultimo(options['archivo'], ultimo)
+                    else:
+                        RegistroCambioArchivo.objects.bulk_create(
+                            [RegistroCambioArchivo(**{campo: fila[campo] for campo in CAMPOS}) for fila in filas])
+                    RegistroCambio.objects.filter(id__in=[fila['id'] for fila in filas]).delete()
+                movidos += len(filas)
+                self.stdout.write(f'{movidos} registros archivados')
+        finally:
+            if salida is not None:
+                salida.close()
+        self.stdout.write(self.style.SUCCESS(f'Compactación terminada: {movidos} registros archivados'))
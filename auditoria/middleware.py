@@ -0,0 +1,45 @@
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+# Petición en curso, para que las señales sepan quién hizo el cambio sin recibir el request.
+# Se guarda la petición y no el usuario: con DRF el usuario (JWT) se autentica dentro de
+# la vista, y DRF lo copia a la petición de Django, así que se lee al registrar el cambio.
+_peticion_actual = ContextVar('peticion_actual', default=None)
+
+
+def usuario_actual():
+    """Id del usuario autenticado de la petición en curso, o None (comandos, shell)."""
+    peticion = _peticion_actual.get()
+    usuario = getattr(peticion, 'user', None)
+    if usuario is None or not usuario.is_authenticated:
+        return None
+    return usuario.pk
+
+
+class UsuarioActualMiddleware:
+    # ContextVar y no threading.local: también funciona con vistas async bajo ASGI
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _peticion_actual.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _peticion_actual.reset(token)
+
+    async def __acall__(self, request):
+        token = _peticion_actual.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _peticion_actual.reset(token)
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:15
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroCambio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=50)),
+                ('objeto_id', models.BigIntegerField()),
+                ('accion', models.CharField(choices=[('crear', 'Creación'), ('actualizar', 'Actualización'), ('borrar', 'Borrado')], max_length=20)),
+                ('cambios', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('fecha', models.DateTimeField()),
+                ('usuario', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Registro de cambio',
+                'verbose_name_plural': 'Registros de cambio',
+                'ordering': ['-fecha', '-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['modelo', 'objeto_id', 'fecha'], name='cambio_objeto_idx'), models.Index(fields=['usuario', 'fecha'], name='cambio_usuario_idx'), models.Index(fields=['fecha'], name='cambio_fecha_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RegistroCambioArchivo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=50)),
+                ('objeto_id', models.BigIntegerField()),
+                ('accion', models.CharField(choices=[('crear', 'Creación'), ('actualizar', 'Actualización'), ('borrar', 'Borrado')], max_length=20)),
+                ('cambios', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('fecha', models.DateTimeField()),
+                ('usuario', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Registro de cambio archivado',
+                'verbose_name_plural': 'Registros de cambio archivados',
+                'ordering': ['-fecha', '-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['modelo', 'objeto_id', 'fecha'], name='archivo_objeto_idx'), models.Index(fields=['usuario', 'fecha'], name='archivo_usuario_idx')],
+            },
+        ),
+    ]
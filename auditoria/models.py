@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CambioQuerySet(models.QuerySet):
+    # Consultas habituales del diario; cada una tiene su índice
+
+    def de_objeto(self, modelo, objeto_id):
+        return self.filter(modelo=modelo, objeto_id=objeto_id)
+
+    def de_usuario(self, usuario_id):
+        return self.filter(usuario_id=usuario_id)
+
+    def entre(self, desde=None, hasta=None):
+        queryset = self
+        if desde is not None:
+            queryset = queryset.filter(fecha__gte=desde)
+        if hasta is not None:
+            queryset = queryset.filter(fecha__lt=hasta)
+        return queryset
+
+
+class CambioBase(models.Model):
+    ACCION_CHOICES = (
+        ('crear', 'Creación'),
+        ('actualizar', 'Actualización'),
+        ('borrar', 'Borrado'),
+    )
+
+    modelo = models.CharField(max_length=50) # 'proyecto', 'tarea', 'usuario'
+    objeto_id = models.BigIntegerField()
+    accion = models.CharField(max_length=20, choices=ACCION_CHOICES)
+    # {campo: [antes, despues]}; en las operaciones masivas el valor anterior no se conoce (null)
+    cambios = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    # Sin restricción de clave foránea: el diario sobrevive al usuario y se escribe en diferido
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        null=True, blank=True
+    )
+    fecha = models.DateTimeField() # Momento del cambio, no de la escritura del lote
+
+    objects = CambioQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+        ordering = ['-fecha', '-id']
+
+    def __str__(self):
+        return f"{self.get_accion_display()} de {self.modelo} {self.objeto_id} ({self.fecha})"
+
+
+class RegistroCambio(CambioBase):
+    # Diario de solo anexado. Lo escribe auditoria.escritor por lotes; compactar_auditoria
+    # mueve lo antiguo a RegistroCambioArchivo para que esta tabla se mantenga pequeña.
+
+    class Meta(CambioBase.Meta):
+        verbose_name = "Registro de cambio"
+        verbose_name_plural = "Registros de cambio"
+        indexes = [
+            models.Index(fields=['modelo', 'objeto_id', 'fecha'], name='cambio_objeto_idx'),
+            models.Index(fields=['usuario', 'fecha'], name='cambio_usuario_idx'),
+            models.Index(fields=['fecha'], name='cambio_fecha_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('El diario de cambios es de solo anexado.')
+        super().save(*args, **kwargs)
+
+
+class RegistroCambioArchivo(CambioBase):
+    # Cambios antiguos (ver compactar_auditoria). Mismas consultas, tabla fría.
+
+    class Meta(CambioBase.Meta):
+        verbose_name = "Registro de cambio archivado"
+        verbose_name_plural = "Registros de cambio archivados"
+        indexes = [
+            models.Index(fields=['modelo', 'objeto_id', 'fecha'], name='archivo_objeto_idx'),
+            models.Index(fields=['usuario', 'fecha'], name='archivo_usuario_idx'),
+        ]
@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from proyectos.models import Proyecto, Tarea
+from proyectos.signals import tareas_masivas
+from usuarios.models import Usuario
+from .escritor import escritor
+from .middleware import usuario_actual
+from .models import RegistroCambio
+
+
+# Campos auditados por modelo (attname: las FK se guardan como id). Nunca la contraseña.
+CAMPOS_AUDITADOS = {
+    Proyecto: ['nombre', 'descripcion', 'fecha_inicio', 'fecha_fin', 'estado', 'creado_por_id'],
+    Tarea: ['proyecto_id', 'nombre', 'descripcion', 'estado', 'fecha_vencimiento', 'asignado_a_id', 'creado_por_id'],
+    Usuario: ['username', 'email', 'first_name', 'last_name', 'rol', 'is_active', 'is_staff', 'is_superuser'],
+}
+
+
+def registrar(modelo, objeto_id, accion, cambios):
+    registro = RegistroCambio(
+        modelo=modelo, objeto_id=objeto_id, accion=accion, cambios=cambios,
+        usuario_id=usuario_actual(), fecha=timezone.now(),
+    )
+    # Solo si la transacción se confirma; la escritura real va en lote (auditoria.escritor)
+    transaction.on_commit(lambda: escritor.encolar(registro))
+
+
+@receiver(pre_save, sender=Proyecto)
+@receiver(pre_save, sender=Tarea)
+@receiver(pre_save, sender=Usuario)
+def capturar_anterior(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._auditoria_anterior = None
+    if raw or instance._state.adding:
+        return
+    campos = CAMPOS_AUDITADOS[sender]
+    if update_fields is not None:
+        campos = [campo for campo in campos if campo in update_fields or campo.removesuffix('_id') in update_fields]
+        if not campos:
+            return  # p. ej. el login, que solo guarda last_login
+    # Una consulta por clave primaria con solo los campos auditados
+    instance._auditoria_anterior = sender._default_manager.filter(pk=instance.pk).values(*campos).first()
+
+
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=Tarea)
+@receiver(post_save, sender=Usuario)
+def registrar_guardado(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        cambios = {campo: [None, getattr(instance, campo)] for campo in CAMPOS_AUDITADOS[sender]}
+    else:
+        anterior = instance.__dict__.pop('_auditoria_anterior', None)
+        if anterior is None:
+            return
+        cambios = {
+            campo: [valor, getattr(instance, campo)]
+            for campo, valor in anterior.items() if valor != getattr(instance, campo)
+        }
+        if not cambios:
+            return
+    registrar(sender._meta.model_name, instance.pk, 'crear' if created else 'actualizar', cambios)
+
+
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=Usuario)
+def registrar_borrado(sender, instance, **kwargs):
+    cambios = {campo: [getattr(instance, campo), None] for campo in CAMPOS_AUDITADOS[sender]}
+    registrar(sender._meta.model_name, instance.pk, 'borrar', cambios)
+
+
+@receiver(m2m_changed, sender=Proyecto.colaboradores.through)
+def registrar_colaboradores(sender, instance, action, reverse, pk_set, **kwargs):
+    # Se registra siempre del lado del proyecto: {'colaboradores': [quitados, agregados]}
+    if action == 'pre_clear':
+        if reverse:
+            instance._auditoria_proyectos = list(instance.proyectos_colaborando.values_list('pk', flat=True))
+        else:
+            instance._auditoria_colaboradores = list(instance.colaboradores.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if action == 'post_clear':
+        if reverse:
+            pares = [(proyecto, [instance.pk]) for proyecto in getattr(instance, '_auditoria_proyectos', [])]
+        else:
+            pares = [(instance.pk, getattr(instance, '_auditoria_colaboradores', []))]
+    elif reverse:
+        pares = [(proyecto, [instance.pk]) for proyecto in pk_set]
+    else:
+        pares = [(instance.pk, sorted(pk_set))]
+
+    for proyecto, usuarios in pares:
+        if usuarios:
+            cambio = [[], usuarios] if action == 'post_add' else [usuarios, []]
+            registrar('proyecto', proyecto, 'actualizar', {'colaboradores': cambio})
+
+
+@receiver(tareas_masivas, sender=Tarea)
+def registrar_tareas_masivas(sender, accion, tareas, campos, usuario, **kwargs):
+    # bulk_create / bulk_update no pasan por pre_save: no hay valor anterior que comparar.
+    # Como en registrar(), se encola al confirmarse la transacción.
+    auditados = CAMPOS_AUDITADOS[Tarea]
+    if campos is not None:
+        auditados = [campo for campo in auditados if campo in campos or campo.removesuffix('_id') in campos]
+    ahora = timezone.now()
+    registros = [
+        RegistroCambio(
+            modelo='tarea', objeto_id=tarea.pk, accion=accion, usuario_id=usuario.pk, fecha=ahora,
+            cambios={campo: [None, getattr(tarea, campo)] for campo in auditados},
+        )
+        for tarea in tareas
+        if tarea.pk is not None  # bulk_create en MySQL no devuelve los ids
+    ]
+    transaction.on_commit(lambda: [escritor.encolar(registro) for registro in registros])
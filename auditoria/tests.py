@@ -0,0 +1,58 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from .escritor import EscritorLotes
+from .models import RegistroCambio
+
+
+def registro(objeto_id):
+    return RegistroCambio(modelo='tarea', objeto_id=objeto_id, accion='crear', cambios={}, fecha=timezone.now())
+
+
+class EscritorLotesTests(TestCase):
+
+    def test_un_lote_que_falla_no_se_pierde(self):
+        escritor = EscritorLotes(tamano_lote=10)
+        escritor._cola.put_nowait(registro(1))
+        escritor._cola.put_nowait(registro(2))
+        with mock.patch.object(RegistroCambio.objects, 'bulk_create', side_effect=OperationalError('database is locked')), \
+                mock.patch('auditoria.escritor.time.sleep'), self.assertLogs('auditoria.escritor', 'ERROR'):
+            self.assertFalse(escritor.vaciar())
+        self.assertEqual([r.objeto_id for r in escritor._reintentos], [1, 2])
+
+        escritor._cola.put_nowait(registro(3))
+        self.assertTrue(escritor.vaciar())
+        self.assertEqual(list(RegistroCambio.objects.order_by('id').values_list('objeto_id', flat=True)), [1, 2, 3])
+        self.assertFalse(escritor._reintentos)
+
+
+class CompactarAuditoriaTests(TestCase):
+
+    def test_un_borrado_fallido_no_duplica_el_archivo(self):
+        antigua = timezone.now() - timedelta(days=200)
+        RegistroCambio.objects.bulk_create([RegistroCambio(modelo='tarea', objeto_id=numero, accion='crear',
+                                                           cambios={}, fecha=antigua) for numero in range(3)])
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ruta = os.path.join(directorio.name, 'auditoria.jsonl.gz')
+
+        with mock.patch.object(QuerySet, 'delete', side_effect=OperationalError('database is locked')), \
+                self.assertRaises(OperationalError):
+            call_command('compactar_auditoria', archivo=ruta, lote=2, stdout=mock.Mock())
+        self.assertEqual(RegistroCambio.objects.count(), 3)
+
+        call_command('compactar_auditoria', archivo=ruta, lote=2, stdout=mock.Mock())
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            objetos = [json.loads(linea)['objeto_id'] for linea in archivo]
+        self.assertEqual(objetos, [0, 1, 2])
+        self.assertFalse(RegistroCambio.objects.exists())
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+
+from api.paginacion import PaginacionCursor
+from api.serializer import RegistroCambioSerializer
+from usuarios.permisos import EsAdministrador
+from .models import RegistroCambio
+
+
+class PaginacionDiario(PaginacionCursor):
+    ordering = ('-fecha', '-id')
+
+
+class RegistroCambioListAPIView(generics.ListAPIView):
+    # Diario de cambios, más reciente primero. Filtros (cada uno usa un índice):
+    #   ?modelo=tarea&objeto=5     historial de un objeto
+    #   ?usuario=3                 cambios hechos por un usuario
+    #   ?desde=...&hasta=...       rango de fechas ISO 8601 (hasta no incluido)
+    # Los cambios archivados por compactar_auditoria están en RegistroCambioArchivo.
+    serializer_class = RegistroCambioSerializer
+    pagination_class = PaginacionDiario
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get_queryset(self):
+        parametros = self.request.query_params
+        queryset = RegistroCambio.objects.all()
+        if parametros.get('modelo'):
+            queryset = queryset.filter(modelo=parametros['modelo'])
+        if parametros.get('objeto'):
+            queryset = queryset.filter(objeto_id=self._entero('objeto'))
+        if parametros.get('usuario'):
+            queryset = queryset.de_usuario(self._entero('usuario'))
+        return queryset.entre(self._fecha('desde'), self._fecha('hasta'))
+
+    def _entero(self, nombre):
+        try:
+            return int(self.request.query_params[nombre])
+        except ValueError:
+            raise ValidationError({nombre: 'Debe ser un número entero.'})
+
+    def _fecha(self, nombre):
+        valor = self.request.query_params.get(nombre)
+        if not valor:
+            return None
+        fecha = parse_datetime(valor)
+        if fecha is None:
+            raise ValidationError({nombre: 'Fecha inválida; use ISO 8601 (2025-01-31T00:00:00).'})
+        if settings.USE_TZ and timezone.is_naive(fecha):
+            fecha = timezone.make_aware(fecha)
+        return fecha
@@ -0,0 +1,64 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+
+from gestionProyecto.caches import compartida
+
+from .router import PREFIJO_PEGADO, EstadoPeticion, _peticion_actual, replicas
+
+
+class ReplicasMiddleware:
+    # Da a basedatos.router.RouterReplicas la petición en curso y, si en ella se escribió,
+    # pega a la principal la sesión y el usuario durante REPLICAS_PEGADO_SEGUNDOS (leer lo
+    # propio en las peticiones siguientes). Va antes de SessionMiddleware para que el
+    # guardado de la sesión también cuente como escritura. Sin REPLICAS_LECTURA no se usa; con
+    # réplicas exige una caché default compartida (CACHE_DEFAULT): el pegado anotado por un
+    # worker lo tienen que ver los demás.
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        if not compartida():
+            raise ImproperlyConfigured('REPLICAS_LECTURA requiere una caché default compartida (CACHE_DEFAULT).')
+        self.get_response = get_response
+        self.ventana = getattr(settings, 'REPLICAS_PEGADO_SEGUNDOS', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        estado = EstadoPeticion(request)
+        token = _peticion_actual.set(estado)
+        try:
+            response = self.get_response(request)
+        finally:
+            _peticion_actual.reset(token)
+        if estado.escrito:
+            self._pegar(request)
+        return response
+
+    async def __acall__(self, request):
+        estado = EstadoPeticion(request)
+        token = _peticion_actual.set(estado)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _peticion_actual.reset(token)
+        if estado.escrito:
+            await sync_to_async(self._pegar)(request)
+        return response
+
+    def _pegar(self, request):
+        claves = []
+        sesion = getattr(request, 'session', None)
+        if sesion is not None and sesion.session_key:
+            claves.append(f'{PREFIJO_PEGADO}sesion:{sesion.session_key}')
+        usuario = getattr(request, 'user', None)
+        if usuario is not None and usuario.is_authenticated:
+            claves.append(f'{PREFIJO_PEGADO}usuario:{usuario.pk}')
+        if claves:
+            cache.set_many(dict.fromkeys(claves, True), self.ventana)
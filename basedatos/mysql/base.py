@@ -0,0 +1,11 @@
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from basedatos.pool import PoolMixin
+
+
+class DatabaseWrapper(PoolMixin, MySQLDatabaseWrapper):
+    # ENGINE 'basedatos.mysql': el motor MySQL de Django con pool de conexiones (basedatos/pool.py)
+
+    def conexion_viva(self, conexion):
+        conexion.ping()
+        return True
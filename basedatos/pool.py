@@ -0,0 +1,284 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+
+# Pool de conexiones por proceso para los motores de basedatos/ (MySQL y SQLite), el
+# equivalente del pool que Django trae para PostgreSQL. Al cerrar la conexión al final de
+# la petición, Django la devuelve al pool en lugar de cerrarla: la siguiente petición, de
+# este u otro hilo, se ahorra el TCP, la autenticación, el init_command y los SET de sesión.
+# Se activa con OPTIONS['pool'] en DATABASES (True o un dict con estas claves):
+#   tamano          máximo de conexiones abiertas (en uso + libres) por proceso
+#   inactividad     segundos libre tras los que una conexión se cierra
+#   vida            segundos desde su apertura tras los que se cierra (antes que wait_timeout)
+#   espera          segundos que se espera una conexión con el pool lleno antes del error
+#   verificar_tras  segundos libre tras los que se comprueba que sigue viva antes de prestarla
+#                   (0 siempre, None nunca)
+# Requiere CONN_MAX_AGE = 0, como el de PostgreSQL: la reutilización es cosa del pool.
+
+OPCIONES = {'tamano': 10, 'inactividad': 300, 'vida': 3600, 'espera': 30, 'verificar_tras': 5}
+
+
+class Pool:
+    """Conexiones DB-API libres (la última devuelta primero) y contadores del pool."""
+
+    def __init__(self, alias, base, tamano=10, inactividad=300, vida=3600, espera=30, verificar_tras=5):
+        self.alias = alias
+        self.base = base
+        self.tamano = tamano
+        self.inactividad = inactividad
+        self.vida = vida
+        self.espera = espera
+        self.verificar_tras = verificar_tras
+        self._condicion = threading.Condition()
+        self._libres = deque()  # (conexión, abierta_en, devuelta_en)
+        self._prestadas = {}    # id(conexión) -> abierta_en
+        self.abiertas = 0
+        self.creadas = 0
+        self.reutilizadas = 0
+        self.esperas = 0
+        self.agotadas = 0
+        self.descartadas = Counter()
+        self.conexion_segundos = 0.0
+        self.espera_segundos = 0.0
+
+    def tomar(self, crear, viva, error):
+        """Conexión libre o nueva: (conexión, reutilizada). Lanza `error` si no llega a tiempo."""
+        limite = time.monotonic() + self.espera
+        while True:
+            conexion, abierta_en, verificar = self._reservar(limite, error)
+            if conexion is None:
+                return self._abrir(crear), False
+            if verificar and not _comprobar(conexion, viva):
+                self._descartar(conexion, 'rota')
+                continue
+            with self._condicion:
+                self._prestadas[id(conexion)] = abierta_en
+                self.reutilizadas += 1
+            return conexion, True
+
+    def devolver(self, conexion, sana=True):
+        ahora = time.monotonic()
+        with self._condicion:
+            abierta_en = self._prestadas.pop(id(conexion), None)
+        if abierta_en is None:
+            # No es de este pool (se abrió antes de un fork o de close_pool())
+            _cerrar(conexion)
+            return
+        if not sana:
+            self._descartar(conexion, 'error')
+        elif ahora - abierta_en >= self.vida:
+            self._descartar(conexion, 'vida')
+        else:
+            with self._condicion:
+                self._libres.append((conexion, abierta_en, ahora))
+                self._condicion.notify()
+
+    def cerrar(self):
+        with self._condicion:
+            libres, self._libres = self._libres, deque()
+            self.abiertas -= len(libres)
+            self._prestadas.clear()
+        for conexion, _, _ in libres:
+            _cerrar(conexion)
+
+    def estadisticas(self):
+        with self._condicion:
+            libres = len(self._libres)
+            return {
+                'alias': self.alias,
+                'base': self.base,
+                'tamano': self.tamano,
+                'abiertas': self.abiertas,
+                'en_uso': self.abiertas - libres,
+                'libres': libres,
+                'creadas': self.creadas,
+                'reutilizadas': self.reutilizadas,
+                'esperas': self.esperas,
+                'agotadas': self.agotadas,
+                'descartadas': dict(self.descartadas),
+                'conexion_segundos': round(self.conexion_segundos, 6),
+                'espera_segundos': round(self.espera_segundos, 6),
+            }
+
+    def _reservar(self, limite, error):
+        # Saca una conexión libre o reserva hueco para abrir una nueva (conexión None).
+        # Las caducadas se descuentan bajo el candado y se cierran fuera.
+        caducadas = []
+        try:
+            with self._condicion:
+                inicio_espera = None
+                try:
+                    while True:
+                        ahora = time.monotonic()
+                        # Las de la izquierda son las que llevan más tiempo libres
+                        while self._libres and ahora - self._libres[0][2] >= self.inactividad:
+                            caducadas.append(self._quitar(self._libres.popleft()[0], 'inactividad'))
+                        while self._libres:
+                            conexion, abierta_en, devuelta_en = self._libres.pop()
+                            if ahora - abierta_en >= self.vida:
+                                caducadas.append(self._quitar(conexion, 'vida'))
+                                continue
+                            verificar = self.verificar_tras is not None and ahora - devuelta_en >= self.verificar_tras
+                            return conexion, abierta_en, verificar
+                        if self.abiertas < self.tamano:
+                            self.abiertas += 1
+                            return None, None, False
+                        if inicio_espera is None:
+                            inicio_espera = ahora
+                            self.esperas += 1
+                        if ahora >= limite or not self._condicion.wait(limite - ahora):
+                            self.agotadas += 1
+                            raise error(f'Pool de conexiones "{self.alias}" agotado: {self.tamano} en uso '
+                                        f'durante {self.espera} s')
+                finally:
+                    if inicio_espera is not None:
+                        self.espera_segundos += time.monotonic() - inicio_espera
+        finally:
+            for conexion in caducadas:
+                _cerrar(conexion)
+
+    def _abrir(self, crear):
+        inicio = time.monotonic()
+        try:
+            conexion = crear()
+        except BaseException:
+            with self._condicion:
+                self.abiertas -= 1
+                self._condicion.notify()
+            raise
+        with self._condicion:
+            self.conexion_segundos += time.monotonic() - inicio
+            self.creadas += 1
+            self._prestadas[id(conexion)] = time.monotonic()
+        return conexion
+
+    def _quitar(self, conexion, motivo):
+        # Bajo el candado: deja hueco para otra
+        self.abiertas -= 1
+        self.descartadas[motivo] += 1
+        self._condicion.notify()
+        return conexion
+
+    def _descartar(self, conexion, motivo):
+        with self._condicion:
+            self._quitar(conexion, motivo)
+        _cerrar(conexion)
+
+
+def _comprobar(conexion, viva):
+    try:
+        return viva(conexion)
+    except Exception:
+        return False
+
+
+def _cerrar(conexion):
+    try:
+        conexion.close()
+    except Exception:
+        pass
+
+
+# Pools de este proceso por (alias, NAME): las pruebas cambian NAME a la base de prueba. Tras un fork (workers de gunicorn con --preload) el hijo
+# empieza con pools vacíos: las conexiones heredadas comparten socket con el padre y no se
+# tocan, ni siquiera para cerrarlas; se guardan para que el recolector no las cierre.
+_pools = {}
+_heredados = []
+_pid = os.getpid()
+_candado = threading.Lock()
+
+
+def _pools_del_proceso():
+    global _pid
+    if os.getpid() != _pid:
+        with _candado:
+            if os.getpid() != _pid:
+                _heredados.extend(_pools.values())
+                _pools.clear()
+                _pid = os.getpid()
+    return _pools
+
+
+def estadisticas():
+    """Estado y contadores de los pools de este proceso."""
+    return [pool.estadisticas() for pool in list(_pools_del_proceso().values())]
+
+
+class PoolMixin:
+    # Para el DatabaseWrapper de un motor de Django: toma y devuelve las conexiones del pool
+    # en get_new_connection() / _close(). conexion_viva() comprueba una conexión con un
+    # SELECT 1 por DB-API; un motor puede cambiarla por algo más barato (MySQL: ping).
+    # Misma interfaz que el motor de PostgreSQL: `pool` y close_pool().
+
+    @property
+    def pool(self):
+        opciones = self.settings_dict['OPTIONS'].get('pool')
+        if self.alias == NO_DB_ALIAS or not opciones:
+            return None
+        pools = _pools_del_proceso()
+        clave = (self.alias, str(self.settings_dict['NAME']))
+        if clave not in pools:
+            if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+                raise ImproperlyConfigured('El pool de conexiones requiere CONN_MAX_AGE = 0.')
+            opciones = {**OPCIONES, **(opciones if isinstance(opciones, dict) else {})}
+            desconocidas = set(opciones) - set(OPCIONES)
+            if desconocidas:
+                raise ImproperlyConfigured(f'Opciones de pool desconocidas: {", ".join(sorted(desconocidas))}')
+            with _candado:
+                pools.setdefault(clave, Pool(self.alias, clave[1], **opciones))
+        return pools[clave]
+
+    def close_pool(self):
+        with _candado:
+            pool = _pools_del_proceso().pop((self.alias, str(self.settings_dict['NAME'])), None)
+        if pool is not None:
+            pool.cerrar()
+
+    def get_connection_params(self):
+        parametros = super().get_connection_params()
+        parametros.pop('pool', None)
+        return parametros
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            self._reutilizada = False
+            return super().get_new_connection(conn_params)
+        conexion, self._reutilizada = pool.tomar(
+            lambda: super(PoolMixin, self).get_new_connection(conn_params),
+            self.conexion_viva, self.Database.OperationalError)
+        return conexion
+
+    def init_connection_state(self):
+        # Los SET de sesión y la comprobación de versión ya se hicieron al abrirla
+        if not getattr(self, '_reutilizada', False):
+            super().init_connection_state()
+
+    def conexion_viva(self, conexion):
+        cursor = conexion.cursor()
+        try:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        finally:
+            cursor.close()
+        return True
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        conexion, self.connection = self.connection, None
+        sana = True
+        if self.in_atomic_block or not self.autocommit:
+            # Ninguna transacción a medias pasa a la siguiente petición
+            try:
+                conexion.rollback()
+            except Exception:
+                sana = False
+        if sana and self.errors_occurred:
+            sana = _comprobar(conexion, self.conexion_viva)
+        pool.devolver(conexion, sana)
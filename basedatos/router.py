@@ -0,0 +1,133 @@
+import base64
+import binascii
+import json
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+# Lecturas a réplicas (REPLICAS_LECTURA, alias de DATABASES) solo en las peticiones de las
+# vistas de consulta; todo lo demás, y cualquier escritura, va a la principal (default):
+#   - vistas con `metodos_replica` (Listado*, consultas *View, lecturas async de la API)
+#     en esos métodos
+#   - vistas de DRF con list / retrieve (ListModelMixin, RetrieveModelMixin) en GET y HEAD
+# salvo los métodos que pasan por proyectos.cache_vistas.cache_vista: tras una escritura
+# la generación cambia enseguida y una réplica atrasada llenaría la clave nueva con datos
+# viejos durante todo el TIMEOUT; la caché ya descarga a la principal.
+# Una réplica por petición, elegida al azar. Leer lo propio: si la petición escribe, sus
+# lecturas siguientes van a la principal, y durante REPLICAS_PEGADO_SEGUNDOS las peticiones
+# de esa sesión o usuario también (basedatos.middleware.ReplicasMiddleware lo anota en la
+# caché por defecto, que tiene que ser compartida: el middleware no arranca con locmem). Las sesiones se leen
+# siempre de la principal: con retraso de replicación un inicio de sesión recién hecho no
+# debe parecer anónimo.
+# Las réplicas se configuran con 'TEST': {'MIRROR': 'default'} para que las pruebas usen la principal.
+
+PREFIJO_PEGADO = 'replicas:pegado:'
+SOLO_PRINCIPAL = frozenset({'sessions'})  # app_label
+
+_peticion_actual = ContextVar('replicas_peticion', default=None)
+_metodos_vista = {}
+
+
+class EstadoPeticion:
+    # Lo que el router sabe de la petición en curso. `replica` se decide en la primera lectura
+    # con la vista ya resuelta: None es la principal.
+    __slots__ = ('request', 'replica', 'decidida', 'escrito')
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = None
+        self.decidida = False
+        self.escrito = False
+
+
+def replicas():
+    return getattr(settings, 'REPLICAS_LECTURA', ())
+
+
+def metodos_replica(funcion):
+    """Métodos HTTP en los que la vista de `funcion` (la de la URL) puede leer de una réplica."""
+    try:
+        return _metodos_vista[funcion]
+    except KeyError:
+        pass
+    clase = getattr(funcion, 'view_class', None) or getattr(funcion, 'cls', None)
+    metodos = getattr(clase, 'metodos_replica', None)
+    if metodos is None:
+        metodos = ('GET', 'HEAD') if clase and issubclass(clase, (ListModelMixin, RetrieveModelMixin)) else ()
+    _metodos_vista[funcion] = frozenset(metodo for metodo in metodos if not _cacheado(clase, metodo))
+    return _metodos_vista[funcion]
+
+
+def _cacheado(clase, metodo):
+    # method_decorator copia a la clase los atributos que cache_vista pone en su envoltura
+    manejador = getattr(clase, metodo.lower(), None)
+    if manejador is None and metodo == 'HEAD':
+        manejador = getattr(clase, 'get', None)  # View.setup() atiende HEAD con get()
+    return getattr(manejador, 'cache_vista', False)
+
+
+def identidades(request):
+    """Claves de pegado de la petición sin tocar la base de datos: cookie de sesión y usuario del JWT."""
+    claves = []
+    sesion = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if sesion:
+        claves.append(f'{PREFIJO_PEGADO}sesion:{sesion}')
+    tipo, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if tipo in jwt_settings.AUTH_HEADER_TYPES and token.count('.') == 2:
+        # Sin verificar la firma: solo decide a qué base se lee, la autenticación va aparte
+        carga = token.split('.')[1]
+        try:
+            usuario = json.loads(base64.urlsafe_b64decode(carga + '=' * (-len(carga) % 4)))[jwt_settings.USER_ID_CLAIM]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            usuario = None
+        if usuario is not None:
+            claves.append(f'{PREFIJO_PEGADO}usuario:{usuario}')
+    return claves
+
+
+def _decidir(estado):
+    request = estado.request
+    coincidencia = request.resolver_match
+    if coincidencia is None:
+        return None, False  # Aún en el middleware: a la principal y se decide más tarde
+    disponibles = replicas()
+    if not disponibles or request.method not in metodos_replica(coincidencia.func):
+        return None, True
+    claves = identidades(request)
+    if claves and cache.get_many(claves):
+        return None, True
+    return random.choice(disponibles), True
+
+
+class RouterReplicas:
+
+    def db_for_read(self, model, **hints):
+        estado = _peticion_actual.get()
+        if estado is None or estado.escrito or model._meta.app_label in SOLO_PRINCIPAL:
+            return DEFAULT_DB_ALIAS
+        if not estado.decidida:
+            estado.replica, estado.decidida = _decidir(estado)
+        return estado.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        estado = _peticion_actual.get()
+        if estado is not None:
+            estado.escrito = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        bases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in bases and obj2._state.db in bases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        if db in replicas():
+            return False
+        return None
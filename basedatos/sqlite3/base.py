@@ -0,0 +1,14 @@
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from basedatos.pool import PoolMixin
+
+
+class DatabaseWrapper(PoolMixin, SQLiteDatabaseWrapper):
+    # ENGINE 'basedatos.sqlite3': el motor SQLite de Django con pool de conexiones
+    # (basedatos/pool.py). Las bases en memoria no usan pool: nunca se cierran.
+
+    @property
+    def pool(self):
+        if self.is_in_memory_db():
+            return None
+        return super().pool
@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+
+from api.asincrono import LecturaAsincronaView
+from proyectos.views import ListadoProyecto, ProyectoListCreateAPIView, ProyectoView
+
+from .middleware import ReplicasMiddleware
+from .pool import Pool, PoolMixin
+from .router import metodos_replica
+from .sqlite3.base import DatabaseWrapper
+
+
+class Conexion:
+    # Conexión DB-API de mentira: solo lo que el pool toca
+    def __init__(self):
+        self.cerrada = False
+
+    def close(self):
+        self.cerrada = True
+
+
+class PoolTests(SimpleTestCase):
+
+    def test_reutiliza_la_ultima_devuelta(self):
+        pool = Pool('prueba', 'prueba', tamano=2)
+        conexion, reutilizada = pool.tomar(Conexion, lambda conexion: True, RuntimeError)
+        self.assertFalse(reutilizada)
+        pool.devolver(conexion)
+        self.assertEqual(pool.tomar(Conexion, lambda conexion: True, RuntimeError), (conexion, True))
+        self.assertEqual((pool.creadas, pool.reutilizadas), (1, 1))
+
+    def test_descarta_la_que_no_pasa_la_comprobacion(self):
+        pool = Pool('prueba', 'prueba', tamano=1, verificar_tras=0)
+        rota, _ = pool.tomar(Conexion, lambda conexion: True, RuntimeError)
+        pool.devolver(rota)
+        nueva, reutilizada = pool.tomar(Conexion, lambda conexion: conexion is not rota, RuntimeError)
+        self.assertIsNot(nueva, rota)
+        self.assertFalse(reutilizada)
+        self.assertTrue(rota.cerrada)
+        self.assertEqual(pool.estadisticas()['descartadas'], {'rota': 1})
+
+    def test_agotado_lanza_el_error_del_motor(self):
+        pool = Pool('prueba', 'prueba', tamano=1, espera=0)
+        pool.tomar(Conexion, lambda conexion: True, RuntimeError)
+        with self.assertRaises(RuntimeError):
+            pool.tomar(Conexion, lambda conexion: True, RuntimeError)
+        self.assertEqual(pool.agotadas, 1)
+
+
+class ConexionVivaTests(SimpleTestCase):
+
+    def test_comprobacion_generica_por_dbapi(self):
+        conexion = sqlite3.connect(':memory:')
+        self.assertTrue(PoolMixin.conexion_viva(None, conexion))
+        conexion.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            PoolMixin.conexion_viva(None, conexion)
+
+    def test_motor_sqlite_con_pool_en_un_archivo(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = dict(connection.settings_dict, NAME=os.path.join(directorio.name, 'pool.sqlite3'),
+                       CONN_MAX_AGE=0, OPTIONS={'pool': {'tamano': 1, 'verificar_tras': 0}})
+        base = DatabaseWrapper(ajustes, alias='pool_prueba')
+        self.addCleanup(base.close_pool)
+        for _ in range(2):
+            with base.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            base.close()
+        self.assertEqual({clave: valor for clave, valor in base.pool.estadisticas().items()
+                          if clave in ('creadas', 'reutilizadas', 'libres')},
+                         {'creadas': 1, 'reutilizadas': 1, 'libres': 1})
+
+
+class MetodosReplicaTests(SimpleTestCase):
+
+    def test_los_metodos_con_cache_vista_leen_de_la_principal(self):
+        # El POST de los Listado* y el GET de las consultas HTML se guardan con cache_vista
+        self.assertEqual(metodos_replica(ListadoProyecto.as_view()), {'GET', 'HEAD'})
+        self.assertEqual(metodos_replica(ProyectoView.as_view()), set())
+
+    def test_las_lecturas_sin_cache_pueden_ir_a_una_replica(self):
+        self.assertEqual(metodos_replica(ProyectoListCreateAPIView.as_view()), {'GET', 'HEAD'})
+        self.assertEqual(metodos_replica(LecturaAsincronaView.as_view()), {'GET', 'HEAD'})
+
+
+@override_settings(REPLICAS_LECTURA=['replica'])
+class ReplicasMiddlewareTests(SimpleTestCase):
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_exige_una_cache_compartida(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ReplicasMiddleware(lambda request: HttpResponse())
+
+    def test_arranca_con_una_cache_compartida(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        cache = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio.name}
+        with override_settings(CACHES={'default': cache}):
+            ReplicasMiddleware(lambda request: HttpResponse())
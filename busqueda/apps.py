@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class BusquedaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'busqueda'
+    verbose_name = "Búsqueda"
+
+    def ready(self):
+        # Mantiene DocumentoBusqueda al día con las señales de Proyecto, Tarea y Comentario
+        from . import signals  # noqa: F401
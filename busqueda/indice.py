@@ -0,0 +1,78 @@
+from django.utils import timezone
+
+from proyectos.models import Proyecto, Tarea, Comentario
+from .models import DocumentoBusqueda
+
+
+# Qué texto se indexa de cada modelo: (titulo, contenido)
+def documento_de(instancia):
+    if isinstance(instancia, Proyecto):
+        return {'proyecto_id': instancia.pk, 'titulo': instancia.nombre, 'contenido': instancia.descripcion}
+    if isinstance(instancia, Tarea):
+        return {'proyecto_id': instancia.proyecto_id, 'titulo': instancia.nombre, 'contenido': instancia.descripcion}
+    # Comentario: el proyecto se toma de su tarea (sin cargarla si ya está en caché)
+    proyecto_id = instancia.tarea.proyecto_id if Comentario.tarea.is_cached(instancia) else (
+        Tarea.objects.filter(pk=instancia.tarea_id).values_list('proyecto_id', flat=True).first())
+    return {'proyecto_id': proyecto_id, 'titulo': '', 'contenido': instancia.contenido}
+
+
+def _limpiar(datos):
+    datos['titulo'] = (datos['titulo'] or '')[:255]
+    datos['contenido'] = datos['contenido'] or ''
+    return datos
+
+
+def indexar(instancia, creado=False):
+    modelo = instancia._meta.model_name
+    datos = _limpiar(documento_de(instancia))
+    if creado:
+        DocumentoBusqueda.objects.create(modelo=modelo, objeto_id=instancia.pk, **datos)
+        return
+    if isinstance(instancia, Tarea):
+        # Si la tarea cambió de proyecto, sus comentarios también
+        movida = DocumentoBusqueda.objects.filter(modelo='tarea', objeto_id=instancia.pk).exclude(
+            proyecto_id=datos['proyecto_id']).exists()
+        if movida:
+            DocumentoBusqueda.objects.filter(
+                modelo='comentario',
+                objeto_id__in=Comentario.objects.filter(tarea_id=instancia.pk).values('pk'),
+            ).update(proyecto_id=datos['proyecto_id'])
+    actualizados = DocumentoBusqueda.objects.filter(modelo=modelo, objeto_id=instancia.pk).update(
+        fecha_actualizacion=timezone.now(), **datos)
+    if not actualizados:
+        DocumentoBusqueda.objects.create(modelo=modelo, objeto_id=instancia.pk, **datos)
+
+
+def desindexar(modelo, objeto_id):
+    DocumentoBusqueda.objects.filter(modelo=modelo, objeto_id=objeto_id).delete()
+
+
+def indexar_tareas(tareas, crear):
+    # Para operaciones masivas (señal tareas_masivas): un INSERT o UPDATE por lotes
+    tareas = [tarea for tarea in tareas if tarea.pk is not None]
+    if crear:
+        DocumentoBusqueda.objects.bulk_create(
+            [DocumentoBusqueda(modelo='tarea', objeto_id=tarea.pk, **_limpiar(documento_de(tarea))) for tarea in tareas],
+            batch_size=500,
+        )
+        return
+    for tarea in tareas:
+        indexar(tarea)
+
+
+def reindexar(modelo, tamano_bloque=2000):
+    """Reconstruye los documentos de un modelo ('proyecto', 'tarea' o 'comentario'). Devuelve cuántos."""
+    clase = {'proyecto': Proyecto, 'tarea': Tarea, 'comentario': Comentario}[modelo]
+    queryset = clase.objects.order_by('pk')
+    if clase is Comentario:
+        queryset = queryset.select_related('tarea')
+    DocumentoBusqueda.objects.filter(modelo=modelo).delete()
+    total, lote = 0, []
+    for instancia in queryset.iterator(chunk_size=tamano_bloque):
+        lote.append(DocumentoBusqueda(modelo=modelo, objeto_id=instancia.pk, **_limpiar(documento_de(instancia))))
+        if len(lote) >= tamano_bloque:
+            DocumentoBusqueda.objects.bulk_create(lote)
+            total += len(lote)
+            lote = []
+    DocumentoBusqueda.objects.bulk_create(lote)
+    return total + len(lote)
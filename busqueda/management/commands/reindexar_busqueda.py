@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from busqueda.indice import reindexar
+
+
+class Command(BaseCommand):
+    help = ('Reconstruye los documentos de búsqueda a partir de Proyecto, Tarea y Comentario '
+            '(p. ej. tras cargas masivas en MySQL, donde bulk_create no devuelve ids).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('modelos', nargs='*', help='proyecto, tarea y/o comentario (por defecto, todos)')
+        parser.add_argument('--bloque', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        modelos = options['modelos'] or ['proyecto', 'tarea', 'comentario']
+        invalidos = set(modelos) - {'proyecto', 'tarea', 'comentario'}
+        if invalidos:
+            raise CommandError(f"Modelos desconocidos: {', '.join(sorted(invalidos))}")
+        for modelo in modelos:
+            with transaction.atomic():
+                total = reindexar(modelo, options['bloque'])
+            self.stdout.write(f'{modelo}: {total} documentos')
+        if connection.vendor == 'sqlite':
+            # Fusiona los segmentos del índice FTS5: consultas más rápidas tras cargas grandes
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO busqueda_fts(busqueda_fts) VALUES ('optimize')")
+        self.stdout.write(self.style.SUCCESS('Índice de búsqueda reconstruido'))
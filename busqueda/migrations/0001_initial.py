@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(choices=[('proyecto', 'Proyecto'), ('tarea', 'Tarea'), ('comentario', 'Comentario')], max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('proyecto_id', models.BigIntegerField()),
+                ('titulo', models.CharField(blank=True, default='', max_length=255)),
+                ('contenido', models.TextField(blank=True, default='')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Documento de búsqueda',
+                'verbose_name_plural': 'Documentos de búsqueda',
+                'indexes': [models.Index(fields=['proyecto_id'], name='documento_proyecto_idx')],
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'objeto_id'), name='documento_objeto_uniq')],
+            },
+        ),
+    ]
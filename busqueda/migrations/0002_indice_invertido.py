@@ -0,0 +1,88 @@
+from django.db import migrations
+
+# Índice invertido sobre busqueda_documentobusqueda según el motor de la base:
+#   SQLite: tabla FTS5 de contenido externo + triggers que la mantienen al día; los
+#           índices de prefijo evitan fundir miles de listas al buscar mientras se escribe
+#   MySQL:  índice FULLTEXT (InnoDB lo mantiene solo)
+# Otros motores no tienen índice: busqueda.motor recurre a icontains.
+
+SQLITE = [
+    """CREATE VIRTUAL TABLE busqueda_fts USING fts5(
+        titulo, contenido,
+        content='busqueda_documentobusqueda', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4 5'
+    )""",
+    """CREATE TRIGGER busqueda_documento_ai AFTER INSERT ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(rowid, titulo, contenido) VALUES (new.id, new.titulo, new.contenido);
+    END""",
+    """CREATE TRIGGER busqueda_documento_ad AFTER DELETE ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(busqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.id, old.titulo, old.contenido);
+    END""",
+    """CREATE TRIGGER busqueda_documento_au AFTER UPDATE OF titulo, contenido ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(busqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.id, old.titulo, old.contenido);
+        INSERT INTO busqueda_fts(rowid, titulo, contenido) VALUES (new.id, new.titulo, new.contenido);
+    END""",
+]
+
+SQLITE_REVERSA = [
+    'DROP TRIGGER IF EXISTS busqueda_documento_au',
+    'DROP TRIGGER IF EXISTS busqueda_documento_ad',
+    'DROP TRIGGER IF EXISTS busqueda_documento_ai',
+    'DROP TABLE IF EXISTS busqueda_fts',
+]
+
+MYSQL = ['ALTER TABLE busqueda_documentobusqueda ADD FULLTEXT INDEX busqueda_texto_ftx (titulo, contenido)']
+MYSQL_REVERSA = ['ALTER TABLE busqueda_documentobusqueda DROP INDEX busqueda_texto_ftx']
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sentencia in sentencias.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_indice(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE, 'mysql': MYSQL})
+
+
+def borrar_indice(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_REVERSA, 'mysql': MYSQL_REVERSA})
+
+
+def poblar(apps, schema_editor):
+    # Documentos de lo que ya existe; los triggers (o InnoDB) llenan el índice
+    Documento = apps.get_model('busqueda', 'DocumentoBusqueda')
+    Proyecto = apps.get_model('proyectos', 'Proyecto')
+    Tarea = apps.get_model('proyectos', 'Tarea')
+    Comentario = apps.get_model('proyectos', 'Comentario')
+    fuentes = [
+        ('proyecto', Proyecto.objects.values_list('pk', 'pk', 'nombre', 'descripcion')),
+        ('tarea', Tarea.objects.values_list('pk', 'proyecto_id', 'nombre', 'descripcion')),
+        ('comentario', Comentario.objects.values_list('pk', 'tarea__proyecto_id', 'contenido', 'contenido')),
+    ]
+    for modelo, filas in fuentes:
+        lote = []
+        for pk, proyecto_id, titulo, contenido in filas.order_by('pk').iterator(chunk_size=2000):
+            if modelo == 'comentario':
+                titulo = ''
+            lote.append(Documento(modelo=modelo, objeto_id=pk, proyecto_id=proyecto_id,
+                                  titulo=(titulo or '')[:255], contenido=contenido or ''))
+            if len(lote) >= 2000:
+                Documento.objects.bulk_create(lote)
+                lote = []
+        Documento.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('busqueda', '0001_initial'),
+        ('proyectos', '0006_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class DocumentoBusqueda(models.Model):
+    # Una fila por Proyecto, Tarea o Comentario con el texto que se indexa. Sobre esta
+    # tabla vive el índice invertido del motor (migración 0002): FTS5 en SQLite
+    # (tabla virtual busqueda_fts, mantenida por triggers) y FULLTEXT en MySQL.
+    MODELO_CHOICES = (
+        ('proyecto', 'Proyecto'),
+        ('tarea', 'Tarea'),
+        ('comentario', 'Comentario'),
+    )
+
+    modelo = models.CharField(max_length=20, choices=MODELO_CHOICES)
+    objeto_id = models.BigIntegerField()
+    proyecto_id = models.BigIntegerField() # Para filtrar por lo que el usuario puede ver
+    titulo = models.CharField(max_length=255, blank=True, default='')
+    contenido = models.TextField(blank=True, default='')
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Documento de búsqueda"
+        verbose_name_plural = "Documentos de búsqueda"
+        constraints = [
+            models.UniqueConstraint(fields=['modelo', 'objeto_id'], name='documento_objeto_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['proyecto_id'], name='documento_proyecto_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.objeto_id}: {self.titulo or self.contenido[:50]}"
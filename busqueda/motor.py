@@ -0,0 +1,135 @@
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Q
+
+from proyectos.models import Proyecto
+from usuarios.permisos import is_administrador
+from .models import DocumentoBusqueda
+
+MAX_TERMINOS = 8
+LARGO_FRAGMENTO = 200
+PESO_TITULO = 4.0 # El título pesa más que el cuerpo en el ranking
+# Un término que aparece en medio millón de comentarios no se puede ordenar entero en
+# cada pulsación: se ordenan solo los CANDIDATOS coincidentes más recientes, y se amplía
+# la ventana si tras filtrar por permisos no alcanza para la página.
+CANDIDATOS = 4000
+
+
+def terminos(texto):
+    # Solo palabras: nada de la sintaxis del motor llega desde el usuario
+    return re.findall(r'\w+', (texto or '').lower())[:MAX_TERMINOS]
+
+
+def buscar(texto, usuario, pagina=1, tamano=20, modelo=None):
+    """Resultados ordenados por relevancia de lo que `usuario` puede ver.
+
+    Todos los términos deben aparecer; el último se busca como prefijo (búsqueda
+    mientras se escribe). Devuelve (resultados, hay_mas) sin contar el total, que en
+    términos frecuentes costaría tanto como la búsqueda. En SQLite, con términos muy
+    frecuentes la relevancia se calcula sobre las coincidencias más recientes.
+    """
+    palabras = terminos(texto)
+    if not palabras:
+        return [], False
+
+    proyectos = None
+    if not is_administrador(usuario):
+        # Subconsulta de visible_to: la misma visibilidad que las vistas
+        proyectos = Proyecto.objects.visible_to(usuario).values('pk')
+
+    consulta = {'sqlite': _sqlite, 'mysql': _mysql}.get(connection.vendor, _generica)
+    try:
+        filas = consulta(palabras, proyectos, modelo, tamano + 1, (pagina - 1) * tamano)
+    except EmptyResultSet:
+        return [], False  # No ve ningún proyecto
+    return filas[:tamano], len(filas) > tamano
+
+
+def _filtros(proyectos, modelo):
+    sql, parametros = [], []
+    if modelo:
+        sql.append('d.modelo = %s')
+        parametros.append(modelo)
+    if proyectos is not None:
+        subconsulta, parametros_subconsulta = proyectos.query.sql_with_params()  # EmptyResultSet si no hay
+        sql.append(f'd.proyecto_id IN ({subconsulta})')
+        parametros.extend(parametros_subconsulta)
+    return ''.join(f' AND {condicion}' for condicion in sql), parametros
+
+
+def _ejecutar(sql, parametros):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        columnas = [columna[0] for columna in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+
+def _sqlite(palabras, proyectos, modelo, limite, desplazamiento):
+    # FTS5: '"palabra" "prefi"*'. bm25() es menor cuanto más relevante
+    expresion = ' '.join(f'"{palabra}"' for palabra in palabras) + '*'
+    filtros, parametros = _filtros(proyectos, modelo)
+    sql = f"""
+        SELECT d.modelo, d.objeto_id, d.proyecto_id, d.titulo,
+               snippet(busqueda_fts, 1, '', '', '…', 24) AS fragmento,
+               bm25(busqueda_fts, {PESO_TITULO}, 1.0) AS puntuacion
+        FROM busqueda_fts
+        JOIN {DocumentoBusqueda._meta.db_table} d ON d.id = busqueda_fts.rowid
+        WHERE busqueda_fts MATCH %s AND busqueda_fts.rowid >= %s{filtros}
+        ORDER BY puntuacion
+        LIMIT %s OFFSET %s
+    """
+    candidatos = max(CANDIDATOS, 4 * (limite + desplazamiento))
+    while True:
+        # rowid del candidato más antiguo de la ventana; recorrer la lista en orden de
+        # rowid es barato, lo caro es puntuar cada coincidencia
+        umbral = _ejecutar(
+            'SELECT rowid FROM busqueda_fts WHERE busqueda_fts MATCH %s ORDER BY rowid DESC LIMIT 1 OFFSET %s',
+            [expresion, candidatos - 1],
+        )
+        desde = umbral[0]['rowid'] if umbral else 0
+        filas = _ejecutar(sql, [expresion, desde, *parametros, limite, desplazamiento])
+        if len(filas) == limite or not desde:
+            break
+        candidatos *= 4
+    for fila in filas:
+        fila['puntuacion'] = round(-fila['puntuacion'], 4)
+    return filas
+
+
+def _mysql(palabras, proyectos, modelo, limite, desplazamiento):
+    # FULLTEXT en modo booleano: '+palabra +prefi*'. Ojo: por defecto InnoDB no indexa
+    # palabras de menos de 3 letras (innodb_ft_min_token_size) ni las stopwords.
+    expresion = ' '.join(f'+{palabra}' for palabra in palabras) + '*'
+    filtros, parametros = _filtros(proyectos, modelo)
+    sql = f"""
+        SELECT d.modelo, d.objeto_id, d.proyecto_id, d.titulo,
+               LEFT(d.contenido, {LARGO_FRAGMENTO}) AS fragmento,
+               MATCH(d.titulo, d.contenido) AGAINST (%s IN BOOLEAN MODE) AS puntuacion
+        FROM {DocumentoBusqueda._meta.db_table} d
+        WHERE MATCH(d.titulo, d.contenido) AGAINST (%s IN BOOLEAN MODE){filtros}
+        ORDER BY puntuacion DESC
+        LIMIT %s OFFSET %s
+    """
+    filas = _ejecutar(sql, [expresion, expresion, *parametros, limite, desplazamiento])
+    for fila in filas:
+        fila['puntuacion'] = round(float(fila['puntuacion']), 4)
+    return filas
+
+
+def _generica(palabras, proyectos, modelo, limite, desplazamiento):
+    # Sin índice invertido (otros motores): recorrido completo, solo para desarrollo
+    queryset = DocumentoBusqueda.objects.all()
+    for palabra in palabras:
+        queryset = queryset.filter(Q(titulo__icontains=palabra) | Q(contenido__icontains=palabra))
+    if modelo:
+        queryset = queryset.filter(modelo=modelo)
+    if proyectos is not None:
+        queryset = queryset.filter(proyecto_id__in=proyectos)
+    filas = list(queryset.order_by('-fecha_actualizacion')
+                 .values('modelo', 'objeto_id', 'proyecto_id', 'titulo', 'contenido')[desplazamiento:desplazamiento + limite])
+    for fila in filas:
+        fila['fragmento'] = fila.pop('contenido')[:LARGO_FRAGMENTO]
+        fila['puntuacion'] = None
+    return filas
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from proyectos.models import Proyecto, Tarea, Comentario
+from proyectos.signals import tareas_masivas
+from .indice import indexar, desindexar, indexar_tareas
+
+
+# Se indexa dentro de la misma transacción que las filas, también en las operaciones
+# masivas (tareas_masivas se envía dentro de la suya).
+
+
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=Tarea)
+@receiver(post_save, sender=Comentario)
+def indexar_guardado(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not {'nombre', 'descripcion', 'contenido', 'proyecto', 'tarea'} & set(update_fields):
+        return
+    indexar(instance, creado=created)
+
+
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=Comentario)
+def desindexar_borrado(sender, instance, **kwargs):
+    desindexar(sender._meta.model_name, instance.pk)
+
+
+@receiver(tareas_masivas, sender=Tarea)
+def indexar_tareas_masivas(sender, accion, tareas, campos, **kwargs):
+    if accion == 'actualizar' and not {'nombre', 'descripcion', 'proyecto_id'} & set(campos):
+        return  # p. ej. un cambio de estado en bloque no toca el texto
+    indexar_tareas(tareas, crear=accion == 'crear')
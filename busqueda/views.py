@@ -0,0 +1,33 @@
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import DocumentoBusqueda
+from .motor import buscar
+
+
+class BusquedaAPIView(APIView):
+    # GET ?q=texto&modelo=tarea&pagina=1&tamano=20
+    # Proyectos, tareas y comentarios que contienen todos los términos, ordenados por
+    # relevancia y filtrados por los proyectos que el usuario puede ver.
+    permission_classes = [permissions.IsAuthenticated]
+    tamano_maximo = 100
+    pagina_maxima = 50 # Más allá, afinar la búsqueda: OFFSET profundo recorre todo lo anterior
+
+    def get(self, request, *args, **kwargs):
+        parametros = request.query_params
+        modelo = parametros.get('modelo') or None
+        if modelo and modelo not in dict(DocumentoBusqueda.MODELO_CHOICES):
+            raise ValidationError({'modelo': 'Use proyecto, tarea o comentario.'})
+        pagina = min(max(self._entero('pagina', 1), 1), self.pagina_maxima)
+        tamano = min(max(self._entero('tamano', 20), 1), self.tamano_maximo)
+
+        resultados, hay_mas = buscar(parametros.get('q', ''), request.user, pagina, tamano, modelo)
+        return Response({'pagina': pagina, 'siguiente': hay_mas, 'resultados': resultados})
+
+    def _entero(self, nombre, defecto):
+        try:
+            return int(self.request.query_params.get(nombre, defecto))
+        except ValueError:
+            return defecto
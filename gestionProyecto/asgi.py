@@ -5,6 +5,12 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Las vistas de flujo (por ejemplo /badgets/stream/) necesitan un servidor ASGI,
+p. ej.: uvicorn gestionProyecto.asgi:application
+Las vistas async de lectura (/api/async/..., /badgets/async/) solo liberan el hilo bajo ASGI.
+Con uvicorn, instalar uvicorn[standard] (httptools): con el analizador h11 cada petición
+keep-alive tarda decenas de ms más.
 """
 
 import os
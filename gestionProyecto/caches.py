@@ -0,0 +1,14 @@
+from django.conf import settings
+
+# Backends de caché que viven dentro de cada proceso (o no guardan nada): lo que un worker
+# escribe en ellos no lo ven los demás. Lo que coordina procesos (revocaciones JWT, pegado a
+# la principal, generaciones de la caché de vistas) necesita otro backend.
+LOCALES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def compartida(alias='default'):
+    """True si la caché `alias` la ven todos los procesos (file, redis, memcached, db)."""
+    return settings.CACHES[alias]['BACKEND'] not in LOCALES
@@ -25,15 +25,27 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'usuarios.apps.UsuariosConfig',
     'proyectos.apps.ProyectosConfig',
+    'notificaciones.apps.NotificacionesConfig',
+    'auditoria.apps.AuditoriaConfig',
+    'busqueda.apps.BusquedaConfig',
+    'rendimiento.apps.RendimientoConfig',
     'api',
     'rest_framework',
     'rest_framework_simplejwt',
     'widget_tweaks',
 ]
 
+# Modo JWT sin estado: el usuario se arma con los claims firmados del token (id, username,
+# rol, proyectos) y no se consulta la base de datos. Los cambios de rol o de asignaciones
+# revocan los tokens emitidos antes (usuarios/autenticacion.py, ListaRevocacion), lo que
+# requiere una caché default compartida entre procesos (CACHE_DEFAULT).
+JWT_SIN_ESTADO = False
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Con JWT_SIN_ESTADO = False, JWTAuthentication con el usuario tomado de la caché de permisos
+        'usuarios.autenticacion.JWTAutenticacionSinEstado' if JWT_SIN_ESTADO
+        else 'usuarios.autenticacion.JWTAutenticacionCacheada',
         # mantener la autenticación por sesión para el navegador (útil para el admin de DRF)
         'rest_framework.authentication.SessionAuthentication',
     ),
@@ -65,7 +77,10 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
-    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_USER_CLASS': 'usuarios.autenticacion.UsuarioToken',
+    # Agregan rol, username y proyectos como claims (usados por el modo JWT_SIN_ESTADO)
+    'TOKEN_OBTAIN_SERIALIZER': 'usuarios.autenticacion.TokenConClaimsSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'usuarios.autenticacion.TokenRefrescoSerializer',
 
     'JTI_CLAIM': 'jti',
 
@@ -75,12 +90,55 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = 'usuarios.Usuario'
 
+# El backend cacheado evita consultar el usuario de la sesión en cada petición. ModelBackend
+# sigue en la lista para las sesiones abiertas con él (la sesión guarda la ruta del backend).
+AUTHENTICATION_BACKENDS = [
+    'usuarios.autenticacion.BackendCacheado',
+    'django.contrib.auth.backends.ModelBackend',
+]
+PERMISOS_CACHE_TTL = 300  # Segundos que se guardan usuario y proyectos en caché (default)
+
+# Sincronización incremental (/api/sincronizar/, api/sincronizacion.py)
+SINCRONIZACION_MARGEN = 5  # Segundos; debe superar la transacción más larga que escribe proyectos/tareas
+SINCRONIZACION_RETENCION_DIAS = 30  # Antigüedad de los borrados que conserva purgar_borrados
+
+# Diario de cambios (auditoria): se escribe por lotes desde un hilo por proceso
+AUDITORIA_ASINCRONA = True  # False: se escribe al confirmar cada transacción, en la propia petición
+AUDITORIA_TAMANO_LOTE = 200
+AUDITORIA_INTERVALO = 1.0  # Segundos máximos que un cambio espera en memoria
+
+# Métricas por vista (rendimiento/middleware.py), en /api/metricas/ y /api/metricas/prometheus/
+METRICAS_PETICIONES = True
+METRICAS_CONSULTA_LENTA_MS = 200  # Consultas más lentas se registran y van al log
+METRICAS_SQL_REPETIDO = 3  # La misma sentencia tantas veces en una petición se señala (N+1)
+METRICAS_MUESTRAS = 50  # Consultas lentas y repetidas recientes que se guardan
+
+# Perfiles bajo demanda (rendimiento/perfiles.py): cabecera X-Perfilar o /api/perfiles/activar/
+PERFILES_ACTIVOS = True
+PERFILES_DIR = os.path.join(BASE_DIR, 'perfiles')
+PERFILES_MAXIMO = 20  # Perfiles que se conservan en disco
+PERFILES_POR_MINUTO = 6  # Por proceso
+PERFILES_INTERVALO_MS = 1  # Muestreo de la pila para las pilas colapsadas
+
+# Funciones que entregan las notificaciones agrupadas por usuario (worker procesar_notificaciones)
+NOTIFICACIONES_ENTREGA = [
+    'notificaciones.entrega.bandeja',
+    # 'notificaciones.entrega.correo',  # Resumen por correo (requiere EMAIL_* configurado)
+]
+# Con una caché default de cada proceso (locmem) el contador de no leídas se guarda en cada
+# uno estos segundos: lo que entrega el worker aparece en la cabecera con ese retraso
+NOTIFICACIONES_CONTADOR_TTL_LOCAL = 15
+
 MIDDLEWARE = [
+    'rendimiento.middleware.MetricasMiddleware',  # Consultas y latencia por vista (METRICAS_PETICIONES)
+    'rendimiento.middleware.PerfilMiddleware',  # Perfiles bajo demanda (PERFILES_ACTIVOS)
+    'basedatos.middleware.ReplicasMiddleware',  # Lecturas a réplicas y leer lo propio (REPLICAS_LECTURA)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'auditoria.middleware.UsuarioActualMiddleware',  # Autor de los cambios en el diario
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -98,6 +156,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'notificaciones.context_processors.notificaciones',
             ],
         },
     },
@@ -106,13 +165,72 @@ TEMPLATES = [
 WSGI_APPLICATION = 'gestionProyecto.wsgi.application'
 
 # Database
+# Los motores de basedatos/ son los de Django con pool de conexiones (basedatos/pool.py):
+# OPTIONS['pool'] con tamano, inactividad, vida, espera y verificar_tras. Requiere CONN_MAX_AGE = 0.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'basedatos.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': True,
+        },
     }
 }
 
+# Réplicas de lectura (basedatos/router.py). En local, DB_REPLICA con la ruta de otra base
+# SQLite (p. ej. una copia de db.sqlite3) añade una para probar el enrutado; requiere
+# CACHE_DEFAULT=file o redis (el pegado a la principal tiene que verse desde todos los procesos).
+if os.environ.get('DB_REPLICA'):
+    DATABASES['replica'] = {**DATABASES['default'], 'NAME': os.environ['DB_REPLICA'], 'TEST': {'MIRROR': 'default'}}
+REPLICAS_LECTURA = [alias for alias in DATABASES if alias != 'default']
+REPLICAS_PEGADO_SEGUNDOS = 5  # Tras escribir, la sesión y el usuario leen de la principal
+DATABASE_ROUTERS = ['basedatos.router.RouterReplicas']
+
+# Caché. 'default' guarda usuarios y permisos (usuarios/permisos.py) y lo que los procesos
+# se avisan entre sí; 'vistas' guarda respuestas completas (proyectos/cache_vistas.py). Con
+# varios procesos (workers de gunicorn) las dos tienen que ser compartidas: locmem es de cada
+# proceso y lo que invalida uno no lo ven los demás. Se eligen con las variables de entorno
+# CACHE_DEFAULT y VISTAS_CACHE: locmem, file o redis (por defecto locmem).
+CACHES_DEFAULT = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', os.path.join(BASE_DIR, 'cache_default')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
+
+CACHES_VISTAS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vistas',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('VISTAS_CACHE_DIR', os.path.join(BASE_DIR, 'cache_vistas')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('VISTAS_CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': CACHES_DEFAULT[os.environ.get('CACHE_DEFAULT', 'locmem')],
+    'vistas': CACHES_VISTAS[os.environ.get('VISTAS_CACHE', 'locmem')],
+}
+VISTAS_CACHE_TIMEOUT = 300  # Segundos; las señales invalidan antes si cambian los datos
+# runserver es un solo proceso: ahí las generaciones de la caché de vistas pueden vivir en
+# locmem. Con varios workers, False y VISTAS_CACHE compartida (si no, la caché de vistas no se usa).
+VISTAS_CACHE_UN_PROCESO = True
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -25,7 +25,7 @@ from rest_framework_simplejwt.views import (
 )
 
 import usuarios.views
-from proyectos.views import badgets
+from proyectos.views import badgets, badgets_async, badgets_stream, cache_vistas
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -34,14 +34,17 @@ urlpatterns = [
     path('proyectos/', include('proyectos.urls')),
 
     path('badgets/', login_required(badgets), name='badgets'),
+    path('badgets/async/', login_required(badgets_async), name='badgets_async'),
+    path('badgets/stream/', login_required(badgets_stream), name='badgets_stream'),
+    path('cache-vistas/', cache_vistas, name='cache_vistas'),
 
     # URLs para autenticación JWT
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/token/verify/', TokenVerifyView.as_view(), name='token_verify'),  # Opcional
 
-    # Puedes añadir un path para tu API real, por ejemplo:
-    # path('api/', include('tu_app_api.urls')),
+    # API REST de proyectos, tareas y comentarios
+    path('api/', include('api.urls')),
 
 
 
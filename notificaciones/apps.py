@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class NotificacionesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'notificaciones'
+    verbose_name = "Notificaciones"
+
+    def ready(self):
+        # Encola eventos a partir de las señales de Tarea y Comentario
+        from . import signals  # noqa: F401
@@ -0,0 +1,97 @@
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from proyectos.models import Proyecto
+from usuarios.models import Usuario
+from .models import EventoNotificacion
+
+
+MAX_INTENTOS = 5
+TIEMPO_RECLAMO = timedelta(minutes=10) # Eventos 'procesando' más viejos se consideran abandonados
+
+
+def reclamar(tamano):
+    # Marca un lote de eventos pendientes con un token propio. El UPDATE ... WHERE estado='pendiente'
+    # es atómico, así que varios workers (o procesos) nunca toman el mismo evento.
+    EventoNotificacion.objects.filter(
+        estado='procesando', fecha_actualizacion__lt=timezone.now() - TIEMPO_RECLAMO
+    ).update(estado='pendiente', lote='', fecha_actualizacion=timezone.now())
+
+    lote = uuid.uuid4().hex
+    ids = list(EventoNotificacion.objects.filter(estado='pendiente')
+               .order_by('id').values_list('pk', flat=True)[:tamano])
+    EventoNotificacion.objects.filter(pk__in=ids, estado='pendiente').update(
+        estado='procesando', lote=lote, fecha_actualizacion=timezone.now())
+    return list(EventoNotificacion.objects.filter(lote=lote, estado='procesando'))
+
+
+def destinatarios(eventos):
+    # {usuario_id: [eventos]} — agrupa (coalesce) todos los eventos de cada usuario del lote
+    creadores = dict(Proyecto.objects.filter(
+        pk__in={evento.datos.get('proyecto') for evento in eventos if evento.tipo == 'tarea_completada'}
+    ).values_list('pk', 'creado_por'))
+
+    por_usuario = defaultdict(list)
+    for evento in eventos:
+        datos = evento.datos
+        if evento.tipo == 'tarea_asignada':
+            ids = {datos.get('asignado_a')}
+        elif evento.tipo == 'tarea_completada':
+            ids = {datos.get('creado_por'), creadores.get(datos.get('proyecto'))}
+        else:
+            ids = {datos.get('asignado_a'), datos.get('creado_por')}
+        for usuario_id in ids - {None, evento.actor_id}:
+            por_usuario[usuario_id].append(evento)
+    return por_usuario
+
+
+def _entregar(entregas, usuario, eventos):
+    try:
+        for entrega in entregas:
+            entrega(usuario, eventos)
+        return True
+    finally:
+        connection.close() # Cada hilo del pool abre su propia conexión
+
+
+def procesar_lote(tamano=200, hilos=4):
+    eventos = reclamar(tamano)
+    if not eventos:
+        return 0
+
+    entregas = [import_string(ruta) for ruta in
+                getattr(settings, 'NOTIFICACIONES_ENTREGA', ['notificaciones.entrega.bandeja'])]
+    por_usuario = destinatarios(eventos)
+    usuarios = Usuario.objects.in_bulk(list(por_usuario))
+
+    fallidos = set()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        futuros = {
+            pool.submit(_entregar, entregas, usuarios[usuario_id], lista): lista
+            for usuario_id, lista in por_usuario.items() if usuario_id in usuarios
+        }
+        for futuro, lista in futuros.items():
+            if futuro.exception() is not None:
+                fallidos.update(evento.pk for evento in lista)
+
+    # Entrega al menos una vez: un evento con algún destinatario fallido vuelve a la cola
+    # (los demás destinatarios podrían recibirlo de nuevo).
+    # update() no aplica auto_now: fecha_actualizacion se pasa a mano
+    ahora = timezone.now()
+    lote = EventoNotificacion.objects.filter(pk__in=[evento.pk for evento in eventos])
+    lote.exclude(pk__in=fallidos).update(estado='entregado', lote='', fecha_actualizacion=ahora)
+    if fallidos:
+        reintentos = lote.filter(pk__in=fallidos)
+        reintentos.filter(intentos__gte=MAX_INTENTOS - 1).update(
+            estado='fallido', lote='', intentos=F('intentos') + 1, fecha_actualizacion=ahora)
+        reintentos.filter(intentos__lt=MAX_INTENTOS - 1).update(
+            estado='pendiente', lote='', intentos=F('intentos') + 1, fecha_actualizacion=ahora)
+    return len(eventos)
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from gestionProyecto.caches import compartida
+
+
+# Contador de notificaciones no leídas por usuario, guardado en caché.
+# Quien cambia la bandeja (el worker al entregar, la vista al marcar como leídas) no toca el
+# número: invalidar() estrena una versión y la próxima lectura hace el COUNT y lo guarda
+# bajo ella. Un COUNT hecho antes de invalidar queda guardado bajo la versión vieja, que ya
+# nadie lee, así que no puede pisar uno más nuevo.
+# El worker corre en otro proceso: con una caché default compartida (CACHE_DEFAULT) su
+# invalidación se ve enseguida. Con locmem cada proceso guarda su propio número durante
+# NOTIFICACIONES_CONTADOR_TTL_LOCAL segundos: lo que marca el mismo proceso se ve al instante
+# y lo que entrega el worker, como mucho con ese retraso. En ambos casos, un COUNT por
+# versión o por ventana, no uno por página.
+
+TTL = 3600
+
+
+def _ttl():
+    return TTL if compartida() else getattr(settings, 'NOTIFICACIONES_CONTADOR_TTL_LOCAL', 15)
+
+
+def _clave(usuario_id):
+    return f'notificaciones:no_leidas:{usuario_id}'
+
+
+def _clave_version(usuario_id):
+    return f'notificaciones:no_leidas:version:{usuario_id}'
+
+
+def _contar(usuario_id):
+    from .models import Notificacion
+
+    return Notificacion.objects.filter(usuario_id=usuario_id, leida=False).count()
+
+
+def no_leidas(usuario_id):
+    version = cache.get(_clave_version(usuario_id))
+    if version is None:
+        # Sin versión (nunca invalidada o expulsada): se parte de una que no pueda repetirse
+        cache.add(_clave_version(usuario_id), time.time_ns(), None)
+        version = cache.get(_clave_version(usuario_id))
+    clave = f'{_clave(usuario_id)}:{version}'
+    valor = cache.get(clave)
+    if valor is None:
+        valor = _contar(usuario_id)
+        cache.set(clave, valor, _ttl())
+    return valor
+
+
+def invalidar(*usuario_ids):
+    cache.set_many({_clave_version(usuario_id): time.time_ns() for usuario_id in usuario_ids}, None)
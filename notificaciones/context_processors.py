@@ -0,0 +1,11 @@
+from django.utils.functional import SimpleLazyObject
+
+from .contadores import no_leidas
+
+
+def notificaciones(request):
+    # Número de notificaciones no leídas para la cabecera; perezoso y desde caché
+    usuario = getattr(request, 'user', None)
+    if usuario is None or not usuario.is_authenticated:
+        return {}
+    return {'notificaciones_no_leidas': SimpleLazyObject(lambda: no_leidas(usuario.pk))}
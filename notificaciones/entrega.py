@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .contadores import invalidar
+
+
+# Funciones de entrega: reciben un usuario y la lista de sus eventos ya agrupados
+# (coalescidos) y los notifican de una vez. Se eligen con settings.NOTIFICACIONES_ENTREGA.
+
+def bandeja(usuario, eventos):
+    # Un INSERT por lote para la bandeja del usuario; el contador en caché se recalcula
+    from .models import Notificacion
+
+    Notificacion.objects.bulk_create([
+        Notificacion(usuario=usuario, tipo=evento.tipo, mensaje=_describir(evento), tarea_id=evento.tarea_id)
+        for evento in eventos
+    ])
+    invalidar(usuario.pk)
+
+
+def correo(usuario, eventos):
+    if not usuario.email:
+        return
+    lineas = [_describir(evento) for evento in eventos]
+    asunto = lineas[0] if len(lineas) == 1 else f'Tienes {len(lineas)} notificaciones nuevas'
+    send_mail(asunto, '\n'.join(lineas), getattr(settings, 'DEFAULT_FROM_EMAIL', None), [usuario.email])
+
+
+def _describir(evento):
+    nombre = evento.datos.get('nombre', '')
+    if evento.tipo == 'tarea_asignada':
+        return f'Nueva tarea asignada: {nombre}'
+    if evento.tipo == 'tarea_completada':
+        return f'Tarea completada: {nombre}'
+    return f'Nuevo comentario en la tarea: {nombre}'
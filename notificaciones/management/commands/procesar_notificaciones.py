@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notificaciones.cola import procesar_lote
+
+
+class Command(BaseCommand):
+    help = 'Worker que entrega los eventos de notificación encolados (agrupados por usuario)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=4, help='Entregas en paralelo')
+        parser.add_argument('--lote', type=int, default=200, help='Eventos reclamados por vuelta')
+        parser.add_argument('--intervalo', type=float, default=2.0, help='Espera cuando la cola está vacía')
+        parser.add_argument('--una-vez', action='store_true', help='Vacía la cola y termina')
+
+    def handle(self, *args, **options):
+        while True:
+            procesados = procesar_lote(options['lote'], options['hilos'])
+            if procesados:
+                self.stdout.write(f'{procesados} eventos procesados')
+                continue
+            if options['una_vez']:
+                break
+            time.sleep(options['intervalo'])
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('proyectos', '0005_indices_acceso'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoNotificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('tarea_asignada', 'Nueva tarea asignada'), ('tarea_completada', 'Tarea completada'), ('comentario_nuevo', 'Nuevo comentario')], max_length=30)),
+                ('datos', models.JSONField(default=dict)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('entregado', 'Entregado'), ('fallido', 'Fallido')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('lote', models.CharField(blank=True, default='', max_length=32)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos_generados', to=settings.AUTH_USER_MODEL)),
+                ('tarea', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos_notificacion', to='proyectos.tarea')),
+            ],
+            options={
+                'verbose_name': 'Evento de notificación',
+                'verbose_name_plural': 'Eventos de notificación',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['estado', 'id'], name='evento_estado_idx'), models.Index(fields=['lote'], name='evento_lote_idx')],
+            },
+        ),
+    ]
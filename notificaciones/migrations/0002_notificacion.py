@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0001_initial'),
+        ('proyectos', '0005_indices_acceso'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('tarea_asignada', 'Nueva tarea asignada'), ('tarea_completada', 'Tarea completada'), ('comentario_nuevo', 'Nuevo comentario')], max_length=30)),
+                ('mensaje', models.CharField(max_length=255)),
+                ('leida', models.BooleanField(default=False)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('tarea', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notificaciones', to='proyectos.tarea')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notificaciones', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notificación',
+                'verbose_name_plural': 'Notificaciones',
+                'ordering': ['-fecha_creacion', '-id'],
+                'indexes': [models.Index(fields=['usuario', 'fecha_creacion', 'id'], name='notificacion_bandeja_idx'), models.Index(fields=['usuario', 'leida'], name='notificacion_no_leidas_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import models
+
+
+class EventoNotificacion(models.Model):
+    # Cola durable de eventos. La petición solo inserta una fila por evento; los
+    # destinatarios se resuelven y se notifican en el worker (procesar_notificaciones).
+
+    TIPO_CHOICES = (
+        ('tarea_asignada', 'Nueva tarea asignada'),
+        ('tarea_completada', 'Tarea completada'),
+        ('comentario_nuevo', 'Nuevo comentario'),
+    )
+
+    ESTADO_CHOICES = (
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('entregado', 'Entregado'),
+        ('fallido', 'Fallido'),
+    )
+
+    tipo = models.CharField(max_length=30, choices=TIPO_CHOICES)
+    tarea = models.ForeignKey(
+        'proyectos.Tarea',
+        on_delete=models.SET_NULL, # Si la tarea se elimina, el evento conserva sus datos
+        related_name='eventos_notificacion',
+        null=True, blank=True
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='eventos_generados',
+        null=True, blank=True
+    )
+    datos = models.JSONField(default=dict) # Copia de lo necesario para notificar sin releer la tarea
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    intentos = models.PositiveSmallIntegerField(default=0)
+    lote = models.CharField(max_length=32, blank=True, default='') # Worker que reclamó el evento
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Evento de notificación"
+        verbose_name_plural = "Eventos de notificación"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['estado', 'id'], name='evento_estado_idx'),
+            models.Index(fields=['lote'], name='evento_lote_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} ({self.get_estado_display()})"
+
+
+class Notificacion(models.Model):
+    # Bandeja de entrada de cada usuario (la llena el worker con entrega.bandeja)
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE, # Si el usuario se elimina, su bandeja también
+        related_name='notificaciones'
+    )
+    tipo = models.CharField(max_length=30, choices=EventoNotificacion.TIPO_CHOICES)
+    mensaje = models.CharField(max_length=255)
+    tarea = models.ForeignKey(
+        'proyectos.Tarea',
+        on_delete=models.SET_NULL,
+        related_name='notificaciones',
+        null=True, blank=True
+    )
+    leida = models.BooleanField(default=False)
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Notificación"
+        verbose_name_plural = "Notificaciones"
+        ordering = ['-fecha_creacion', '-id']
+        indexes = [
+            # Bandeja paginada por cursor y conteo de no leídas
+            models.Index(fields=['usuario', 'fecha_creacion', 'id'], name='notificacion_bandeja_idx'),
+            models.Index(fields=['usuario', 'leida'], name='notificacion_no_leidas_idx'),
+        ]
+
+    def __str__(self):
+        return self.mensaje
@@ -0,0 +1,69 @@
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+
+from auditoria.middleware import usuario_actual
+from proyectos.models import Tarea, Comentario
+from proyectos.signals import tareas_masivas
+from .models import EventoNotificacion
+
+
+# Cada evento es un solo INSERT en la misma transacción que el cambio,
+# sin importar cuántos destinatarios tenga. El evento guarda quién hizo el cambio (actor)
+# para que el worker no le notifique sus propias acciones (cola.destinatarios).
+
+def _datos_tarea(tarea):
+    return {
+        'tarea': tarea.pk,
+        'nombre': tarea.nombre,
+        'proyecto': tarea.proyecto_id,
+        'asignado_a': tarea.asignado_a_id,
+        'creado_por': tarea.creado_por_id,
+    }
+
+
+def eventos_de_tarea(tarea, anterior, actor_id=None):
+    # anterior: {'asignado_a_id', 'estado'} antes del cambio, o None si la tarea es nueva
+    eventos = []
+    if tarea.asignado_a_id and (anterior is None or anterior['asignado_a_id'] != tarea.asignado_a_id):
+        eventos.append('tarea_asignada')
+    if tarea.estado == 'completado' and (anterior is None or anterior['estado'] != 'completado'):
+        eventos.append('tarea_completada')
+    return [EventoNotificacion(tipo=tipo, tarea_id=tarea.pk, actor_id=actor_id,
+                               datos=_datos_tarea(tarea)) for tipo in eventos]
+
+
+@receiver(pre_save, sender=Tarea)
+def tarea_por_guardar(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._notificacion_anterior = (
+            Tarea.objects.filter(pk=instance.pk).values('asignado_a_id', 'estado').first())
+
+
+@receiver(post_save, sender=Tarea)
+def tarea_guardada(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = None if created else getattr(instance, '_notificacion_anterior', None)
+    eventos = eventos_de_tarea(instance, anterior, usuario_actual())
+    if eventos:
+        EventoNotificacion.objects.bulk_create(eventos)
+
+
+@receiver(post_save, sender=Comentario)
+def comentario_creado(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        tarea = instance.tarea
+        datos = _datos_tarea(tarea)
+        datos['comentario'] = instance.pk
+        EventoNotificacion.objects.create(tipo='comentario_nuevo', tarea=tarea,
+                                          actor_id=instance.autor_id, datos=datos)
+
+
+@receiver(tareas_masivas, sender=Tarea)
+def tareas_en_bloque(sender, accion, tareas, campos, usuario, anteriores=None, **kwargs):
+    # En 'actualizar' se compara con los valores de antes del lote: reenviar el mismo estado no notifica
+    eventos = []
+    for tarea in tareas:
+        anterior = None if accion == 'crear' else anteriores[tarea.pk]
+        eventos += eventos_de_tarea(tarea, anterior, usuario.pk)
+    EventoNotificacion.objects.bulk_create(eventos, batch_size=500)
@@ -0,0 +1,126 @@
+import tempfile
+from datetime import date
+
+from django.core.cache import cache
+from django.template import RequestContext, Template
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from proyectos.models import Proyecto, Tarea
+from usuarios.models import Usuario
+from . import contadores
+from .cola import destinatarios
+from .models import EventoNotificacion, Notificacion
+
+
+class ActorTests(APITestCase):
+
+    def setUp(self):
+        self.dueno = Usuario.objects.create_user('dueno', password='clave', rol='colaborador')
+        self.colaborador = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        self.proyecto = Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.dueno)
+        self.proyecto.colaboradores.add(self.colaborador)
+        self.client.force_authenticate(self.colaborador)
+
+    def test_no_se_notifica_al_autor_del_cambio(self):
+        tarea = Tarea.objects.create(proyecto=self.proyecto, nombre='T1', creado_por=self.colaborador,
+                                     asignado_a=self.dueno)
+        response = self.client.patch(f'/api/tareas/{tarea.pk}/', {'estado': 'completado'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        evento = EventoNotificacion.objects.get(tipo='tarea_completada')
+        self.assertEqual(evento.actor_id, self.colaborador.pk)
+        self.assertEqual(set(destinatarios([evento])), {self.dueno.pk})
+
+    def test_eventos_masivos_en_la_misma_transaccion(self):
+        # Sin on_commit: las filas existen antes de confirmar (TestCase nunca confirma)
+        response = self.client.post('/api/tareas/masivo/', [
+            {'proyecto': self.proyecto.pk, 'nombre': 'Propia', 'asignado_a': self.colaborador.pk},
+            {'proyecto': self.proyecto.pk, 'nombre': 'Ajena', 'asignado_a': self.dueno.pk},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        eventos = list(EventoNotificacion.objects.filter(tipo='tarea_asignada'))
+        self.assertEqual(len(eventos), 2)
+        self.assertEqual({evento.actor_id for evento in eventos}, {self.colaborador.pk})
+        self.assertEqual({usuario: [evento.datos['nombre'] for evento in lista]
+                          for usuario, lista in destinatarios(eventos).items()}, {self.dueno.pk: ['Ajena']})
+
+
+class TareasEnBloqueTests(APITestCase):
+    url = '/api/tareas/masivo/'
+
+    def setUp(self):
+        self.dueno = Usuario.objects.create_user('dueno', password='clave', rol='colaborador')
+        self.proyecto = Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.dueno)
+        self.hecha = Tarea.objects.create(proyecto=self.proyecto, nombre='Hecha', creado_por=self.dueno,
+                                          asignado_a=self.dueno, estado='completado')
+        self.pendiente = Tarea.objects.create(proyecto=self.proyecto, nombre='Pendiente', creado_por=self.dueno)
+        EventoNotificacion.objects.all().delete()
+        self.client.force_authenticate(self.dueno)
+
+    def test_actualizar_sin_cambios_no_crea_eventos(self):
+        for datos in ({'ids': [self.hecha.pk], 'estado': 'completado', 'asignado_a': self.dueno.pk},
+                      [{'id': self.hecha.pk, 'estado': 'completado', 'asignado_a': self.dueno.pk}]):
+            with self.subTest(datos=datos):
+                response = self.client.patch(self.url, datos, format='json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(EventoNotificacion.objects.count(), 0)
+
+    def test_solo_las_tareas_que_cambian_crean_eventos(self):
+        response = self.client.patch(self.url, {'ids': [self.hecha.pk, self.pendiente.pk], 'estado': 'completado'},
+                                     format='json')
+        self.assertEqual(response.data, {'actualizadas': 2})
+        self.assertEqual(list(EventoNotificacion.objects.values_list('tipo', 'tarea_id')),
+                         [('tarea_completada', self.pendiente.pk)])
+
+
+class ContadorNoLeidasTests(TestCase):
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave')
+
+    def notificar(self):
+        Notificacion.objects.create(usuario=self.usuario, tipo='tarea_asignada', mensaje='Nueva tarea')
+
+    def test_con_cache_compartida_se_guarda_hasta_invalidar(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio}}):
+            self.assertEqual(contadores.no_leidas(self.usuario.pk), 0)
+            self.notificar()
+            self.assertEqual(contadores.no_leidas(self.usuario.pk), 0)
+            contadores.invalidar(self.usuario.pk)
+            self.assertEqual(contadores.no_leidas(self.usuario.pk), 1)
+
+    def test_un_conteo_viejo_no_pisa_la_invalidacion(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio}}):
+            contadores.no_leidas(self.usuario.pk)
+            version = cache.get(contadores._clave_version(self.usuario.pk))
+            self.notificar()
+            contadores.invalidar(self.usuario.pk)
+            # Una lectura que contó antes de la entrega guarda su número tarde
+            cache.set(f'{contadores._clave(self.usuario.pk)}:{version}', 0)
+            self.assertEqual(contadores.no_leidas(self.usuario.pk), 1)
+
+    def test_con_cache_local_se_guarda_por_proceso(self):
+        cache.clear()
+        self.assertEqual(contadores.no_leidas(self.usuario.pk), 0)
+        self.notificar()
+        # Lo que entrega el worker (otro proceso) llega al vencer la ventana local
+        self.assertEqual(contadores.no_leidas(self.usuario.pk), 0)
+        contadores.invalidar(self.usuario.pk)
+        self.assertEqual(contadores.no_leidas(self.usuario.pk), 1)
+        with override_settings(NOTIFICACIONES_CONTADOR_TTL_LOCAL=0):
+            contadores.invalidar(self.usuario.pk)
+            contadores.no_leidas(self.usuario.pk)
+            self.notificar()
+            self.assertEqual(contadores.no_leidas(self.usuario.pk), 2)
+
+    def test_la_cabecera_no_consulta_en_la_segunda_pagina(self):
+        cache.clear()
+        self.notificar()
+        request = RequestFactory().get('/')
+        request.user = self.usuario
+        plantilla = Template('{{ notificaciones_no_leidas }}')
+        self.assertEqual(plantilla.render(RequestContext(request)), '1')
+        with self.assertNumQueries(0):
+            self.assertEqual(plantilla.render(RequestContext(request)), '1')
@@ -0,0 +1,45 @@
+from django.utils import timezone
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.paginacion import PaginacionCursor
+from api.serializer import NotificacionSerializer
+from .contadores import invalidar, no_leidas
+from .models import Notificacion
+
+
+class NotificacionListAPIView(generics.ListAPIView):
+    # Bandeja del usuario autenticado, paginada por cursor; ?no_leidas=1 filtra las pendientes
+    serializer_class = NotificacionSerializer
+    pagination_class = PaginacionCursor
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Notificacion.objects.filter(usuario_id=self.request.user.pk)
+        if self.request.query_params.get('no_leidas'):
+            queryset = queryset.filter(leida=False)
+        return queryset
+
+
+class NotificacionNoLeidasAPIView(APIView):
+    # Solo el contador (desde caché): pensado para la cabecera
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'no_leidas': no_leidas(request.user.pk)})
+
+
+class NotificacionMarcarLeidaAPIView(APIView):
+    # POST {"ids": [...]} marca esas notificaciones; sin ids marca todas
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        queryset = Notificacion.objects.filter(usuario_id=request.user.pk, leida=False)
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+        marcadas = queryset.update(leida=True, fecha_actualizacion=timezone.now())
+        if marcadas:
+            invalidar(request.user.pk)
+        return Response({'marcadas': marcadas, 'no_leidas': no_leidas(request.user.pk)})
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class ProyectosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'proyectos'
+
+    def ready(self):
+        # Registra los receptores de señales (contadores del dashboard)
+        from . import signals  # noqa: F401
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from gestionProyecto.caches import compartida
+
+
+# Caché de respuestas por vista. La clave combina la vista, el objeto (pk), el rol
+# (o el usuario, si no es administrador), los parámetros de la petición y una
+# "generación" por modelo y por objeto. Las señales (proyectos/signals.py) incrementan las generaciones al guardar
+# o borrar, así que invalidar es O(1): las claves viejas simplemente dejan de usarse.
+# Las generaciones tienen que ser las mismas para todos los procesos: con un backend de cada
+# proceso (locmem) un worker no se entera de lo que invalidó otro y serviría páginas viejas.
+# Por eso, salvo VISTAS_CACHE_UN_PROCESO, con locmem no se guarda nada. Los ETag no usan
+# las generaciones (proyectos/condicional.py): hay 304 con o sin esta caché.
+
+ALIAS = getattr(settings, 'VISTAS_CACHE_ALIAS', 'vistas')
+TIMEOUT = getattr(settings, 'VISTAS_CACHE_TIMEOUT', 300)
+
+_estadisticas = {}
+_candado = threading.Lock()
+
+
+def _cache():
+    return caches[ALIAS]
+
+
+def activa():
+    return compartida(ALIAS) or getattr(settings, 'VISTAS_CACHE_UN_PROCESO', False)
+
+
+def _clave_generacion(modelo, pk=None):
+    return f'gen:{modelo}' if pk is None else f'gen:{modelo}:{pk}'
+
+
+def invalidar(modelo, pk=None):
+    # Nueva generación para el modelo (listados) y, si se indica, para el objeto
+    if not activa():
+        return
+    claves = [_clave_generacion(modelo)] + ([_clave_generacion(modelo, pk)] if pk is not None else [])
+    cache = _cache()
+    for clave in claves:
+        try:
+            cache.incr(clave)
+        except ValueError:
+            # Sin valor previo: se parte de un número que no pueda repetir uno ya expulsado
+            cache.set(clave, time.time_ns(), None)
+
+
+def _generaciones(claves):
+    cache = _cache()
+    valores = cache.get_many(claves)
+    for clave in claves:
+        if clave not in valores:
+            valores[clave] = time.time_ns()
+            cache.add(clave, valores[clave], None)
+    return ':'.join(str(valores[clave]) for clave in claves)
+
+
+def _registrar(nombre, acierto):
+    with _candado:
+        datos = _estadisticas.setdefault(nombre, {'aciertos': 0, 'fallos': 0})
+        datos['aciertos' if acierto else 'fallos'] += 1
+
+
+def estadisticas():
+    with _candado:
+        resultado = {nombre: dict(datos) for nombre, datos in _estadisticas.items()}
+    for datos in resultado.values():
+        total = datos['aciertos'] + datos['fallos']
+        datos['proporcion_aciertos'] = round(datos['aciertos'] / total, 4) if total else 0.0
+    return resultado
+
+
+def cache_vista(modelos, objeto=None, timeout=None, html=False):
+    """Guarda en caché la respuesta de una vista (GET/HEAD o POST de consulta).
+
+    modelos: nombres de modelo de los que depende la respuesta ('proyecto', 'tarea'...).
+    objeto:  modelo del kwarg 'pk' de la URL; la clave incluye su generación propia.
+    html:    la página lleva {% csrf_token %} y datos del usuario; se separa por usuario y
+             cookie CSRF, y sin cookie no se guarda. Si no, los administradores comparten
+             clave y el resto la tiene por usuario.
+    """
+    def decorador(vista):
+        nombre_funcion = f'{vista.__module__}.{vista.__qualname__}'
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            # Con method_decorator todas las vistas de un mixin comparten __qualname__
+            nombre = getattr(request.resolver_match, 'view_name', None) or nombre_funcion
+            usuario = request.user
+            cookie_csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+            if not usuario.is_authenticated or (html and not cookie_csrf) or not activa():
+                return vista(request, *args, **kwargs)
+
+            generaciones = [_clave_generacion(modelo) for modelo in modelos]
+            if objeto is not None and 'pk' in kwargs:
+                generaciones.append(_clave_generacion(objeto, kwargs['pk']))
+            parametros = sorted(request.GET.lists()) + sorted(request.POST.lists())
+            firma = hashlib.sha1(repr((
+                request.method, request.path, parametros, cookie_csrf if html else '',
+            )).encode()).hexdigest()
+            # Las páginas HTML muestran datos del propio usuario (cabecera) y, salvo al
+            # administrador, los listados dependen de sus proyectos (visible_to): por usuario
+            rol = getattr(usuario, 'rol', '')
+            dueno = f'{rol}:{usuario.pk if html or rol != "administrador" else ""}'
+            clave = f'vista:{nombre}:{dueno}:{firma}:{_generaciones(generaciones)}'
+
+            cache = _cache()
+            guardada = cache.get(clave)
+            if guardada is not None:
+                _registrar(nombre, True)
+                estado, contenido, cabeceras = guardada
+                response = HttpResponse(contenido, status=estado)
+                for cabecera, valor in cabeceras:
+                    response[cabecera] = valor
+                return response
+
+            _registrar(nombre, False)
+            response = vista(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(clave, (response.status_code, response.content, list(response.items())),
+                          timeout or TIMEOUT)
+            return response
+        # basedatos.router lo busca: lo que se guarda bajo la generación nueva no puede salir
+        # de una réplica que aún no ha recibido la escritura, así que estas vistas leen de la principal
+        envoltura.cache_vista = True
+        return envoltura
+    return decorador
@@ -0,0 +1,100 @@
+import hashlib
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count, Max, Subquery, Value
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+# Peticiones condicionales (If-None-Match / If-Modified-Since). La huella de un recurso sale
+# de una sola consulta agregada: MAX(fecha_actualizacion) y COUNT de las filas y de cada
+# relación anidada que se muestra. Un alta o una edición mueven la fecha y un borrado el
+# total, así que si la huella coincide se responde 304 sin serializar ni renderizar nada.
+# Las tablas enteras de las que también depende la respuesta (los usuarios anidados, los
+# selects de un formulario) entran igual, como subconsultas en la misma consulta. Todo sale
+# de la base de datos: el ETag no depende de la caché de vistas ni de en qué proceso se calcula.
+
+def huella(queryset, relaciones=(), extra=(), dependencias=()):
+    """Devuelve (etag, ultima_modificacion) para las filas del queryset.
+
+    relaciones:   rutas ORM anidadas que forman parte de la respuesta ('tareas', 'tareas__comentarios').
+    extra:        cualquier otro dato del que dependa la respuesta (parámetros, usuario...).
+    dependencias: nombres de modelo ('usuario', 'proyecto'...) cuyas filas también aparecen.
+    """
+    datos = queryset.order_by().aggregate(**_agregados(relaciones, dependencias))
+    return _firmar(datos, relaciones, extra)
+
+
+async def ahuella(queryset, relaciones=(), extra=(), dependencias=()):
+    """huella() para vistas async: la consulta agregada va por el ORM asíncrono."""
+    datos = await queryset.order_by().aaggregate(**_agregados(relaciones, dependencias))
+    return _firmar(datos, relaciones, extra)
+
+
+def _agregados(relaciones, dependencias):
+    agregados = {
+        'ultima': Max('fecha_actualizacion'),
+        'total': Count('pk', distinct=bool(relaciones)),  # Los JOIN repiten filas
+    }
+    for indice, ruta in enumerate(relaciones):
+        agregados[f'ultima_{indice}'] = Max(f'{ruta}__fecha_actualizacion')
+        agregados[f'total_{indice}'] = Count(ruta, distinct=True)
+    for nombre in dependencias:
+        # Subconsulta escalar de toda la tabla; MAX() solo la convierte en agregado (sin filas
+        # en el queryset queda NULL, y entonces tampoco se muestra nada de esa tabla)
+        tabla = _modelo(nombre)._default_manager.order_by().annotate(uno=Value(1)).values('uno')
+        agregados[f'{nombre}_ultima'] = Max(Subquery(tabla.annotate(valor=Max('fecha_actualizacion')).values('valor')))
+        agregados[f'{nombre}_total'] = Max(Subquery(tabla.annotate(valor=Count('pk')).values('valor')))
+    return agregados
+
+
+def _modelo(nombre):
+    return next(modelo for modelo in apps.get_models() if modelo._meta.model_name == nombre)
+
+
+def _firmar(datos, relaciones, extra):
+    firma = repr((sorted(datos.items()), relaciones, tuple(extra)))
+    etag = '"%s"' % hashlib.sha1(firma.encode()).hexdigest()
+    return etag, datos['ultima']
+
+
+def condicion_html(modelo, relaciones=(), dependencias=()):
+    """Decorador para vistas HTML de detalle (kwarg 'pk'), basado en django.views.decorators.http.condition.
+
+    dependencias: modelos cuyas filas también aparecen en la página (p. ej. los usuarios de
+    los selects del formulario); entran a la huella con su MAX(fecha_actualizacion) y COUNT.
+    """
+    def calcular(request, pk=None, **kwargs):
+        # condition() pide el ETag y la fecha por separado: una sola consulta por petición
+        if not hasattr(request, '_huella_html'):
+            extra = (
+                request.get_full_path(),
+                request.user.pk,  # La página muestra al usuario y su token CSRF
+                request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+            )
+            # Con visible_to: un pk ajeno tiene la huella de uno inexistente y nunca la del objeto
+            etag, ultima = huella(modelo._default_manager.visible_to(request.user).filter(pk=pk),
+                                  relaciones, extra, dependencias)
+            # Sin ETag un cliente solo compararía fechas, que no cambian con borrados anidados
+            request._huella_html = (etag, ultima if not relaciones and not dependencias else None)
+        return request._huella_html
+
+    decorador_condicion = condition(
+        etag_func=lambda request, *args, **kwargs: calcular(request, *args, **kwargs)[0],
+        last_modified_func=lambda request, *args, **kwargs: calcular(request, *args, **kwargs)[1],
+    )
+
+    def decorador(vista):
+        vista_condicional = decorador_condicion(vista)
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return vista(request, *args, **kwargs)
+            response = vista_condicional(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)  # Siempre revalidar
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Proyecto, Tarea, ResumenDiarioProyecto
+
+# Estado de los proyectos con consultas agrupadas: un GROUP BY para todos los proyectos
+# en vez de una consulta (o un bucle sobre proyecto.tareas.all()) por proyecto.
+# La evolución diaria se lee de ResumenDiarioProyecto, que llena el comando
+# instantanea_proyectos, en lugar de recorrer las tareas de cada día.
+
+CAMPOS_RESUMEN = ('total', 'pendientes', 'en_progreso', 'completadas', 'vencidas')
+
+
+def fecha_hoy():
+    # timezone.localdate() falla con USE_TZ = False (settings-server): ahí la hora ya es local
+    return timezone.localdate() if settings.USE_TZ else date.today()
+
+
+def _conteos(prefijo, hoy):
+    # Conteos condicionales (COUNT(...) FILTER / SUM(CASE ...)) sobre las tareas;
+    # prefijo es la ruta hasta Tarea desde el modelo agrupado ('' o 'tareas__')
+    abierta = ~Q(**{f'{prefijo}estado': 'completado'})
+    return {
+        'total': Count(f'{prefijo}id'),
+        'pendientes': Count(f'{prefijo}id', filter=Q(**{f'{prefijo}estado': 'pendiente'})),
+        'en_progreso': Count(f'{prefijo}id', filter=Q(**{f'{prefijo}estado': 'en_progreso'})),
+        'completadas': Count(f'{prefijo}id', filter=Q(**{f'{prefijo}estado': 'completado'})),
+        'vencidas': Count(f'{prefijo}id', filter=abierta & Q(**{f'{prefijo}fecha_vencimiento__lt': hoy})),
+    }
+
+
+def resumen_proyectos(proyectos=None, hoy=None):
+    """Una fila por proyecto (también los que no tienen tareas) con sus conteos.
+
+    `proyectos` limita a esos ids o a una subconsulta de ids (None: todos). Una sola
+    consulta con LEFT JOIN a las tareas y GROUP BY proyecto.
+    """
+    hoy = hoy or fecha_hoy()
+    queryset = Proyecto.objects.all()
+    if proyectos is not None:
+        queryset = queryset.filter(pk__in=proyectos)
+    return list(queryset.order_by('nombre', 'pk')
+                .values('id', 'nombre', 'estado')
+                .annotate(**_conteos('tareas__', hoy)))
+
+
+def totales(proyectos=None, hoy=None):
+    # Los mismos conteos sumando todos los proyectos: una consulta sin GROUP BY
+    queryset = Tarea.objects.all()
+    if proyectos is not None:
+        queryset = queryset.filter(proyecto_id__in=proyectos)
+    return queryset.aggregate(**_conteos('', hoy or fecha_hoy()))
+
+
+def carga_por_asignado(proyectos=None, hoy=None):
+    """Tareas abiertas y vencidas de cada usuario asignado (None: sin asignar)."""
+    hoy = hoy or fecha_hoy()
+    queryset = Tarea.objects.exclude(estado='completado')
+    if proyectos is not None:
+        queryset = queryset.filter(proyecto_id__in=proyectos)
+    return list(queryset.order_by()
+                .values('asignado_a', 'asignado_a__username')
+                .annotate(abiertas=Count('id'),
+                          en_progreso=Count('id', filter=Q(estado='en_progreso')),
+                          vencidas=Count('id', filter=Q(fecha_vencimiento__lt=hoy)))
+                .order_by('-abiertas', 'asignado_a'))
+
+
+def guardar_instantanea(fecha=None):
+    """Guarda (o reescribe) el resumen de `fecha` de todos los proyectos. Devuelve cuántos.
+
+    El estado de las tareas no tiene historia: se guarda el estado actual con la etiqueta
+    `fecha` (por defecto hoy) y `vencidas` se calcula respecto de esa fecha. Repetirla el
+    mismo día sustituye las filas (INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE).
+    """
+    fecha = fecha or fecha_hoy()
+    filas = [
+        ResumenDiarioProyecto(proyecto_id=fila['id'], fecha=fecha, **{campo: fila[campo] for campo in CAMPOS_RESUMEN})
+        for fila in resumen_proyectos(hoy=fecha)
+    ]
+    ResumenDiarioProyecto.objects.bulk_create(
+        filas, batch_size=1000, update_conflicts=True,
+        unique_fields=['proyecto', 'fecha'], update_fields=list(CAMPOS_RESUMEN),
+    )
+    return len(filas)
+
+
+def burndown(proyecto_id, dias=30, hoy=None):
+    """Serie diaria de los últimos `dias` días de un proyecto, desde ResumenDiarioProyecto."""
+    hoy = hoy or fecha_hoy()
+    return list(ResumenDiarioProyecto.objects
+                .filter(proyecto_id=proyecto_id, fecha__gt=hoy - timedelta(days=dias), fecha__lte=hoy)
+                .order_by('fecha')
+                .values('fecha', *CAMPOS_RESUMEN))
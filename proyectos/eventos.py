@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+
+from .models import ContadorGlobal
+
+
+class CentroBadgets:
+    # Reparte los contadores del dashboard a todos los navegadores suscritos.
+    # Una sola corrutina consulta ContadorGlobal (una fila) cada `intervalo` segundos
+    # y solo despierta a los suscriptores cuando los valores cambian.
+
+    def __init__(self, intervalo=1.0):
+        self.intervalo = intervalo
+        self.suscriptores = set()
+        self.ultimo = None
+        self._tarea = None
+
+    async def suscribir(self):
+        # Cola de tamaño 1: si un cliente va lento solo recibe el valor más reciente
+        cola = asyncio.Queue(maxsize=1)
+        self.suscriptores.add(cola)
+        if self.ultimo is not None:
+            cola.put_nowait(self.ultimo)
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._sondear())
+        return cola
+
+    def cancelar(self, cola):
+        self.suscriptores.discard(cola)
+
+    def publicar(self, datos):
+        if datos == self.ultimo:
+            return
+        self.ultimo = datos
+        for cola in self.suscriptores:
+            if cola.full():
+                cola.get_nowait()
+            cola.put_nowait(datos)
+
+    async def _sondear(self):
+        leer = sync_to_async(ContadorGlobal.leer)
+        while self.suscriptores:
+            self.publicar(await leer())
+            await asyncio.sleep(self.intervalo)
+        # Sin suscriptores la corrutina termina; el próximo suscribir() la reinicia
+        self.ultimo = None
+
+
+centro_badgets = CentroBadgets()
+
+
+def evento_sse(datos):
+    return f"data: {json.dumps(datos)}\n\n"
+
+
+async def flujo_badgets(latido=15):
+    cola = await centro_badgets.suscribir()
+    try:
+        # Indica al navegador cuánto esperar antes de reconectar
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                datos = await asyncio.wait_for(cola.get(), timeout=latido)
+            except asyncio.TimeoutError:
+                # Comentario SSE para mantener viva la conexión a través de proxies
+                yield ": latido\n\n"
+                continue
+            yield evento_sse(datos)
+    finally:
+        centro_badgets.cancelar(cola)
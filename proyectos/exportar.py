@@ -0,0 +1,64 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+# Exportación en flujo: las filas se codifican una a una mientras se envían,
+# así la memoria no depende del tamaño de la tabla.
+
+FORMATOS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+TAMANO_BLOQUE = 2000  # Filas por lectura de .iterator()
+
+
+class _Eco:
+    # Buffer falso para csv.writer: devuelve la línea en lugar de guardarla
+    def write(self, valor):
+        return valor
+
+
+def _json(filas):
+    codificar = DjangoJSONEncoder().encode
+    yield '['
+    for i, fila in enumerate(filas):
+        yield (',' if i else '') + codificar(fila)
+    yield ']'
+
+
+def _ndjson(filas):
+    codificar = DjangoJSONEncoder().encode
+    for fila in filas:
+        yield codificar(fila) + '\n'
+
+
+def _csv(filas, columnas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(columnas)
+    for fila in filas:
+        yield escritor.writerow([_celda(fila.get(columna)) for columna in columnas])
+
+
+def _celda(valor):
+    # Las relaciones anidadas de los serializadores van como JSON dentro de la celda
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, cls=DjangoJSONEncoder)
+    return valor
+
+
+def respuesta_exportacion(filas, formato, columnas, nombre):
+    """StreamingHttpResponse que codifica `filas` (iterable de dicts) en el formato pedido."""
+    if formato == 'csv':
+        contenido = _csv(filas, columnas)
+    elif formato == 'ndjson':
+        contenido = _ndjson(filas)
+    else:
+        formato = 'json'
+        contenido = _json(filas)
+    response = StreamingHttpResponse(contenido, content_type=FORMATOS[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+    return response
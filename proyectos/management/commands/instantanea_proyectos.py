@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from proyectos.estadisticas import guardar_instantanea
+
+
+class Command(BaseCommand):
+    help = ('Guarda el resumen diario de tareas de cada proyecto (ResumenDiarioProyecto) para las '
+            'gráficas de evolución. Programarlo una vez al día, p. ej. con cron a las 23:55.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', help='Día con el que se etiqueta la foto (AAAA-MM-DD); por defecto hoy. '
+                                            'Se guarda el estado actual: no reconstruye días pasados.')
+
+    def handle(self, *args, **options):
+        fecha = None
+        if options['fecha']:
+            try:
+                fecha = date.fromisoformat(options['fecha'])
+            except ValueError:
+                raise CommandError('--fecha debe tener el formato AAAA-MM-DD')
+        total = guardar_instantanea(fecha)
+        self.stdout.write(self.style.SUCCESS(f'Resumen guardado para {total} proyectos'))
@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from proyectos.estadisticas import fecha_hoy
+from proyectos.models import Proyecto
+from usuarios.models import Usuario
+
+
+class Deshacer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Mide Proyecto.objects.visible_to() (IN sobre los proyectos del usuario) frente a EXISTS '
+            'correlacionado y al JOIN con DISTINCT sobre los colaboradores, con datos sintéticos que se crean dentro de una transacción y se '
+            'deshacen al terminar. Con --settings=gestionProyecto.settings-server se mide MySQL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--proyectos', type=int, default=100_000)
+        parser.add_argument('--colaboradores', type=int, default=50, help='Colaboradores por proyecto')
+        parser.add_argument('--usuarios', type=int, default=5_000)
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--lote', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                usuario = self._poblar(options)
+                self._medir(usuario, options['repeticiones'])
+                raise Deshacer
+        except Deshacer:
+            self.stdout.write(self.style.SUCCESS('Datos sintéticos eliminados'))
+
+    def _poblar(self, options):
+        inicio = time.perf_counter()
+        prefijo = f'visibilidad-{time.time_ns()}'
+        Usuario.objects.bulk_create(
+            [Usuario(username=f'{prefijo}-{i}', rol='colaborador') for i in range(options['usuarios'])],
+            batch_size=options['lote'])
+        usuarios = list(Usuario.objects.filter(username__startswith=prefijo).values_list('pk', flat=True))
+
+        hoy = fecha_hoy()
+        intermedia = Proyecto.colaboradores.through
+        aleatorio = random.Random(1)
+        creados = 0
+        while creados < options['proyectos']:
+            cantidad = min(options['lote'], options['proyectos'] - creados)
+            # Proyecto no usa bulk_create con pk de vuelta en todos los motores: se releen por nombre
+            Proyecto.objects.bulk_create([
+                Proyecto(nombre=f'{prefijo}-{creados + i:07d}', fecha_inicio=hoy,
+                         creado_por_id=aleatorio.choice(usuarios))
+                for i in range(cantidad)
+            ])
+            ids = Proyecto.objects.filter(
+                nombre__gte=f'{prefijo}-{creados:07d}', nombre__lte=f'{prefijo}-{creados + cantidad - 1:07d}',
+            ).values_list('pk', flat=True)
+            intermedia.objects.bulk_create([
+                intermedia(proyecto_id=proyecto_id, usuario_id=usuario_id)
+                for proyecto_id in ids
+                for usuario_id in aleatorio.sample(usuarios, min(options['colaboradores'], len(usuarios)))
+            ], batch_size=options['lote'])
+            creados += cantidad
+        self.stdout.write(f'{creados} proyectos x {options["colaboradores"]} colaboradores creados '
+                          f'en {time.perf_counter() - inicio:.1f} s')
+        return Usuario.objects.get(pk=usuarios[0])
+
+    def _medir(self, usuario, repeticiones):
+        variantes = {
+            'in (visible_to)': Proyecto.objects.visible_to(usuario),
+            'exists correlacionado': Proyecto.objects.filter(Q(creado_por=usuario) | Exists(
+                Proyecto.colaboradores.through.objects.filter(proyecto_id=OuterRef('pk'), usuario_id=usuario.pk))),
+            'join + distinct': Proyecto.objects.filter(
+                Q(creado_por=usuario) | Q(colaboradores=usuario)).distinct(),
+        }
+        for nombre, queryset in variantes.items():
+            consultas = {
+                'primera página (50)': lambda: list(queryset.all()[:50]),
+                'conteo': lambda: queryset.all().count(),
+            }
+            self.stdout.write(self.style.MIGRATE_HEADING(nombre))
+            for descripcion, consulta in consultas.items():
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    resultado = consulta()
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                total = resultado if isinstance(resultado, int) else len(resultado)
+                self.stdout.write(f'  {descripcion}: mediana {statistics.median(tiempos):.1f} ms, '
+                                  f'máx {max(tiempos):.1f} ms ({total} filas)')
+            self.stdout.write('  ' + queryset[:50].explain().replace('\n', '\n  '))
+        self.stdout.write(f'motor: {connection.vendor}')
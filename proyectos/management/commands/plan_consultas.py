@@ -0,0 +1,74 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from proyectos.models import Proyecto, Tarea, Comentario
+
+
+def rutas_de_acceso():
+    # Consultas representativas de las vistas (orden por defecto, filtros y paginación por cursor)
+    proyecto = Proyecto.objects.order_by('pk').values_list('pk', flat=True).first() or 1
+    tarea = Tarea.objects.order_by('pk').values_list('pk', flat=True).first() or 1
+    usuario = Tarea.objects.exclude(asignado_a=None).values_list('asignado_a', flat=True).first() or 1
+    return {
+        'tareas_orden_por_defecto': Tarea.objects.all()[:50],
+        'tareas_de_proyecto': Tarea.objects.filter(proyecto_id=proyecto),
+        'tareas_de_proyecto_por_estado': Tarea.objects.filter(proyecto_id=proyecto, estado='pendiente'),
+        'tareas_pendientes_de_usuario': Tarea.objects.filter(
+            asignado_a_id=usuario, estado='pendiente').order_by('fecha_vencimiento'),
+        'comentarios_de_tarea': Comentario.objects.filter(tarea_id=tarea),
+        'proyectos_por_estado': Proyecto.objects.filter(estado='en_progreso'),
+        'proyectos_cursor': Proyecto.objects.order_by('-fecha_creacion', '-id')[:50],
+        'tareas_cursor': Tarea.objects.order_by('-fecha_creacion', '-id')[:50],
+        'comentarios_cursor': Comentario.objects.order_by('-fecha_creacion', '-id')[:50],
+    }
+
+
+class Command(BaseCommand):
+    help = ('Muestra el plan (EXPLAIN) y el tiempo de las consultas principales en la base configurada. '
+            'Para comparar índices: ejecutar con --salida antes.json, aplicar "migrate proyectos", '
+            'ejecutar con --salida despues.json --comparar antes.json. '
+            'Con --settings=gestionProyecto.settings-server se mide MySQL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--salida', help='Guarda los resultados en este archivo JSON')
+        parser.add_argument('--comparar', help='Archivo JSON de una ejecución anterior')
+
+    def handle(self, *args, **options):
+        resultados = {}
+        for nombre, queryset in rutas_de_acceso().items():
+            tiempos = []
+            for _ in range(options['repeticiones']):
+                inicio = time.perf_counter()
+                list(queryset.all())  # .all() clona el queryset para no usar la caché de resultados
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = {
+                'plan': queryset.explain(),
+                'mediana_ms': round(statistics.median(tiempos), 3),
+            }
+
+        anterior = {}
+        if options['comparar']:
+            with open(options['comparar']) as archivo:
+                anterior = json.load(archivo)['consultas']
+
+        for nombre, datos in resultados.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{nombre}: {datos['mediana_ms']} ms"))
+            if nombre in anterior:
+                self.stdout.write(f"  antes ({anterior[nombre]['mediana_ms']} ms):")
+                self.stdout.write(_sangrar(anterior[nombre]['plan'], 4))
+                self.stdout.write('  despues:')
+            self.stdout.write(_sangrar(datos['plan'], 4))
+
+        if options['salida']:
+            with open(options['salida'], 'w') as archivo:
+                json.dump({'motor': connection.vendor, 'consultas': resultados}, archivo, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['salida']}"))
+
+
+def _sangrar(texto, espacios):
+    return '\n'.join(' ' * espacios + linea for linea in texto.splitlines())
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from proyectos.models import RegistroBorrado
+
+
+class Command(BaseCommand):
+    help = ('Elimina los registros de borrado más antiguos que SINCRONIZACION_RETENCION_DIAS. '
+            'Los clientes con un cursor anterior reciben 410 y deben sincronizar desde cero.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=getattr(settings, 'SINCRONIZACION_RETENCION_DIAS', 30))
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options['dias'])
+        borrados, _ = RegistroBorrado.objects.filter(fecha_borrado__lt=limite).delete()
+        self.stdout.write(self.style.SUCCESS(f'{borrados} registros de borrado eliminados'))
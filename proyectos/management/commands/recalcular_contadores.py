@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from proyectos.models import ContadorGlobal
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la fila de ContadorGlobal a partir de las tablas de Proyecto, Tarea y Comentario'
+
+    def handle(self, *args, **options):
+        datos = ContadorGlobal.recalcular()
+        self.stdout.write(self.style.SUCCESS(
+            f"Contadores actualizados: {datos['proyectos']} proyectos, "
+            f"{datos['tareas']} tareas, {datos['comentarios']} comentarios"))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:57
+
+from django.db import migrations, models
+
+
+def inicializar_contadores(apps, schema_editor):
+    ContadorGlobal = apps.get_model('proyectos', 'ContadorGlobal')
+    ContadorGlobal.objects.update_or_create(pk=1, defaults={
+        'proyectos': apps.get_model('proyectos', 'Proyecto').objects.count(),
+        'tareas': apps.get_model('proyectos', 'Tarea').objects.count(),
+        'comentarios': apps.get_model('proyectos', 'Comentario').objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0003_comentario'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorGlobal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('proyectos', models.BigIntegerField(default=0)),
+                ('tareas', models.BigIntegerField(default=0)),
+                ('comentarios', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Contador global',
+                'verbose_name_plural': 'Contadores globales',
+            },
+        ),
+        migrations.RunPython(inicializar_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0004_contadorglobal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(fields=['tarea', 'fecha_creacion'], name='comentario_tarea_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='comentario_creacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['nombre'], name='proyecto_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['estado'], name='proyecto_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='proyecto_creacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['proyecto', 'fecha_vencimiento', 'nombre'], name='tarea_proyecto_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['proyecto', 'estado'], name='tarea_proyecto_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['asignado_a', 'estado', 'fecha_vencimiento'], name='tarea_asignado_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='tarea_creacion_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:12
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0005_indices_acceso'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroBorrado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(choices=[('proyecto', 'Proyecto'), ('tarea', 'Tarea'), ('comentario', 'Comentario')], max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('fecha_borrado', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Registro de borrado',
+                'verbose_name_plural': 'Registros de borrado',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='comentario_actualizacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='proyecto_actualizacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='tarea_actualizacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registroborrado',
+            index=models.Index(fields=['fecha_borrado', 'id'], name='borrado_fecha_idx'),
+        ),
+    ]
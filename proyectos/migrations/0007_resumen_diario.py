@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0006_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenDiarioProyecto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pendientes', models.PositiveIntegerField(default=0)),
+                ('en_progreso', models.PositiveIntegerField(default=0)),
+                ('completadas', models.PositiveIntegerField(default=0)),
+                ('vencidas', models.PositiveIntegerField(default=0)),
+                ('proyecto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='proyectos.proyecto')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de proyecto',
+                'verbose_name_plural': 'Resúmenes diarios de proyectos',
+                'ordering': ['proyecto', 'fecha'],
+                'constraints': [models.UniqueConstraint(fields=('proyecto', 'fecha'), name='resumen_proyecto_fecha_uniq')],
+            },
+        ),
+    ]
@@ -1,5 +1,41 @@
+from asgiref.sync import sync_to_async
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from django.utils import timezone
+
+
+class VisibleQuerySet(models.QuerySet):
+    # Visibilidad por rol en un solo lugar: Proyecto.objects.visible_to(user), y lo mismo
+    # en Tarea y Comentario a través de su proyecto. El administrador ve todo; el resto,
+    # los proyectos que creó o en los que colabora. Se filtra con semi-joins (IN sobre
+    # subconsultas) que parten del usuario: sus proyectos creados (índice creado_por) y sus
+    # filas en la tabla intermedia (índice usuario_id). No hay JOIN que multiplique filas
+    # por colaborador ni DISTINCT que las vuelva a juntar, y el coste depende de los
+    # proyectos del usuario, no del total (ver el comando medir_visibilidad).
+    campo_proyecto = 'pk'  # Campo con el id del proyecto
+
+    def visible_to(self, user):
+        if not user.is_authenticated:
+            return self.none()
+        if user.rol == 'administrador':
+            return self
+        ids = getattr(user, 'proyectos_ids', None)
+        if ids is not None:  # UsuarioToken: la pertenencia viene en el token
+            return self.filter(**{f'{self.campo_proyecto}__in': ids})
+        creados = Proyecto.objects.filter(creado_por=user.pk).values('pk')
+        colabora = Proyecto.colaboradores.through.objects.filter(usuario_id=user.pk).values('proyecto_id')
+        return self.filter(Q(**{f'{self.campo_proyecto}__in': creados}) |
+                           Q(**{f'{self.campo_proyecto}__in': colabora}))
+
+
+class TareaQuerySet(VisibleQuerySet):
+    campo_proyecto = 'proyecto_id'
+
+
+class ComentarioQuerySet(VisibleQuerySet):
+    campo_proyecto = 'tarea__proyecto_id'
+
 
 class Proyecto(models.Model):
     ESTADO_CHOICES = (
@@ -33,10 +69,18 @@ class Proyecto(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
 
+    objects = VisibleQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
         ordering = ['nombre'] # Ordena los proyectos por nombre por defecto
+        indexes = [
+            models.Index(fields=['nombre'], name='proyecto_nombre_idx'),  # Orden por defecto y JOIN de Tarea
+            models.Index(fields=['estado'], name='proyecto_estado_idx'),
+            models.Index(fields=['fecha_creacion', 'id'], name='proyecto_creacion_idx'),  # Paginación por cursor
+            models.Index(fields=['fecha_actualizacion', 'id'], name='proyecto_actualizacion_idx'),  # Sincronización
+        ]
 
     def __str__(self):
         return self.nombre
@@ -79,10 +123,21 @@ class Tarea(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
 
+    objects = TareaQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Tarea"
         verbose_name_plural = "Tareas"
         ordering = ['proyecto__nombre', 'fecha_vencimiento', 'nombre']
+        indexes = [
+            # Tareas de un proyecto en el orden por defecto (sin filesort dentro del proyecto)
+            models.Index(fields=['proyecto', 'fecha_vencimiento', 'nombre'], name='tarea_proyecto_orden_idx'),
+            models.Index(fields=['proyecto', 'estado'], name='tarea_proyecto_estado_idx'),
+            # "Mis tareas pendientes" ordenadas por vencimiento
+            models.Index(fields=['asignado_a', 'estado', 'fecha_vencimiento'], name='tarea_asignado_estado_idx'),
+            models.Index(fields=['fecha_creacion', 'id'], name='tarea_creacion_idx'),
+            models.Index(fields=['fecha_actualizacion', 'id'], name='tarea_actualizacion_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} ({self.proyecto.nombre})"
@@ -105,10 +160,119 @@ class Comentario(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
 
+    objects = ComentarioQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Comentario"
         verbose_name_plural = "Comentarios"
         ordering = ['fecha_creacion'] # Los comentarios se ordenan por fecha de creación
+        indexes = [
+            models.Index(fields=['tarea', 'fecha_creacion'], name='comentario_tarea_fecha_idx'),
+            models.Index(fields=['fecha_creacion', 'id'], name='comentario_creacion_idx'),
+            models.Index(fields=['fecha_actualizacion', 'id'], name='comentario_actualizacion_idx'),
+        ]
 
     def __str__(self):
         return f"Comentario de {self.autor.username if self.autor else 'Anónimo'} en {self.tarea.nombre}"
+
+
+class RegistroBorrado(models.Model):
+    # Lápida de un Proyecto, Tarea o Comentario borrado, para que la sincronización
+    # (api/sincronizacion.py) pueda avisar a los clientes. La escriben las señales de
+    # proyectos/signals.py y el comando purgar_borrados elimina las antiguas.
+    MODELO_CHOICES = (
+        ('proyecto', 'Proyecto'),
+        ('tarea', 'Tarea'),
+        ('comentario', 'Comentario'),
+    )
+
+    modelo = models.CharField(max_length=20, choices=MODELO_CHOICES)
+    objeto_id = models.BigIntegerField()
+    fecha_borrado = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Registro de borrado"
+        verbose_name_plural = "Registros de borrado"
+        indexes = [
+            models.Index(fields=['fecha_borrado', 'id'], name='borrado_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.objeto_id} borrado el {self.fecha_borrado}"
+
+
+class ResumenDiarioProyecto(models.Model):
+    # Foto diaria de las tareas de un proyecto para las gráficas de evolución (burndown).
+    # La escribe el comando instantanea_proyectos (proyectos/estadisticas.py); leer meses
+    # de historia son unas cientos de filas en lugar de recorrer las tareas.
+    proyecto = models.ForeignKey(
+        Proyecto,
+        on_delete=models.CASCADE,
+        related_name='resumenes'
+    )
+    fecha = models.DateField()
+    total = models.PositiveIntegerField(default=0)
+    pendientes = models.PositiveIntegerField(default=0)
+    en_progreso = models.PositiveIntegerField(default=0)
+    completadas = models.PositiveIntegerField(default=0)
+    vencidas = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Resumen diario de proyecto"
+        verbose_name_plural = "Resúmenes diarios de proyectos"
+        ordering = ['proyecto', 'fecha']
+        constraints = [
+            # Una fila por proyecto y día; también es el índice de la serie de un proyecto
+            models.UniqueConstraint(fields=['proyecto', 'fecha'], name='resumen_proyecto_fecha_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.proyecto_id} {self.fecha}: {self.completadas}/{self.total} completadas"
+
+
+class ContadorGlobal(models.Model):
+    # Fila única (pk=1) con los totales que muestra el dashboard.
+    # Se mantiene con señales en proyectos/signals.py; nunca editarla a mano.
+    proyectos = models.BigIntegerField(default=0)
+    tareas = models.BigIntegerField(default=0)
+    comentarios = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Contador global"
+        verbose_name_plural = "Contadores globales"
+
+    def __str__(self):
+        return f"Proyectos: {self.proyectos}, Tareas: {self.tareas}, Comentarios: {self.comentarios}"
+
+    @classmethod
+    def ajustar(cls, campo, delta):
+        # UPDATE ... SET campo = campo + delta es atómico en la base de datos,
+        # así que escrituras concurrentes no pierden incrementos.
+        if not cls.objects.filter(pk=1).update(**{campo: models.F(campo) + delta}):
+            cls.recalcular()
+
+    @classmethod
+    def leer(cls):
+        try:
+            return cls.objects.values('proyectos', 'tareas', 'comentarios').get(pk=1)
+        except cls.DoesNotExist:
+            return cls.recalcular()
+
+    @classmethod
+    async def aleer(cls):
+        # leer() para vistas async
+        try:
+            return await cls.objects.values('proyectos', 'tareas', 'comentarios').aget(pk=1)
+        except cls.DoesNotExist:
+            return await sync_to_async(cls.recalcular)()
+
+    @classmethod
+    def recalcular(cls):
+        # Reconstruye la fila a partir de las tablas reales (COUNT(*) completo).
+        datos = {
+            'proyectos': Proyecto.objects.count(),
+            'tareas': Tarea.objects.count(),
+            'comentarios': Comentario.objects.count(),
+        }
+        cls.objects.update_or_create(pk=1, defaults=datos)
+        return datos
@@ -0,0 +1,100 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver, Signal
+from django.utils import timezone
+
+from usuarios.models import Usuario
+from .cache_vistas import invalidar
+from .models import Proyecto, Tarea, Comentario, ContadorGlobal, RegistroBorrado
+
+
+# bulk_create / bulk_update / update() no envían post_save. Las operaciones masivas sobre
+# Tarea envían esta señal dentro de su transacción, como post_save, para que otros módulos
+# reaccionen (lo que no deba ocurrir si se deshace, con transaction.on_commit):
+#   accion: 'crear' | 'actualizar'
+#   tareas: lista de instancias (en 'crear' pueden no tener pk, p. ej. en MySQL)
+#   campos: campos modificados (solo en 'actualizar')
+#   usuario: quien hizo el cambio
+#   anteriores: en 'actualizar', {pk: {'asignado_a_id', 'estado'}} de cada tarea antes del cambio
+tareas_masivas = Signal()
+
+
+# Campo de ContadorGlobal que corresponde a cada modelo
+CAMPOS_CONTADOR = {
+    Proyecto: 'proyectos',
+    Tarea: 'tareas',
+    Comentario: 'comentarios',
+}
+
+
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=Tarea)
+@receiver(post_save, sender=Comentario)
+def incrementar_contador(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ContadorGlobal.ajustar(CAMPOS_CONTADOR[sender], 1)
+
+
+# Al estar conectadas estas señales, Django no usa el "fast delete" en los borrados
+# en cascada (Proyecto -> Tarea -> Comentario), así que cada fila borrada pasa por aquí.
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=Comentario)
+def decrementar_contador(sender, instance, **kwargs):
+    ContadorGlobal.ajustar(CAMPOS_CONTADOR[sender], -1)
+
+
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=Comentario)
+def registrar_borrado(sender, instance, **kwargs):
+    # Lápida para la sincronización incremental (api/sincronizacion.py)
+    RegistroBorrado.objects.create(modelo=sender._meta.model_name, objeto_id=instance.pk)
+
+
+# Nueva generación en la caché de vistas (proyectos/cache_vistas.py) ante cualquier cambio
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=Tarea)
+@receiver(post_save, sender=Comentario)
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=Comentario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_cache_vistas(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return  # Cada inicio de sesión guarda last_login, que ninguna vista muestra
+    invalidar(sender._meta.model_name, instance.pk)
+
+
+@receiver(m2m_changed, sender=Proyecto.colaboradores.through)
+def invalidar_cache_colaboradores(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # usuario.proyectos_colaborando.clear(): en post_clear ya no se sabe qué proyectos tenía
+        instance._proyectos_antes_de_clear = list(instance.proyectos_colaborando.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        proyectos = [instance.pk]
+    elif action == 'post_clear':
+        proyectos = getattr(instance, '_proyectos_antes_de_clear', [])
+    else:
+        proyectos = list(pk_set)
+    for pk in proyectos:
+        invalidar('proyecto', pk)
+    if proyectos:
+        # Cambia qué tareas y comentarios ve cada colaborador (visible_to)
+        invalidar('tarea')
+        invalidar('comentario')
+    # Los colaboradores forman parte del proyecto serializado: su ETag (api/condicional.py)
+    # se calcula con fecha_actualizacion, que auto_now no toca en cambios m2m
+    if proyectos:
+        Proyecto.objects.filter(pk__in=proyectos).update(fecha_actualizacion=timezone.now())
+
+
+@receiver(tareas_masivas, sender=Tarea)
+def invalidar_cache_tareas_masivas(sender, accion, tareas, **kwargs):
+    invalidar('tarea')
+    if accion == 'actualizar':  # Las tareas recién creadas no tienen entradas propias
+        for tarea in tareas:
+            invalidar('tarea', tarea.pk)
@@ -0,0 +1,87 @@
+from django.db.models import Q
+from django.http import JsonResponse
+
+from .exportar import respuesta_exportacion, TAMANO_BLOQUE
+
+
+class TablaServidorMixin:
+    # Protocolo de tabla del lado del servidor (compatible con DataTables "serverSide")
+    # para los POST de los Listado*. Parámetros del POST:
+    #   draw                 eco del cliente
+    #   start, length        desplazamiento y tamaño de página
+    #   search[value]        texto a buscar en columnas_busqueda
+    #   order[0][column]     índice de la columna en `columnas`
+    #   order[0][dir]        'asc' | 'desc'
+    # Responde {draw, recordsTotal, recordsFiltered, data}: una consulta acotada y un COUNT.
+    # Si el POST no trae 'draw' se devuelve el listado completo como antes.
+    # Con 'exportar' = json | ndjson | csv (en GET o POST) el listado completo se envía en flujo.
+
+    columnas = ()
+    columnas_busqueda = ()
+    max_filas = 1000
+    # Todo es lectura, también el POST de la tabla: puede ir a una réplica (basedatos/router.py),
+    # salvo si la vista lo guarda con cache_vista
+    metodos_replica = ('GET', 'HEAD', 'POST')
+
+    def get(self, request, *args, **kwargs):
+        if 'exportar' in request.GET:
+            return self.exportar(request.GET['exportar'])
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        if 'exportar' in request.POST:
+            return self.exportar(request.POST['exportar'])
+        queryset = self.get_queryset()
+        if 'draw' not in request.POST:
+            return JsonResponse(list(queryset.values(*self.columnas)), safe=False)
+        return JsonResponse(self.datos_tabla(request.POST, queryset))
+
+    def exportar(self, formato):
+        filas = self.get_queryset().values(*self.columnas).order_by('pk').iterator(chunk_size=TAMANO_BLOQUE)
+        return respuesta_exportacion(filas, formato, self.columnas, self.model._meta.model_name)
+
+    def datos_tabla(self, parametros, queryset):
+        total = queryset.count()
+
+        busqueda = parametros.get('search[value]', '').strip()
+        if busqueda:
+            filtro = Q()
+            for campo in self.columnas_busqueda:
+                filtro |= Q(**{f'{campo}__icontains': busqueda})
+            # isdecimal() y no isdigit(): '²' es dígito pero int() no lo acepta
+            pk = _entero(busqueda, None) if busqueda.isdecimal() else None
+            if pk is not None:
+                filtro |= Q(pk=pk)
+            queryset = queryset.filter(filtro)
+            filtrados = queryset.count()
+        else:
+            filtrados = total
+
+        # Solo se ordena por columnas declaradas en la vista; el id desempata
+        indice = max(_entero(parametros.get('order[0][column]'), 0, len(self.columnas) - 1), 0)
+        orden = self.columnas[indice]
+        if parametros.get('order[0][dir]') == 'desc':
+            orden = '-' + orden
+        queryset = queryset.order_by(orden, 'pk')
+
+        inicio = max(_entero(parametros.get('start'), 0), 0)
+        cantidad = _entero(parametros.get('length'), 10)
+        if cantidad <= 0 or cantidad > self.max_filas:  # DataTables envía -1 para "todos"
+            cantidad = self.max_filas
+
+        return {
+            'draw': _entero(parametros.get('draw'), 0),
+            'recordsTotal': total,
+            'recordsFiltered': filtrados,
+            'data': list(queryset.values(*self.columnas)[inicio:inicio + cantidad]),
+        }
+
+
+def _entero(valor, defecto, maximo=None):
+    try:
+        valor = int(valor)
+    except (TypeError, ValueError):
+        return defecto
+    if maximo is not None:
+        valor = min(valor, maximo)
+    return valor
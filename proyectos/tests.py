@@ -1,3 +1,216 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from usuarios.models import Usuario
+from . import cache_vistas, condicional, estadisticas
+from .models import Comentario, Proyecto, Tarea
+
+
+class BadgetsStreamTests(TestCase):
+
+    def test_por_wsgi_responde_204_para_volver_al_sondeo(self):
+        usuario = Usuario.objects.create_user('visor', password='clave')
+        self.client.force_login(usuario)
+        response = self.client.get('/badgets/stream/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+
+class TablaServidorTests(TestCase):
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        self.proyecto = Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.usuario)
+        self.client.force_login(self.usuario)
+
+    def buscar(self, texto):
+        return self.client.post('/proyectos/listado-proyecto/', {'draw': 1, 'search[value]': texto})
+
+    def test_busqueda_numerica_incluye_el_id(self):
+        response = self.buscar(str(self.proyecto.pk))
+        self.assertEqual([fila['id'] for fila in response.json()['data']], [self.proyecto.pk])
+
+    def test_busqueda_con_digitos_no_decimales(self):
+        for texto in ('²', '①', '9' * 5000):
+            with self.subTest(texto=texto[:10]):
+                response = self.buscar(texto)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['data'], [])
+
+
+class CacheVistasTests(TestCase):
+
+    def setUp(self):
+        caches[cache_vistas.ALIAS].clear()
+        self.llamadas = 0
+
+        @cache_vistas.cache_vista(['proyecto'])
+        def vista(request):
+            self.llamadas += 1
+            return HttpResponse(str(self.llamadas))
+
+        self.vista = vista
+        self.request = RequestFactory().get('/vista/')
+        self.request.user = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+
+    def pedir_dos_veces(self):
+        self.vista(self.request)
+        self.vista(self.request)
+        return self.llamadas
+
+    @override_settings(VISTAS_CACHE_UN_PROCESO=True)
+    def test_un_proceso_con_locmem_guarda(self):
+        self.assertEqual(self.pedir_dos_veces(), 1)
+        cache_vistas.invalidar('proyecto')
+        self.vista(self.request)
+        self.assertEqual(self.llamadas, 2)
+
+    @override_settings(VISTAS_CACHE_UN_PROCESO=False)
+    def test_varios_procesos_con_locmem_no_guarda(self):
+        self.assertEqual(self.pedir_dos_veces(), 2)
+
+    def test_con_backend_compartido_guarda(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(VISTAS_CACHE_UN_PROCESO=False, CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                cache_vistas.ALIAS: {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                     'LOCATION': directorio}}):
+            self.assertEqual(self.pedir_dos_veces(), 1)
+
+
+@override_settings(VISTAS_CACHE_UN_PROCESO=False)
+class HuellaTests(TestCase):
+    # Sin caché de vistas (locmem con varios workers) los ETag siguen coincidiendo
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        self.proyecto = Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.usuario)
+
+    def etag(self, dependencias=('usuario',)):
+        return condicional.huella(Proyecto.objects.filter(pk=self.proyecto.pk), dependencias=dependencias)[0]
+
+    def test_la_huella_se_repite_sin_escrituras(self):
+        self.assertEqual(self.etag(), self.etag())
+
+    def test_las_dependencias_cambian_la_huella(self):
+        antes = self.etag()
+        Usuario.objects.create_user('visor', password='clave')
+        self.assertNotEqual(self.etag(), antes)
+        antes = self.etag()
+        self.usuario.rol = 'administrador'
+        self.usuario.save()
+        self.assertNotEqual(self.etag(), antes)
+        antes = self.etag()
+        Usuario.objects.filter(username='visor').delete()
+        self.assertNotEqual(self.etag(), antes)
+
+    def test_una_sola_consulta_con_dependencias(self):
+        with self.assertNumQueries(1):
+            self.etag(('usuario', 'tarea'))
+
+    def test_la_api_responde_304(self):
+        self.client.force_login(self.usuario)
+        for url in (f'/api/proyectos/{self.proyecto.pk}/', '/api/proyectos/',
+                    f'/api/async/proyectos/{self.proyecto.pk}/'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+@override_settings(USE_TZ=False)
+class EstadisticasSinZonaHorariaTests(TestCase):
+    # settings-server.py usa USE_TZ = False
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        Proyecto.objects.create(nombre='Alfa', fecha_inicio=date(2025, 1, 1), creado_por=self.usuario)
+
+    def test_totales_e_instantanea(self):
+        self.assertEqual(estadisticas.totales()['total'], 0)
+        self.assertEqual(estadisticas.guardar_instantanea(), 1)
+
+    def test_api(self):
+        self.client.force_login(self.usuario)
+        self.assertEqual(self.client.get('/api/estadisticas/').status_code, 200)
+
+
+class DatosVisibilidad:
+    # Dos proyectos con una tarea y un comentario cada uno. El colaborador participa en el
+    # primero (lo creó el dueño); el segundo es de otro usuario.
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario.objects.create_user('admin', password='clave', rol='administrador')
+        cls.dueno = Usuario.objects.create_user('dueno', password='clave', rol='colaborador')
+        cls.colaborador = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        cls.ajeno = Usuario.objects.create_user('ajeno', password='clave', rol='colaborador')
+        cls.propio = Proyecto.objects.create(nombre='Propio', fecha_inicio=date(2025, 1, 1), creado_por=cls.dueno)
+        cls.propio.colaboradores.add(cls.colaborador)
+        cls.otro = Proyecto.objects.create(nombre='Otro', fecha_inicio=date(2025, 1, 1), creado_por=cls.ajeno)
+        cls.tarea_propia = Tarea.objects.create(proyecto=cls.propio, nombre='Tarea propia', creado_por=cls.dueno)
+        cls.tarea_otra = Tarea.objects.create(proyecto=cls.otro, nombre='Tarea otra', creado_por=cls.ajeno)
+        cls.comentario_propio = Comentario.objects.create(tarea=cls.tarea_propia, autor=cls.dueno, contenido='a')
+        cls.comentario_otro = Comentario.objects.create(tarea=cls.tarea_otra, autor=cls.ajeno, contenido='b')
+
+
+class VisibleToTests(DatosVisibilidad, TestCase):
+
+    def visibles(self, modelo, usuario):
+        return set(modelo.objects.visible_to(usuario).values_list('pk', flat=True))
+
+    def test_creador_y_colaborador_ven_el_proyecto(self):
+        for usuario in (self.dueno, self.colaborador):
+            with self.subTest(usuario=usuario):
+                self.assertEqual(self.visibles(Proyecto, usuario), {self.propio.pk})
+                self.assertEqual(self.visibles(Tarea, usuario), {self.tarea_propia.pk})
+                self.assertEqual(self.visibles(Comentario, usuario), {self.comentario_propio.pk})
+
+    def test_el_administrador_ve_todo(self):
+        self.assertEqual(self.visibles(Proyecto, self.admin), {self.propio.pk, self.otro.pk})
+        self.assertEqual(self.visibles(Comentario, self.admin), {self.comentario_propio.pk, self.comentario_otro.pk})
+
+    def test_anonimo_y_sin_proyectos_no_ven_nada(self):
+        visor = Usuario.objects.create_user('visor', password='clave')
+        for usuario in (AnonymousUser(), visor):
+            with self.subTest(usuario=usuario):
+                self.assertEqual(self.visibles(Proyecto, usuario), set())
+                self.assertEqual(self.visibles(Tarea, usuario), set())
+                self.assertEqual(self.visibles(Comentario, usuario), set())
+
+    def test_sin_filas_repetidas_con_varios_colaboradores(self):
+        self.otro.colaboradores.add(self.dueno, self.colaborador)
+        self.assertEqual(Tarea.objects.visible_to(self.colaborador).count(), 2)
+
+
+class VistasHtmlVisibilidadTests(DatosVisibilidad, TestCase):
+
+    def setUp(self):
+        self.client.force_login(self.colaborador)
+
+    def test_objetos_ajenos_responden_404(self):
+        for ruta in ('view-proyecto', 'edit-proyecto', 'delete-proyecto', 'view-asignacion-proyecto',
+                     'edit-asignacion-proyecto'):
+            with self.subTest(ruta=ruta):
+                self.assertEqual(self.client.get(reverse(ruta, args=[self.otro.pk])).status_code, 404)
+        for ruta in ('view-tarea', 'edit-tarea', 'delete-tarea'):
+            with self.subTest(ruta=ruta):
+                self.assertEqual(self.client.get(reverse(ruta, args=[self.tarea_otra.pk])).status_code, 404)
+        for ruta in ('view-comentario', 'edit-comentario', 'delete-comentario'):
+            with self.subTest(ruta=ruta):
+                self.assertEqual(self.client.get(reverse(ruta, args=[self.comentario_otro.pk])).status_code, 404)
+
+    def test_el_borrado_de_un_objeto_ajeno_no_borra(self):
+        self.assertEqual(self.client.post(reverse('delete-tarea', args=[self.tarea_otra.pk])).status_code, 404)
+        self.assertTrue(Tarea.objects.filter(pk=self.tarea_otra.pk).exists())
+
+    def test_los_listados_solo_traen_lo_visible(self):
+        for ruta, esperado in (('listado-proyecto', [self.propio.pk]), ('listado-tarea', [self.tarea_propia.pk]),
+                               ('listado-comentario', [self.comentario_propio.pk])):
+            with self.subTest(ruta=ruta):
+                datos = self.client.post(reverse(ruta), {'draw': 1}).json()['data']
+                self.assertEqual([fila['id'] for fila in datos], esperado)
@@ -27,6 +27,8 @@ urlpatterns = [
     path('delete-tarea/<int:pk>/', login_required(TareaDeleteView.as_view()), name='delete-tarea'),
     path('view-tarea/<int:pk>/', login_required(TareaView.as_view()), name='view-tarea'),
 
+    path('estadisticas/', views.tablero_estadisticas, name='estadisticas'),
+
     path('listado-comentario/', login_required(ListadoComentario.as_view()), name='listado-comentario'),
     path('crear-comentario/', login_required(ComentarioCreateView.as_view()), name='crear-comentario'),
     path('edit-comentario/<int:pk>/',  login_required(ComentarioUpdateView.as_view()), name='edit-comentario'),
@@ -1,44 +1,88 @@
-from django.http import HttpResponseRedirect, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.db import transaction
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
-from rest_framework import generics, permissions
-
-from api.serializer import ProyectoSerializer, TareaSerializer, ComentarioSerializer
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.asincrono import LecturaAsincronaView
+from api.condicional import CondicionalMixin
+from api.exportacion import ExportacionMixin
+from api.paginacion import PaginacionCursor
+from api.precarga import PrecargaMixin
+from api.sincronizacion import CursorInvalido, cursor_caducado, leer_cursor, sincronizar
+from api.serializer import ProyectoSerializer, TareaSerializer, ComentarioSerializer, TareaMasivaSerializer
 from usuarios.models import Usuario
-from .models import Proyecto, Tarea, Comentario
+from usuarios.permisos import is_administrador, is_colaborador_o_administrador, EsColaboradorOAdministrador
+from .cache_vistas import cache_vista, estadisticas as estadisticas_cache
+from . import estadisticas
+from .condicional import condicion_html
+from .eventos import flujo_badgets
+from .models import Proyecto, Tarea, Comentario, ContadorGlobal
+from .signals import tareas_masivas
+from .tablas import TablaServidorMixin
+from .visibilidad import VisiblesMixin
 from .forms import ProyectoForm, TareaForm, ComentarioForm, AsignacionProyectoForm, RolForm
 
 
 def badgets(request):
-    proyectos = Proyecto.objects.all().count()
-    tareas = Tarea.objects.all().count()
-    comentarios = Comentario.objects.all().count()
-    data = {'proyectos': proyectos, 'tareas': tareas, 'comentarios': comentarios}
-    return JsonResponse(data, safe=False)
+    # Lee la fila única de ContadorGlobal en lugar de hacer tres COUNT(*) completos
+    return _respuesta_badgets(request, ContadorGlobal.leer())
+
+
+async def badgets_async(request):
+    # badgets con el ORM asíncrono, para servir por ASGI sin ocupar un hilo
+    return _respuesta_badgets(request, await ContadorGlobal.aleer())
+
+
+def _respuesta_badgets(request, data):
+    # ETag para clientes que sondean: si nada cambió responden con 304 sin cuerpo
+    etag = '"{proyectos}-{tareas}-{comentarios}"'.format(**data)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(data, safe=False)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 
-# Funciones de ayuda para verificar roles (asumiendo que están en usuarios/views.py o un utils.py)
-# Si están en usuarios/views.py, deberías importarlas de ahí:
-# from usuarios.views import is_administrador, is_colaborador_o_administrador
+async def badgets_stream(request):
+    # Server-Sent Events: envía los contadores solo cuando cambian.
+    # Solo por ASGI (gestionProyecto/asgi.py): por WSGI Django consumiría el generador
+    # infinito antes de responder y el hilo quedaría ocupado para siempre. El 204 hace que
+    # el EventSource se cierre y home.html vuelva al sondeo condicional de badgets.
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(flujo_badgets(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Evita que nginx acumule el flujo
+    return response
 
-# Por simplicidad, las replicamos aquí si no quieres importarlas:
-def is_administrador(user):
-    return user.is_authenticated and user.rol == 'administrador'
 
-def is_colaborador_o_administrador(user):
-    return user.is_authenticated and (user.rol == 'colaborador' or user.rol == 'administrador')
+@login_required
+@user_passes_test(is_administrador)
+def cache_vistas(request):
+    # Aciertos / fallos de la caché de vistas en este proceso
+    return JsonResponse(estadisticas_cache())
+
+
+@login_required
+def tablero_estadisticas(request):
+    # Los datos llegan por /api/estadisticas/ (sesión); la plantilla solo dibuja las gráficas
+    return render(request, 'proyectos/estadisticas.html', {'title': 'Estadísticas'})
 
 @login_required
 def lista_proyectos(request):
-    proyectos = Proyecto.objects.all().order_by('-fecha_creacion')
-    # Opcional: Filtrar proyectos según el usuario logueado o su rol
-    # if request.user.rol == 'colaborador':
-    #     proyectos = proyectos.filter(Q(creado_por=request.user) | Q(colaboradores=request.user)).distinct()
-    # if request.user.rol == 'visor':
-    #     proyectos = proyectos.filter(...) # Define qué proyectos puede ver un visor
+    proyectos = Proyecto.objects.visible_to(request.user).order_by('-fecha_creacion')
     return render(request, 'proyectos/lista_proyectos.html', {'proyectos': proyectos})
 
 @login_required
@@ -60,17 +104,16 @@ def crear_proyecto(request):
     return render(request, 'proyectos/crear_editar_proyecto.html', {'form': form, 'titulo': 'Crear Proyecto'})
 
 @login_required
+@condicion_html(Proyecto, relaciones=('tareas', 'tareas__comentarios'), dependencias=['usuario'])
+@cache_vista(['proyecto', 'tarea', 'comentario', 'usuario'], objeto='proyecto', html=True)
 def detalle_proyecto(request, pk):
-    proyecto = get_object_or_404(Proyecto, pk=pk)
-    # Aquí puedes añadir lógica para permitir o denegar el acceso a la vista
-    # según el rol del usuario o si es colaborador del proyecto.
-    # Por ahora, cualquier usuario logueado puede ver los detalles.
+    proyecto = get_object_or_404(Proyecto.objects.visible_to(request.user), pk=pk)
     return render(request, 'proyectos/detalle_proyecto.html', {'proyecto': proyecto})
 
 @login_required
 @user_passes_test(is_colaborador_o_administrador)
 def editar_proyecto(request, pk):
-    proyecto = get_object_or_404(Proyecto, pk=pk)
+    proyecto = get_object_or_404(Proyecto.objects.visible_to(request.user), pk=pk)
 
     # Opcional: Solo el creador o un administrador pueden editar
     if not is_administrador(request.user) and proyecto.creado_por != request.user:
@@ -92,7 +135,7 @@ def editar_proyecto(request, pk):
 @login_required
 @user_passes_test(is_administrador) # Solo administradores pueden eliminar proyectos
 def eliminar_proyecto(request, pk):
-    proyecto = get_object_or_404(Proyecto, pk=pk)
+    proyecto = get_object_or_404(Proyecto.objects.visible_to(request.user), pk=pk)
     if request.method == 'POST':
         proyecto.delete()
         messages.success(request, 'Proyecto eliminado exitosamente.')
@@ -102,76 +145,329 @@ def eliminar_proyecto(request, pk):
 
 
 # Vista basada en CLASES para listar y crear proyectos, tareas, comentarios
-class ProyectoListCreateAPIView(generics.ListCreateAPIView):
+# PrecargaMixin arma select_related/prefetch_related a partir del serializador anidado
+# CondicionalMixin responde 304 (ETag / Last-Modified) si el recurso no cambió
+# VisiblesMixin limita el queryset a lo que el usuario puede ver (visible_to)
+class ProyectoListCreateAPIView(CondicionalMixin, ExportacionMixin, PrecargaMixin, VisiblesMixin, generics.ListCreateAPIView):
     queryset = Proyecto.objects.all()
     serializer_class = ProyectoSerializer
+    pagination_class = PaginacionCursor
     # Define permisos, ej: IsAuthenticated para todos, is_colaborador_o_administrador para crear
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        # Asigna el usuario que crea el proyecto
-        serializer.save(creado_por=self.request.user)
+        # Asigna el usuario que crea el proyecto (por id: con JWT_SIN_ESTADO el usuario es un UsuarioToken)
+        serializer.save(creado_por_id=self.request.user.pk)
 
 
 # Vista para detalle, actualización y eliminación de proyectos
-class ProyectoRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ProyectoRetrieveUpdateDestroyAPIView(CondicionalMixin, PrecargaMixin, VisiblesMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Proyecto.objects.all()
     serializer_class = ProyectoSerializer
     # Define permisos, ej: IsAdminUser o custom permission para creador/colaborador
     permission_classes = [permissions.IsAuthenticated]
 
 
-class TareaListCreateAPIView(generics.ListCreateAPIView):
+class TareaListCreateAPIView(CondicionalMixin, ExportacionMixin, PrecargaMixin, VisiblesMixin, generics.ListCreateAPIView):
     queryset = Tarea.objects.all()
     serializer_class = TareaSerializer
+    pagination_class = PaginacionCursor
     # Define permisos, ej: IsAuthenticated para todos, is_colaborador_o_administrador para crear
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
         # Asigna el usuario que crea el tarea
-        serializer.save(creado_por=self.request.user)
+        serializer.save(creado_por_id=self.request.user.pk)
 
 
-class TareaRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class TareaRetrieveUpdateDestroyAPIView(CondicionalMixin, PrecargaMixin, VisiblesMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Tarea.objects.all()
     serializer_class = TareaSerializer
     # Define permisos, ej: IsAdminUser o custom permission para creador/colaborador
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ComentarioListCreateAPIView(generics.ListCreateAPIView):
+class SincronizacionAPIView(APIView):
+    # GET ?cursor=<opaco>&limite=500 -> proyectos, tareas y comentarios creados o editados
+    # y los ids borrados desde el cursor (ver api/sincronizacion.py), más el cursor siguiente.
+    permission_classes = [permissions.IsAuthenticated]
+    limite_defecto = 500
+    limite_maximo = 2000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            posiciones = leer_cursor(request.query_params.get('cursor'))
+        except CursorInvalido as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if cursor_caducado(posiciones):
+            return Response({'detail': 'El cursor es demasiado antiguo; sincronice de nuevo sin cursor.'},
+                            status=status.HTTP_410_GONE)
+        try:
+            limite = int(request.query_params.get('limite', self.limite_defecto))
+        except ValueError:
+            limite = self.limite_defecto
+        limite = min(max(limite, 1), self.limite_maximo)
+        return Response(sincronizar(posiciones, limite, self.get_serializer_context()))
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'format': self.format_kwarg, 'view': self}
+
+
+class EstadisticasAPIView(APIView):
+    # GET -> conteos por estado y vencidas de cada proyecto visible, totales y carga por asignado.
+    # Consultas agrupadas de proyectos/estadisticas.py: el coste no crece con el número de proyectos.
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        proyectos = None
+        if not is_administrador(request.user):
+            proyectos = Proyecto.objects.visible_to(request.user).values('pk')
+        hoy = estadisticas.fecha_hoy()
+        return Response({
+            'fecha': hoy,
+            'totales': estadisticas.totales(proyectos, hoy),
+            'proyectos': estadisticas.resumen_proyectos(proyectos, hoy),
+            'carga': estadisticas.carga_por_asignado(proyectos, hoy),
+        })
+
+
+class EstadisticasProyectoAPIView(APIView):
+    # GET ?dias=30 -> conteos actuales de un proyecto, carga por asignado y la serie diaria
+    # (burndown) guardada por el comando instantanea_proyectos.
+    permission_classes = [permissions.IsAuthenticated]
+    dias_defecto = 30
+    dias_maximo = 366
+
+    def get(self, request, pk, *args, **kwargs):
+        hoy = estadisticas.fecha_hoy()
+        visible = Proyecto.objects.visible_to(request.user).filter(pk=pk).values('pk')
+        resumen = estadisticas.resumen_proyectos(visible, hoy)
+        if not resumen:
+            raise NotFound()
+        try:
+            dias = int(request.query_params.get('dias', self.dias_defecto))
+        except ValueError:
+            dias = self.dias_defecto
+        dias = min(max(dias, 1), self.dias_maximo)
+        return Response({
+            'fecha': hoy,
+            'proyecto': resumen[0],
+            'carga': estadisticas.carga_por_asignado([pk], hoy),
+            'evolucion': estadisticas.burndown(pk, dias, hoy),
+        })
+
+
+class TareaMasivaAPIView(APIView):
+    # Operaciones en bloque sobre tareas, todo o nada dentro de una transacción:
+    #   POST   [{proyecto, nombre, ...}, ...]                      -> bulk_create
+    #   PATCH  {"ids": [...], "estado": ..., "asignado_a": ...}     -> un solo UPDATE
+    #   PATCH  [{id, estado, ...}, ...]                             -> bulk_update
+    #   DELETE {"ids": [...]}
+    # Si algún elemento es inválido no se escribe nada y se responde 400 con
+    # {"errores": [{"indice": i, "errores": {...}}]}.
+    permission_classes = [permissions.IsAuthenticated, EsColaboradorOAdministrador]
+    max_elementos = 5000
+    tamano_lote = 500
+    campo_ids = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1))
+
+    def post(self, request, *args, **kwargs):
+        datos, errores = self._validar(request.data, parcial=False)
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        ahora = timezone.now()
+        tareas = [Tarea(creado_por_id=request.user.pk, fecha_creacion=ahora, fecha_actualizacion=ahora,
+                        **{campo: valor for campo, valor in item.items() if campo != 'id'})
+                  for item in datos]
+        with transaction.atomic():
+            tareas = Tarea.objects.bulk_create(tareas, batch_size=self.tamano_lote)
+            # bulk_create no envía post_save: el contador del dashboard se ajusta aquí
+            ContadorGlobal.ajustar('tareas', len(tareas))
+            self._notificar('crear', tareas, None)
+        return Response({'creadas': len(tareas), 'ids': [tarea.pk for tarea in tareas if tarea.pk]},
+                        status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        if isinstance(request.data, dict):
+            return self._actualizar_por_ids(request)
+
+        datos, errores = self._validar(request.data, parcial=True)
+        if not errores:
+            faltan = [i for i, item in enumerate(datos) if 'id' not in item]
+            errores = [{'indice': i, 'errores': {'id': ['Este campo es requerido.']}} for i in faltan]
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            visibles = Tarea.objects.visible_to(request.user).select_for_update(of=('self',))
+            tareas = visibles.in_bulk([item['id'] for item in datos])
+            errores = [{'indice': i, 'errores': {'id': ['No existe.']}}
+                       for i, item in enumerate(datos) if item['id'] not in tareas]
+            if errores:
+                return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+            anteriores = _anteriores(tareas.values())
+            campos, ahora = {'fecha_actualizacion'}, timezone.now()
+            for item in datos:
+                tarea = tareas[item['id']]
+                for campo, valor in item.items():
+                    if campo != 'id':
+                        setattr(tarea, campo, valor)
+                        campos.add(campo)
+                tarea.fecha_actualizacion = ahora  # bulk_update no aplica auto_now
+            Tarea.objects.bulk_update(tareas.values(), sorted(campos), batch_size=self.tamano_lote)
+            self._notificar('actualizar', list(tareas.values()), campos, anteriores)
+        return Response({'actualizadas': len(tareas)})
+
+    def _actualizar_por_ids(self, request):
+        ids = self._leer_ids(request.data)
+        serializer = TareaMasivaSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        cambios = {campo: valor for campo, valor in serializer.validated_data.items()
+                   if campo in ('estado', 'asignado_a_id', 'fecha_vencimiento')}
+        if not cambios:
+            return Response({'cambios': ['Indique estado, asignado_a o fecha_vencimiento.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        errores = self._referencias_invalidas([(None, cambios)])
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Las filas se bloquean y se leen una vez: la misma lista va a la señal
+            visibles = Tarea.objects.visible_to(request.user).select_for_update(of=('self',))
+            tareas = visibles.in_bulk(ids)
+            errores = [{'indice': i, 'errores': {'id': ['No existe.']}}
+                       for i, pk in enumerate(ids) if pk not in tareas]
+            if errores:
+                return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+            anteriores = _anteriores(tareas.values())
+            cambios['fecha_actualizacion'] = timezone.now()
+            actualizadas = Tarea.objects.filter(pk__in=tareas).update(**cambios)
+            for tarea in tareas.values():
+                for campo, valor in cambios.items():
+                    setattr(tarea, campo, valor)
+            self._notificar('actualizar', list(tareas.values()), set(cambios), anteriores)
+        return Response({'actualizadas': actualizadas})
+
+    def delete(self, request, *args, **kwargs):
+        ids = self._leer_ids(request.data)
+        with transaction.atomic():
+            # delete() en cascada envía post_delete por fila, así que los contadores se mantienen
+            eliminadas, _ = Tarea.objects.visible_to(request.user).filter(pk__in=ids).delete()
+        return Response({'eliminadas': eliminadas})
+
+    def _leer_ids(self, data):
+        # Lista no vacía de enteros, con el mismo límite de elementos que POST y PATCH; si no, 400
+        ids = data.get('ids') if isinstance(data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({'ids': ['Se requiere una lista de ids.']})
+        if len(ids) > self.max_elementos:
+            raise ValidationError({'ids': [f'Máximo {self.max_elementos} ids por petición.']})
+        try:
+            return self.campo_ids.run_validation(ids)
+        except ValidationError as error:
+            raise ValidationError({'ids': error.detail})
+
+    def _validar(self, data, parcial):
+        if not isinstance(data, list) or not data:
+            return None, [{'indice': None, 'errores': {'non_field_errors': ['Se esperaba una lista de tareas.']}}]
+        if len(data) > self.max_elementos:
+            return None, [{'indice': None, 'errores': {
+                'non_field_errors': [f'Máximo {self.max_elementos} tareas por petición.']}}]
+
+        datos, errores = [], []
+        for indice, item in enumerate(data):
+            serializer = TareaMasivaSerializer(data=item, partial=parcial)
+            if serializer.is_valid():
+                datos.append((indice, serializer.validated_data))
+            else:
+                errores.append({'indice': indice, 'errores': serializer.errors})
+        errores += self._referencias_invalidas(datos)
+        errores.sort(key=lambda error: error['indice'])
+        return [item for _, item in datos], errores
+
+    def _referencias_invalidas(self, datos):
+        # Una consulta por tabla para verificar todas las FK del lote; datos = [(indice, item)]
+        proyectos = {item['proyecto_id'] for _, item in datos if item.get('proyecto_id') is not None}
+        usuarios = {item['asignado_a_id'] for _, item in datos if item.get('asignado_a_id') is not None}
+        # Un proyecto que el usuario no ve se trata como inexistente
+        proyectos -= set(Proyecto.objects.visible_to(self.request.user).filter(pk__in=proyectos)
+                         .values_list('pk', flat=True))
+        usuarios -= set(Usuario.objects.filter(pk__in=usuarios).values_list('pk', flat=True))
+
+        errores = []
+        for indice, item in datos:
+            error = {}
+            if item.get('proyecto_id') in proyectos:
+                error['proyecto'] = ['No existe.']
+            if item.get('asignado_a_id') in usuarios:
+                error['asignado_a'] = ['No existe.']
+            if error:
+                errores.append({'indice': indice, 'errores': error})
+        return errores
+
+    def _notificar(self, accion, tareas, campos, anteriores=None):
+        # Dentro de la transacción: lo que escriban los receptores se confirma o se deshace con el lote
+        tareas_masivas.send(sender=Tarea, accion=accion, tareas=tareas, campos=campos, usuario=self.request.user,
+                            anteriores=anteriores)
+
+
+def _anteriores(tareas):
+    # Lo que las notificaciones comparan (como pre_save en notificaciones/signals.py), antes de tocar las filas
+    return {tarea.pk: {'asignado_a_id': tarea.asignado_a_id, 'estado': tarea.estado} for tarea in tareas}
+
+
+class ComentarioListCreateAPIView(CondicionalMixin, ExportacionMixin, PrecargaMixin, VisiblesMixin, generics.ListCreateAPIView):
     queryset = Comentario.objects.all()
     serializer_class = ComentarioSerializer
+    pagination_class = PaginacionCursor
     # Define permisos, ej: IsAuthenticated para todos, is_colaborador_o_administrador para crear
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        # Asigna el usuario que crea el tarea
-        serializer.save(creado_por=self.request.user)
+        # El autor del comentario es el usuario autenticado
+        serializer.save(autor_id=self.request.user.pk)
 
 
-class ComentarioRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ComentarioRetrieveUpdateDestroyAPIView(CondicionalMixin, PrecargaMixin, VisiblesMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Comentario.objects.all()
     serializer_class = ComentarioSerializer
     # Define permisos, ej: IsAdminUser o custom permission para creador/colaborador
     permission_classes = [permissions.IsAuthenticated]
 
 
+# Lectura async (api/asincrono.py) de proyectos, tareas y comentarios: lista sin pk y
+# detalle con pk, las mismas respuestas que las vistas de arriba. Para servir por ASGI.
+class ProyectoLecturaAsyncView(LecturaAsincronaView):
+    modelo = Proyecto
+    serializer_class = ProyectoSerializer
+
+
+class TareaLecturaAsyncView(LecturaAsincronaView):
+    modelo = Tarea
+    serializer_class = TareaSerializer
+
+
+class ComentarioLecturaAsyncView(LecturaAsincronaView):
+    modelo = Comentario
+    serializer_class = ComentarioSerializer
+
+
 #---------------------------------------------------
 # Django -  Modelo Vista Template Basado en CLASE
 #---------------------------------------------------
-class ListadoProyecto(ListView):
+@method_decorator(cache_vista(['proyecto']), name='post')
+class ListadoProyecto(TablaServidorMixin, ListView):
     model = Proyecto
     template_name = 'proyectos/listado.html'
+    columnas = ('id', 'nombre', 'estado')
+    columnas_busqueda = ('nombre', 'estado')
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        data = list(Proyecto.objects.all().values('id', 'nombre', 'estado'))
-        return JsonResponse(data, safe=False)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Proyecto'
@@ -181,7 +477,7 @@ class ListadoProyecto(ListView):
         return context
 
     def get_queryset(self):
-        return Proyecto.objects.all()
+        return Proyecto.objects.visible_to(self.request.user)
 
 
 class ProyectoCreateView(CreateView):
@@ -208,7 +504,7 @@ class ProyectoCreateView(CreateView):
         return context
 
 
-class ProyectoUpdateView(UpdateView):
+class ProyectoUpdateView(VisiblesMixin, UpdateView):
     model = Proyecto
     form_class = ProyectoForm
     template_name = 'proyectos/CreateView.html'
@@ -239,7 +535,7 @@ class ProyectoUpdateView(UpdateView):
         return context
 
 
-class ProyectoDeleteView(DeleteView):
+class ProyectoDeleteView(VisiblesMixin, DeleteView):
     model = Proyecto
     success_url = reverse_lazy('listado-proyecto')
 
@@ -258,7 +554,13 @@ class ProyectoDeleteView(DeleteView):
         return JsonResponse(data, safe=False)
 
 
-class ProyectoView(UpdateView):
+# Los selects del formulario listan todas las filas de los modelos relacionados
+@method_decorator([
+    condicion_html(Proyecto, dependencias=['usuario']),
+    cache_vista(['usuario'], objeto='proyecto', html=True),
+], name='get')
+class ProyectoView(VisiblesMixin, UpdateView):
+    metodos_replica = ('GET', 'HEAD')  # Consulta: el GET puede leer de una réplica (basedatos/router.py)
     model = Proyecto
     form_class = ProyectoForm
     template_name = 'proyectos/CreateView.html'
@@ -272,18 +574,17 @@ class ProyectoView(UpdateView):
         return context
 
 
-class ListadoAsignacionProyecto(ListView):
+@method_decorator(cache_vista(['proyecto']), name='post')
+class ListadoAsignacionProyecto(TablaServidorMixin, ListView):
     model = Proyecto
     template_name = 'proyectos/listado.html'
+    columnas = ('id', 'nombre', 'estado')
+    columnas_busqueda = ('nombre', 'estado')
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        data = list(Proyecto.objects.all().values('id', 'nombre', 'estado'))
-        return JsonResponse(data, safe=False)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Asignacion de Proyecto'
@@ -294,10 +595,10 @@ class ListadoAsignacionProyecto(ListView):
         return context
 
     def get_queryset(self):
-        return Proyecto.objects.all()
+        return Proyecto.objects.visible_to(self.request.user)
 
 
-class ProyectoAsignacionUpdateView(UpdateView):
+class ProyectoAsignacionUpdateView(VisiblesMixin, UpdateView):
     model = Proyecto
     form_class = AsignacionProyectoForm
     template_name = 'proyectos/CreateView.html'
@@ -328,7 +629,13 @@ class ProyectoAsignacionUpdateView(UpdateView):
         return context
 
 
-class ProyectoAsignacionView(UpdateView):
+# Los selects del formulario listan todas las filas de los modelos relacionados
+@method_decorator([
+    condicion_html(Proyecto, dependencias=['usuario']),
+    cache_vista(['usuario'], objeto='proyecto', html=True),
+], name='get')
+class ProyectoAsignacionView(VisiblesMixin, UpdateView):
+    metodos_replica = ('GET', 'HEAD')
     model = Proyecto
     form_class = AsignacionProyectoForm
     template_name = 'proyectos/CreateView.html'
@@ -342,18 +649,17 @@ class ProyectoAsignacionView(UpdateView):
         return context
 
 
-class ListadoRol(ListView):
+@method_decorator(cache_vista(['usuario']), name='post')
+class ListadoRol(TablaServidorMixin, ListView):
     model = Usuario
     template_name = 'proyectos/listado.html'
+    columnas = ('id', 'username', 'email')
+    columnas_busqueda = ('username', 'email')
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        data = list(Usuario.objects.all().values('id', 'username', 'email'))
-        return JsonResponse(data, safe=False)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Roles de Usuarios'
@@ -397,7 +703,10 @@ class RolUpdateView(UpdateView):
         return context
 
 
+# Los selects del formulario listan todas las filas de los modelos relacionados
+@method_decorator(cache_vista([], objeto='usuario', html=True), name='get')
 class RolView(UpdateView):
+    metodos_replica = ('GET', 'HEAD')
     model = Usuario
     form_class = RolForm
     template_name = 'proyectos/CreateView.html'
@@ -411,18 +720,17 @@ class RolView(UpdateView):
         return context
 
 
-class ListadoTarea(ListView):
+@method_decorator(cache_vista(['tarea', 'proyecto']), name='post')
+class ListadoTarea(TablaServidorMixin, ListView):
     model = Tarea
     template_name = 'proyectos/listado.html'
+    columnas = ('id', 'proyecto__nombre', 'estado')
+    columnas_busqueda = ('proyecto__nombre', 'estado')
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        data = list(Tarea.objects.all().values('id', 'proyecto__nombre', 'estado'))
-        return JsonResponse(data, safe=False)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Tarea'
@@ -432,21 +740,21 @@ class ListadoTarea(ListView):
         return context
 
     def get_queryset(self):
-        return Tarea.objects.all()
+        return Tarea.objects.visible_to(self.request.user)
 
 
-class TareaCreateView(CreateView):
+class TareaCreateView(VisiblesMixin, CreateView):
     model = Tarea
     form_class = TareaForm
     template_name = 'proyectos/CreateView.html'
     success_url = reverse_lazy('listado-tarea')
 
     def post(self, request, *args, **kwargs):
-        form = TareaForm(request.POST)
+        self.object = None
+        form = self.get_form()
         if form.is_valid():
             form.save()
             return HttpResponseRedirect(self.success_url)
-        self.object = None
         context = self.get_context_data(**kwargs)
         context['form'] = form
         return render(request, self.template_name, context)
@@ -459,7 +767,7 @@ class TareaCreateView(CreateView):
         return context
 
 
-class TareaUpdateView(UpdateView):
+class TareaUpdateView(VisiblesMixin, UpdateView):
     model = Tarea
     form_class = TareaForm
     template_name = 'proyectos/CreateView.html'
@@ -490,7 +798,7 @@ class TareaUpdateView(UpdateView):
         return context
 
 
-class TareaDeleteView(DeleteView):
+class TareaDeleteView(VisiblesMixin, DeleteView):
     model = Tarea
     success_url = reverse_lazy('listado-tarea')
 
@@ -509,7 +817,13 @@ class TareaDeleteView(DeleteView):
         return JsonResponse(data, safe=False)
 
 
-class TareaView(UpdateView):
+# Los selects del formulario listan todas las filas de los modelos relacionados
+@method_decorator([
+    condicion_html(Tarea, dependencias=['proyecto', 'usuario']),
+    cache_vista(['proyecto', 'usuario'], objeto='tarea', html=True),
+], name='get')
+class TareaView(VisiblesMixin, UpdateView):
+    metodos_replica = ('GET', 'HEAD')
     model = Tarea
     form_class = TareaForm
     template_name = 'proyectos/CreateView.html'
@@ -523,18 +837,17 @@ class TareaView(UpdateView):
         return context
 
 
-class ListadoComentario(ListView):
+@method_decorator(cache_vista(['comentario', 'tarea', 'usuario']), name='post')
+class ListadoComentario(TablaServidorMixin, ListView):
     model = Comentario
     template_name = 'proyectos/listado.html'
+    columnas = ('id', 'tarea__nombre', 'autor__username')
+    columnas_busqueda = ('tarea__nombre', 'autor__username')
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        data = list(Comentario.objects.all().values('id', 'tarea__nombre', 'autor__username'))
-        return JsonResponse(data, safe=False)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Comentario'
@@ -545,21 +858,21 @@ class ListadoComentario(ListView):
         return context
 
     def get_queryset(self):
-        return Comentario.objects.all()
+        return Comentario.objects.visible_to(self.request.user)
 
 
-class ComentarioCreateView(CreateView):
+class ComentarioCreateView(VisiblesMixin, CreateView):
     model = Comentario
     form_class = ComentarioForm
     template_name = 'proyectos/CreateView.html'
     success_url = reverse_lazy('listado-comentario')
 
     def post(self, request, *args, **kwargs):
-        form = ComentarioForm(request.POST)
+        self.object = None
+        form = self.get_form()
         if form.is_valid():
             form.save()
             return HttpResponseRedirect(self.success_url)
-        self.object = None
         context = self.get_context_data(**kwargs)
         context['form'] = form
         return render(request, self.template_name, context)
@@ -572,7 +885,7 @@ class ComentarioCreateView(CreateView):
         return context
 
 
-class ComentarioUpdateView(UpdateView):
+class ComentarioUpdateView(VisiblesMixin, UpdateView):
     model = Comentario
     form_class = ComentarioForm
     template_name = 'proyectos/CreateView.html'
@@ -603,7 +916,7 @@ class ComentarioUpdateView(UpdateView):
         return context
 
 
-class ComentarioDeleteView(DeleteView):
+class ComentarioDeleteView(VisiblesMixin, DeleteView):
     model = Comentario
     success_url = reverse_lazy('listado-comentario')
 
@@ -622,7 +935,13 @@ class ComentarioDeleteView(DeleteView):
         return JsonResponse(data, safe=False)
 
 
-class ComentarioView(UpdateView):
+# Los selects del formulario listan todas las filas de los modelos relacionados
+@method_decorator([
+    condicion_html(Comentario, dependencias=['tarea', 'usuario']),
+    cache_vista(['tarea', 'usuario'], objeto='comentario', html=True),
+], name='get')
+class ComentarioView(VisiblesMixin, UpdateView):
+    metodos_replica = ('GET', 'HEAD')
     model = Comentario
     form_class = ComentarioForm
     template_name = 'proyectos/CreateView.html'
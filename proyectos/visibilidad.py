@@ -0,0 +1,33 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Aplica VisibleQuerySet.visible_to (proyectos/models.py) en las vistas basadas en clase,
+# tanto las de Django como las genéricas de DRF:
+#   - get_queryset(): listados, detalle, edición, borrado, exportación y respuestas
+#     condicionales parten de aquí; un objeto ajeno no aparece y su URL responde 404.
+#   - get_form() / get_serializer(): los selects y las FK escribibles (proyecto de una
+#     tarea, tarea de un comentario) solo ofrecen y aceptan lo que el usuario ve.
+
+def limitar_relaciones(campos, usuario):
+    for campo in campos:
+        # ModelChoiceField lleva un QuerySet; los RelatedField de DRF, el manager
+        visible_to = getattr(getattr(campo, 'queryset', None), 'visible_to', None)
+        if visible_to is not None:
+            campo.queryset = visible_to(usuario)
+
+
+class VisiblesMixin:
+
+    def get_queryset(self):
+        return super().get_queryset().visible_to(self.request.user)
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        limitar_relaciones(form.fields.values(), self.request.user)
+        return form
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.request.method not in SAFE_METHODS and hasattr(serializer, 'fields'):
+            limitar_relaciones(serializer.fields.values(), self.request.user)
+        return serializer
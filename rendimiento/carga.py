@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Generador de carga HTTP/1.1 con asyncio, sin dependencias: `clientes` conexiones keep-alive
+# concurrentes que piden las rutas en rueda, cada una esperando su respuesta antes de la
+# siguiente (carga cerrada, como N usuarios). Sirve para comparar servidores (gunicorn/WSGI
+# frente a uvicorn/ASGI) sobre la misma máquina; el generador también gasta CPU, así que en
+# una máquina pequeña conviene leer los resultados en relación, no en absoluto.
+# Cuentan las respuestas que llegan dentro de la ventana medida (tras el calentamiento); al
+# cerrarla se cortan las peticiones en curso.
+
+
+class ErrorHTTP(Exception):
+    pass
+
+
+async def _leer_respuesta(lector):
+    cabecera = await lector.readuntil(b'\r\n\r\n')
+    lineas = cabecera.decode('latin-1').split('\r\n')
+    partes = lineas[0].split(' ', 2)
+    if len(partes) < 2 or not partes[0].startswith('HTTP/'):
+        raise ErrorHTTP(f'línea de estado inválida: {lineas[0]!r}')
+    cabeceras = {}
+    for linea in lineas[1:]:
+        nombre, _, valor = linea.partition(':')
+        if nombre:
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+    if cabeceras.get('transfer-encoding', '').lower() == 'chunked':
+        tamano = 0
+        while True:
+            trozo = int((await lector.readuntil(b'\r\n')).split(b';')[0], 16)
+            if trozo:
+                tamano += len(await lector.readexactly(trozo))
+            await lector.readexactly(2)
+            if not trozo:
+                break
+    else:
+        tamano = len(await lector.readexactly(int(cabeceras.get('content-length', 0))))
+    return int(partes[1]), tamano, cabeceras.get('connection', '').lower() == 'close'
+
+
+class Resultados:
+
+    def __init__(self):
+        self.latencias = []
+        self.estados = Counter()
+        self.errores = Counter()
+        self.bytes = 0
+        self.conexiones = 0
+
+
+async def _cliente(numero, host, puerto, peticiones, desde, hasta, resultados):
+    # Cada cliente empieza en una ruta distinta para repartir la mezcla desde el principio
+    rueda = itertools.islice(itertools.cycle(peticiones), numero % len(peticiones), None)
+    lector = escritor = None
+    while time.monotonic() < hasta:
+        inicio = time.monotonic()
+        try:
+            if escritor is None:
+                lector, escritor = await asyncio.open_connection(host, puerto, limit=2 ** 20)
+                resultados.conexiones += 1
+            escritor.write(next(rueda))
+            await escritor.drain()
+            estado, tamano, cerrar = await _leer_respuesta(lector)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ErrorHTTP, ValueError) as error:
+            if desde <= time.monotonic() <= hasta:
+                resultados.errores[type(error).__name__] += 1
+            if escritor is not None:
+                escritor.close()
+            lector = escritor = None
+            await asyncio.sleep(0.05)
+            continue
+        fin = time.monotonic()
+        if desde <= fin <= hasta:
+            resultados.latencias.append(fin - inicio)
+            resultados.estados[estado] += 1
+            resultados.bytes += tamano
+        if cerrar:
+            escritor.close()
+            lector = escritor = None
+    if escritor is not None:
+        escritor.close()
+
+
+def _peticion(host, ruta, cabeceras):
+    lineas = [f'GET {ruta} HTTP/1.1', f'Host: {host}', 'Connection: keep-alive', 'Accept: application/json']
+    lineas += [f'{nombre}: {valor}' for nombre, valor in cabeceras.items()]
+    return ('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1')
+
+
+async def _cargar(base, rutas, cabeceras, clientes, duracion, calentamiento):
+    partes = urlsplit(base)
+    if partes.scheme != 'http':
+        raise ValueError('Solo se admite http://')
+    host, puerto = partes.hostname, partes.port or 80
+    prefijo = partes.path.rstrip('/')
+    peticiones = [_peticion(partes.netloc, prefijo + ruta, cabeceras) for ruta in rutas]
+    resultados = Resultados()
+    desde = time.monotonic() + calentamiento
+    hasta = desde + duracion
+    tareas = [asyncio.create_task(_cliente(numero, host, puerto, peticiones, desde, hasta, resultados))
+              for numero in range(clientes)]
+    _, pendientes = await asyncio.wait(tareas, timeout=hasta - time.monotonic() + 1)
+    for tarea in pendientes:
+        tarea.cancel()
+    await asyncio.gather(*pendientes, return_exceptions=True)
+    return resultados
+
+
+def cargar(base, rutas, cabeceras=None, clientes=500, duracion=30, calentamiento=5):
+    """Lanza la carga y devuelve peticiones/s, percentiles de latencia (ms), estados y errores."""
+    resultados = asyncio.run(_cargar(base, rutas, cabeceras or {}, clientes, duracion, calentamiento))
+    latencias = sorted(segundos * 1000 for segundos in resultados.latencias)
+    resumen = {
+        'url': base,
+        'rutas': list(rutas),
+        'clientes': clientes,
+        'duracion_s': duracion,
+        'calentamiento_s': calentamiento,
+        'peticiones': len(latencias),
+        'peticiones_por_segundo': round(len(latencias) / duracion, 1),
+        'bytes_por_segundo': round(resultados.bytes / duracion),
+        'conexiones_abiertas': resultados.conexiones,
+        'estados': {str(estado): veces for estado, veces in sorted(resultados.estados.items())},
+        'errores': dict(resultados.errores),
+        'latencia_ms': None,
+    }
+    if len(latencias) >= 2:
+        cuantiles = statistics.quantiles(latencias, n=100, method='inclusive')
+        resumen['latencia_ms'] = {
+            'media': round(statistics.fmean(latencias), 2),
+            'p50': round(cuantiles[49], 2),
+            'p90': round(cuantiles[89], 2),
+            'p99': round(cuantiles[98], 2),
+            'max': round(latencias[-1], 2),
+        }
+    return resumen
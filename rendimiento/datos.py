@@ -0,0 +1,99 @@
+import random
+import time
+from datetime import timedelta
+
+from proyectos.estadisticas import fecha_hoy
+from proyectos.models import Proyecto, Tarea, Comentario, ContadorGlobal
+from usuarios.models import Usuario
+
+# Datos sintéticos para medir el rendimiento. Todo se inserta con bulk_create (sin señales,
+# sin auditoría ni índice de búsqueda) y al final se recalcula ContadorGlobal. Los dos
+# usuarios con los que se hacen las peticiones tienen contraseña real para el login JWT.
+
+CLAVE = 'rendimiento-clave'
+ESTADOS_PROYECTO = [estado for estado, _ in Proyecto.ESTADO_CHOICES]
+ESTADOS_TAREA = [estado for estado, _ in Tarea.ESTADO_CHOICES]
+
+
+def _ids(queryset, prefijo, campo='nombre'):
+    # bulk_create no devuelve las pk en todos los motores (MySQL): se releen por el prefijo
+    return list(queryset.filter(**{f'{campo}__startswith': prefijo}).order_by('pk').values_list('pk', flat=True))
+
+
+def generar(usuarios=200, proyectos=1000, tareas=20000, comentarios=50000, colaboradores=5, lote=2000, semilla=1):
+    """Crea usuarios, proyectos (con colaboradores), tareas y comentarios.
+
+    Las cantidades son totales; tareas y comentarios se reparten al azar (con `semilla`).
+    Devuelve un dict con los usuarios de prueba ('administrador', 'colaborador'), objetos
+    que el colaborador ve ('proyecto', 'tarea', 'comentario') y lo creado por modelo.
+    """
+    aleatorio = random.Random(semilla)
+    prefijo = f'rendimiento-{time.time_ns()}'
+    hoy = fecha_hoy()
+
+    administrador = Usuario.objects.create_user(
+        f'{prefijo}-admin', password=CLAVE, rol='administrador', is_staff=True)  # IsAdminUser: api/usuarios/
+    colaborador = Usuario.objects.create_user(f'{prefijo}-colaborador', password=CLAVE, rol='colaborador')
+    roles = ['colaborador'] * 7 + ['visor'] * 2 + ['administrador']
+    Usuario.objects.bulk_create([
+        Usuario(username=f'{prefijo}-{i:06d}', email=f'usuario{i}@ejemplo.com', rol=aleatorio.choice(roles),
+                password='!')  # Contraseña inutilizable, como set_unusable_password()
+        for i in range(max(usuarios - 2, 0))
+    ], batch_size=lote)
+    ids_usuarios = _ids(Usuario.objects, prefijo, 'username')
+
+    Proyecto.objects.bulk_create([
+        Proyecto(nombre=f'{prefijo}-{i:07d}', descripcion=f'Proyecto sintético {i}',
+                 fecha_inicio=hoy - timedelta(days=aleatorio.randint(0, 365)),
+                 estado=aleatorio.choice(ESTADOS_PROYECTO), creado_por_id=aleatorio.choice(ids_usuarios))
+        for i in range(proyectos)
+    ], batch_size=lote)
+    ids_proyectos = _ids(Proyecto.objects, prefijo)
+
+    # El colaborador de prueba participa en el primer proyecto y en los que le toquen al azar
+    intermedia = Proyecto.colaboradores.through
+    filas = []
+    for indice, proyecto_id in enumerate(ids_proyectos):
+        elegidos = set(aleatorio.sample(ids_usuarios, min(colaboradores, len(ids_usuarios))))
+        if indice == 0:
+            elegidos.add(colaborador.pk)
+        filas.extend(intermedia(proyecto_id=proyecto_id, usuario_id=usuario_id) for usuario_id in elegidos)
+    intermedia.objects.bulk_create(filas, batch_size=lote)
+
+    if ids_proyectos:
+        for inicio in range(0, tareas, lote):
+            Tarea.objects.bulk_create([
+                Tarea(proyecto_id=aleatorio.choice(ids_proyectos), nombre=f'{prefijo}-{i:08d}',
+                      descripcion=f'Tarea sintética {i}', estado=aleatorio.choice(ESTADOS_TAREA),
+                      fecha_vencimiento=hoy + timedelta(days=aleatorio.randint(-60, 60)),
+                      asignado_a_id=aleatorio.choice(ids_usuarios), creado_por_id=aleatorio.choice(ids_usuarios))
+                for i in range(inicio, min(inicio + lote, tareas))
+            ])
+    ids_tareas = _ids(Tarea.objects, prefijo)
+
+    if ids_tareas:
+        for inicio in range(0, comentarios, lote):
+            Comentario.objects.bulk_create([
+                Comentario(tarea_id=aleatorio.choice(ids_tareas), autor_id=aleatorio.choice(ids_usuarios),
+                           contenido=f'Comentario sintético {i} ' + 'lorem ipsum ' * aleatorio.randint(1, 20))
+                for i in range(inicio, min(inicio + lote, comentarios))
+            ])
+    ContadorGlobal.recalcular()
+
+    tarea = Tarea.objects.visible_to(colaborador).order_by('pk').first()
+    comentario = Comentario.objects.visible_to(colaborador).order_by('pk').first()
+    return {
+        'administrador': administrador,
+        'colaborador': colaborador,
+        'proyecto': ids_proyectos[0] if ids_proyectos else None,
+        'tarea': tarea.pk if tarea else None,
+        'comentario': comentario.pk if comentario else None,
+        'creados': {
+            'usuarios': len(ids_usuarios),
+            'proyectos': len(ids_proyectos),
+            'colaboraciones': len(filas),
+            'tareas': len(ids_tareas),
+            'comentarios': Comentario.objects.filter(tarea_id__in=Tarea.objects.filter(
+                nombre__startswith=prefijo).values('pk')).count(),
+        },
+    }
@@ -0,0 +1,61 @@
+from django.urls import reverse
+
+from .datos import CLAVE
+
+# Superficie de peticiones que se mide. Cada escenario es un dict con:
+#   nombre         clave en el JSON de resultados (estable: se compara contra la referencia)
+#   rol            'administrador' | 'colaborador' | None (anónimo): con qué usuario se pide
+#   autenticacion  'sesion' (vistas HTML y badgets) | 'jwt' (API) | None
+#   metodo, url, datos
+# Los Listado* y la API se miden con los dos roles: el administrador ve todo y el
+# colaborador pasa por visible_to().
+
+# Primera página de DataTables ordenada por la primera columna
+TABLA = {'draw': '1', 'start': '0', 'length': '10', 'search[value]': '',
+         'order[0][column]': '0', 'order[0][dir]': 'asc'}
+TABLA_BUSQUEDA = dict(TABLA, **{'search[value]': 'sintética 1', 'order[0][column]': '1'})
+
+LISTADOS = ('listado-proyecto', 'listado-tarea', 'listado-comentario', 'listado-asignacion-proyecto', 'listado-rol')
+API = (
+    ('proyectos', 'api_proyecto_list_create', 'api_proyecto_retrieve_update_destroy', 'proyecto'),
+    ('tareas', 'api_tarea_list_create', 'api_tarea_retrieve_update_destroy', 'tarea'),
+    ('comentarios', 'api_comentario_list_create', 'api_comentario_retrieve_update_destroy', 'comentario'),
+)
+
+
+def escenarios(contexto):
+    """Lista de escenarios para los datos de `contexto` (rendimiento.datos.generar más
+    'tokens': {rol: {'access', 'refresh'}})."""
+    lista = [{'nombre': 'badgets', 'rol': 'colaborador', 'autenticacion': 'sesion',
+              'metodo': 'get', 'url': reverse('badgets'), 'datos': None}]
+
+    for rol in ('administrador', 'colaborador'):
+        for nombre in LISTADOS:
+            lista.append({'nombre': f'{nombre} [{rol}]', 'rol': rol, 'autenticacion': 'sesion',
+                          'metodo': 'post', 'url': reverse(nombre), 'datos': TABLA})
+        lista.append({'nombre': f'listado-tarea búsqueda [{rol}]', 'rol': rol, 'autenticacion': 'sesion',
+                      'metodo': 'post', 'url': reverse('listado-tarea'), 'datos': TABLA_BUSQUEDA})
+
+        for recurso, listado, detalle, objeto in API:
+            lista.append({'nombre': f'api {recurso} lista [{rol}]', 'rol': rol, 'autenticacion': 'jwt',
+                          'metodo': 'get', 'url': reverse(listado), 'datos': None})
+            if contexto[objeto] is not None:
+                lista.append({'nombre': f'api {recurso} detalle [{rol}]', 'rol': rol, 'autenticacion': 'jwt',
+                              'metodo': 'get', 'url': reverse(detalle, args=[contexto[objeto]]), 'datos': None})
+
+    administrador = contexto['administrador']
+    lista += [
+        {'nombre': 'api usuarios lista [administrador]', 'rol': 'administrador', 'autenticacion': 'jwt',
+         'metodo': 'get', 'url': reverse('api_usuario_list_create'), 'datos': None},
+        {'nombre': 'api usuarios detalle [administrador]', 'rol': 'administrador', 'autenticacion': 'jwt',
+         'metodo': 'get', 'url': reverse('api_usuario_retrieve_update_destroy', args=[administrador.pk]),
+         'datos': None},
+        # El login JWT incluye el hash de la contraseña (PASSWORD_HASHERS): es caro a propósito
+        {'nombre': 'jwt token', 'rol': None, 'autenticacion': None, 'metodo': 'post',
+         'url': reverse('token_obtain_pair'), 'datos': {'username': administrador.username, 'password': CLAVE}},
+        {'nombre': 'jwt refresh', 'rol': None, 'autenticacion': None, 'metodo': 'post',
+         'url': reverse('token_refresh'), 'datos': {'refresh': contexto['tokens']['colaborador']['refresh']}},
+        {'nombre': 'jwt verify', 'rol': None, 'autenticacion': None, 'metodo': 'post',
+         'url': reverse('token_verify'), 'datos': {'token': contexto['tokens']['colaborador']['access']}},
+    ]
+    return lista
@@ -0,0 +1,60 @@
+import json
+import urllib.error
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rendimiento.carga import cargar
+
+
+class Command(BaseCommand):
+    help = ('Carga HTTP contra un servidor ya arrancado: N clientes keep-alive concurrentes piden las '
+            'rutas en rueda durante --duracion segundos. Informa peticiones/s, percentiles de latencia, '
+            'estados HTTP y errores, en JSON. Para comparar WSGI y ASGI en la misma máquina, p. ej. '
+            '/api/tareas/ en gunicorn frente a /api/async/tareas/ en uvicorn, con los mismos datos '
+            '(generar_datos_rendimiento) y el mismo número de workers.')
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Base del servidor, p. ej. http://127.0.0.1:8000')
+        parser.add_argument('rutas', nargs='+', help='Rutas a pedir en rueda, p. ej. /api/async/tareas/')
+        parser.add_argument('--clientes', type=int, default=500)
+        parser.add_argument('--duracion', type=float, default=30, help='Segundos medidos')
+        parser.add_argument('--calentamiento', type=float, default=5, help='Segundos previos que no cuentan')
+        parser.add_argument('--usuario', help='Obtiene un token JWT en /api/token/ y lo envía en cada petición')
+        parser.add_argument('--clave')
+        parser.add_argument('--token', help='Token JWT de acceso ya obtenido')
+        parser.add_argument('--salida', help='Archivo JSON donde guardar el resultado')
+
+    def handle(self, *args, **options):
+        if options['clientes'] < 1 or options['duracion'] <= 0:
+            raise CommandError('--clientes y --duracion deben ser positivos')
+        token = options['token']
+        if options['usuario']:
+            token = self._token(options['url'], options['usuario'], options['clave'] or '')
+        cabeceras = {'Authorization': f'Bearer {token}'} if token else {}
+
+        self.stdout.write(f'{options["clientes"]} clientes contra {options["url"]} '
+                          f'({options["calentamiento"]:g} s de calentamiento + {options["duracion"]:g} s)...')
+        try:
+            resultado = cargar(options['url'], options['rutas'], cabeceras, options['clientes'],
+                               options['duracion'], options['calentamiento'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(json.dumps(resultado, ensure_ascii=False, indent=2))
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+        if not resultado['peticiones']:
+            raise CommandError('Ninguna petición completada: ¿está arrancado el servidor?')
+
+    def _token(self, url, usuario, clave):
+        peticion = urllib.request.Request(
+            url.rstrip('/') + '/api/token/', data=json.dumps({'username': usuario, 'password': clave}).encode(),
+            headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(peticion, timeout=30) as respuesta:
+                return json.load(respuesta)['access']
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f'No se pudo obtener el token JWT: {error}')
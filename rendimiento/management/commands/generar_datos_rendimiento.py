@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from rendimiento import datos
+
+
+class Command(BaseCommand):
+    help = ('Inserta datos sintéticos (rendimiento/datos.py) en la base de datos configurada, para '
+            'probar un servidor real con carga_http. Añade, no borra; los nombres llevan el prefijo '
+            '"rendimiento-". Muestra los dos usuarios de prueba y su contraseña.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=200)
+        parser.add_argument('--proyectos', type=int, default=1000)
+        parser.add_argument('--tareas', type=int, default=20000)
+        parser.add_argument('--comentarios', type=int, default=50000)
+        parser.add_argument('--colaboradores', type=int, default=5, help='Colaboradores por proyecto')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help='No pedir confirmación')
+
+    def handle(self, *args, **options):
+        nombre = connection.settings_dict['NAME']
+        if options['interactive']:
+            respuesta = input(f'Se añadirán datos sintéticos a la base "{nombre}". ¿Continuar? (si/no): ')
+            if respuesta.strip().lower() not in ('si', 'sí', 's'):
+                raise CommandError('Cancelado')
+
+        contexto = datos.generar(usuarios=options['usuarios'], proyectos=options['proyectos'],
+                                 tareas=options['tareas'], comentarios=options['comentarios'],
+                                 colaboradores=options['colaboradores'])
+        self.stdout.write(', '.join(f'{cantidad} {modelo}' for modelo, cantidad in contexto['creados'].items()))
+        for rol in ('administrador', 'colaborador'):
+            self.stdout.write(f'{rol}: {contexto[rol].username} (contraseña {datos.CLAVE})')
+        self.stdout.write(self.style.SUCCESS(f'Proyecto visible para el colaborador: {contexto["proyecto"]}'))
@@ -0,0 +1,124 @@
+import json
+import platform
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from rendimiento import datos, medicion
+from rendimiento.escenarios import escenarios
+
+
+class Command(BaseCommand):
+    help = ('Mide badgets, los Listado*, la API (lista y detalle) y los endpoints JWT sobre una base de '
+            'prueba con datos sintéticos: consultas SQL, percentiles de latencia y pico de memoria. '
+            'Guarda el resultado en JSON (--salida) y lo compara con una referencia (--comparar); '
+            'si hay regresiones termina con error. La base de prueba se crea y se destruye '
+            '(test_<NAME> en MySQL, en memoria en SQLite); la base real no se toca.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=200)
+        parser.add_argument('--proyectos', type=int, default=1000)
+        parser.add_argument('--tareas', type=int, default=20000)
+        parser.add_argument('--comentarios', type=int, default=50000)
+        parser.add_argument('--colaboradores', type=int, default=5, help='Colaboradores por proyecto')
+        parser.add_argument('--repeticiones', type=int, default=20, help='Peticiones cronometradas por escenario')
+        parser.add_argument('--filtro', default='', help='Solo los escenarios cuyo nombre contenga este texto')
+        parser.add_argument('--con-cache', action='store_true',
+                            help='No vaciar la caché de vistas entre peticiones (mide los aciertos)')
+        parser.add_argument('--salida', help='Archivo JSON donde guardar los resultados')
+        parser.add_argument('--comparar',
+                            help='JSON de referencia (una --salida anterior, p. ej. rendimiento/referencia.json)')
+        parser.add_argument('--tolerancia', type=float, default=0.2,
+                            help='Aumento relativo admitido de latencia y memoria frente a la referencia (0.2 = 20%%)')
+        parser.add_argument('--margen-ms', type=float, default=2.0,
+                            help='Aumento absoluto de latencia (ms) por debajo del cual no se considera regresión')
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 2:
+            raise CommandError('--repeticiones debe ser al menos 2')
+        referencia = None
+        if options['comparar']:
+            try:
+                with open(options['comparar'], encoding='utf-8') as archivo:
+                    referencia = json.load(archivo)
+            except (OSError, ValueError) as error:
+                raise CommandError(f'No se pudo leer la referencia: {error}')
+
+        setup_test_environment()
+        configuracion = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            # La auditoría se escribe en línea: sin el hilo escritor compitiendo por la base de prueba.
+            # Todo ocurre en este proceso, así que la caché de vistas vale aunque sea locmem.
+            with override_settings(AUDITORIA_ASINCRONA=False, VISTAS_CACHE_UN_PROCESO=True):
+                resultado = self._medir(options)
+        finally:
+            teardown_databases(configuracion, verbosity=0)
+            teardown_test_environment()
+
+        self._mostrar(resultado)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Resultados guardados en {options["salida"]}')
+        if referencia is not None:
+            self._comparar(resultado, referencia, options)
+
+    def _medir(self, options):
+        self.stdout.write('Generando datos sintéticos...')
+        contexto = datos.generar(usuarios=options['usuarios'], proyectos=options['proyectos'],
+                                 tareas=options['tareas'], comentarios=options['comentarios'],
+                                 colaboradores=options['colaboradores'])
+        self.stdout.write(', '.join(f'{cantidad} {modelo}' for modelo, cantidad in contexto['creados'].items()))
+
+        contexto['tokens'] = {}
+        for rol in ('administrador', 'colaborador'):
+            respuesta = Client().post(reverse('token_obtain_pair'),
+                                      {'username': contexto[rol].username, 'password': datos.CLAVE})
+            if respuesta.status_code != 200:
+                raise CommandError(f'No se pudo obtener el token JWT de prueba ({respuesta.status_code})')
+            contexto['tokens'][rol] = respuesta.json()
+
+        clientes = medicion.clientes(contexto)
+        resultados = {}
+        for escenario in escenarios(contexto):
+            if options['filtro'] not in escenario['nombre']:
+                continue
+            cliente = clientes[(escenario['rol'], escenario['autenticacion'])]
+            resultados[escenario['nombre']] = medicion.medir(
+                escenario, cliente, options['repeticiones'], options['con_cache'])
+        return {
+            'fecha': timezone.now().isoformat(),
+            'entorno': {'python': platform.python_version(), 'plataforma': platform.platform(),
+                        'motor': connection.vendor},
+            'datos': contexto['creados'],
+            'repeticiones': options['repeticiones'],
+            'con_cache': options['con_cache'],
+            'escenarios': resultados,
+        }
+
+    def _mostrar(self, resultado):
+        self.stdout.write(f'{"escenario":<45} {"estado":>6} {"consultas":>9} {"p50 ms":>9} {"p95 ms":>9} '
+                          f'{"p99 ms":>9} {"memoria KB":>11}')
+        for nombre, medida in resultado['escenarios'].items():
+            self.stdout.write(f'{nombre:<45} {medida["estado"]:>6} {medida["consultas"]:>9} '
+                              f'{medida["p50_ms"]:>9.1f} {medida["p95_ms"]:>9.1f} {medida["p99_ms"]:>9.1f} '
+                              f'{medida["pico_memoria_kb"]:>11.0f}')
+
+    def _comparar(self, resultado, referencia, options):
+        if referencia.get('datos') != resultado['datos']:
+            self.stdout.write(self.style.WARNING(
+                f'La referencia se midió con otros datos ({referencia.get("datos")}): la comparación es orientativa'))
+        filas, regresiones = medicion.comparar(resultado, referencia, options['tolerancia'], options['margen_ms'])
+        self.stdout.write(self.style.MIGRATE_HEADING('Frente a la referencia (p95 ms / consultas)'))
+        for nombre, base, medido in filas:
+            self.stdout.write(f'{nombre:<45} {base["p95_ms"]:>9.1f} -> {medido["p95_ms"]:>9.1f}   '
+                              f'{base["consultas"]:>4} -> {medido["consultas"]:<4}')
+        if regresiones:
+            raise CommandError('Regresiones frente a la referencia:\n  ' + '\n  '.join(regresiones))
+        self.stdout.write(self.style.SUCCESS(f'Sin regresiones ({len(filas)} escenarios comparados)'))
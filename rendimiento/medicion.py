@@ -0,0 +1,116 @@
+import statistics
+import time
+import tracemalloc
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+
+from proyectos.cache_vistas import ALIAS
+
+# Cada escenario (rendimiento/escenarios.py) se pide en el mismo proceso con el cliente de
+# pruebas de Django, que recorre middleware, URLs, vistas y plantillas sin red de por medio:
+#   1. una petición de calentamiento que además cuenta las consultas SQL y los bytes
+#   2. una con tracemalloc para el pico de memoria (tracemalloc frena, por eso va aparte)
+#   3. `repeticiones` peticiones cronometradas para los percentiles
+# Salvo con_cache, la caché de vistas se vacía antes de cada petición: se mide la vista.
+
+
+def _percentil(cuantiles, p):
+    return round(cuantiles[p - 1], 3)
+
+
+def clientes(contexto):
+    """Un Client por (rol, autenticación): sesión con force_login o cabecera Bearer."""
+    resultado = {(None, None): Client()}
+    for rol in ('administrador', 'colaborador'):
+        sesion = Client()
+        sesion.force_login(contexto[rol])
+        resultado[(rol, 'sesion')] = sesion
+        resultado[(rol, 'jwt')] = Client(HTTP_AUTHORIZATION=f'Bearer {contexto["tokens"][rol]["access"]}')
+    return resultado
+
+
+class ContadorConsultas:
+    # execute_wrapper en lugar de CaptureQueriesContext: el cliente de pruebas emite
+    # request_started, que vacía connection.queries (reset_queries) a mitad de la captura
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+def _pedir(cliente, escenario, con_cache):
+    if not con_cache:
+        caches[ALIAS].clear()
+    respuesta = getattr(cliente, escenario['metodo'])(escenario['url'], escenario['datos'])
+    contenido = b''.join(respuesta.streaming_content) if respuesta.streaming else respuesta.content
+    return respuesta.status_code, len(contenido)
+
+
+def medir(escenario, cliente, repeticiones=20, con_cache=False):
+    """Consultas, bytes, pico de memoria y percentiles de latencia (ms) de un escenario."""
+    consultas = ContadorConsultas()
+    with connection.execute_wrapper(consultas):
+        estado, tamano = _pedir(cliente, escenario, con_cache)
+
+    iniciado = tracemalloc.is_tracing()
+    if not iniciado:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    _pedir(cliente, escenario, con_cache)
+    pico = tracemalloc.get_traced_memory()[1] - base
+    if not iniciado:
+        tracemalloc.stop()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        _pedir(cliente, escenario, con_cache)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    cuantiles = statistics.quantiles(tiempos, n=100, method='inclusive')
+    return {
+        'metodo': escenario['metodo'].upper(),
+        'url': escenario['url'],
+        'estado': estado,
+        'bytes': tamano,
+        'consultas': consultas.total,
+        'pico_memoria_kb': round(pico / 1024, 1),
+        'media_ms': round(statistics.fmean(tiempos), 3),
+        'p50_ms': _percentil(cuantiles, 50),
+        'p95_ms': _percentil(cuantiles, 95),
+        'p99_ms': _percentil(cuantiles, 99),
+        'max_ms': round(max(tiempos), 3),
+    }
+
+
+def comparar(actual, referencia, tolerancia=0.2, margen_ms=2.0):
+    """Regresiones de `actual` frente a `referencia` (ambos con la forma del JSON de resultados).
+
+    Es regresión: más consultas SQL; un estado HTTP distinto; la latencia o el pico de memoria
+    por encima de referencia * (1 + tolerancia). Para no marcar ruido, en la latencia tienen que
+    pasarse p50 y p95 (un pico aislado solo mueve el p95) y por más de `margen_ms`; en la
+    memoria, por más de 64 KB.
+    Devuelve (filas, regresiones): filas es [(nombre, referencia, actual)] para mostrar y
+    regresiones una lista de textos. Los escenarios que no están en los dos se ignoran.
+    """
+    filas, regresiones = [], []
+    for nombre, base in referencia['escenarios'].items():
+        medido = actual['escenarios'].get(nombre)
+        if medido is None:
+            continue
+        filas.append((nombre, base, medido))
+        if medido['estado'] != base['estado']:
+            regresiones.append(f'{nombre}: estado {base["estado"]} -> {medido["estado"]}')
+        if medido['consultas'] > base['consultas']:
+            regresiones.append(f'{nombre}: consultas {base["consultas"]} -> {medido["consultas"]}')
+        if all(medido[p] > base[p] * (1 + tolerancia) and medido[p] - base[p] > margen_ms
+               for p in ('p50_ms', 'p95_ms')):
+            regresiones.append(f'{nombre}: p95 {base["p95_ms"]:.1f} -> {medido["p95_ms"]:.1f} ms')
+        if medido['pico_memoria_kb'] > base['pico_memoria_kb'] * (1 + tolerancia) + 64:
+            regresiones.append(f'{nombre}: memoria {base["pico_memoria_kb"]:.0f} -> '
+                               f'{medido["pico_memoria_kb"]:.0f} KB')
+    return filas, regresiones
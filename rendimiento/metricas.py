@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+from django.conf import settings
+
+from basedatos.pool import estadisticas as estadisticas_pools
+
+# Registro en memoria (por proceso) de lo que mide rendimiento.middleware.MetricasMiddleware.
+# Por vista y método: peticiones, consultas SQL, tiempo en la base de datos, latencia total
+# (con histograma), bytes de respuesta y peticiones con SQL repetido. Además guarda las
+# últimas consultas lentas y las últimas repeticiones detectadas para poder verlas enteras.
+# Incluye el estado de los pools de conexiones del proceso (basedatos/pool.py), que no se
+# reinicia con el registro.
+# Con varios workers (gunicorn) cada uno tiene su registro y todos comparten host y puerto:
+# cada scrape lo contesta el worker que toque. Por eso todas las series llevan la etiqueta
+# pid, para que Prometheus no mezcle contadores de procesos distintos como si fueran uno
+# que sube y baja; se agregan con sum without (pid) (rate(...)).
+
+# Límites superiores (segundos) del histograma de latencia, como los de los clientes de Prometheus
+CUBETAS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIJO = 'gestion'
+
+
+class RegistroMetricas:
+
+    def __init__(self, maximo_muestras=50):
+        self._candado = threading.Lock()
+        self._vistas = {}
+        self.lentas = deque(maxlen=maximo_muestras)
+        self.repetidas = deque(maxlen=maximo_muestras)
+        self.desde = time.time()
+
+    def registrar(self, vista, metodo, consultas, tiempo_bd, latencia, tamano, repetidas, lentas):
+        """Suma una petición. `repetidas` y `lentas` son listas de (sql, veces | segundos)."""
+        with self._candado:
+            datos = self._vistas.get((vista, metodo))
+            if datos is None:
+                datos = self._vistas[(vista, metodo)] = {
+                    'peticiones': 0, 'consultas': 0, 'consultas_max': 0, 'bd_segundos': 0.0,
+                    'latencia_segundos': 0.0, 'latencia_max': 0.0, 'bytes': 0,
+                    'peticiones_con_repetidas': 0, 'consultas_lentas': 0,
+                    'cubetas': [0] * (len(CUBETAS) + 1),
+                }
+            datos['peticiones'] += 1
+            datos['consultas'] += consultas
+            datos['consultas_max'] = max(datos['consultas_max'], consultas)
+            datos['bd_segundos'] += tiempo_bd
+            datos['latencia_segundos'] += latencia
+            datos['latencia_max'] = max(datos['latencia_max'], latencia)
+            datos['bytes'] += tamano
+            datos['cubetas'][bisect_left(CUBETAS, latencia)] += 1
+            datos['consultas_lentas'] += len(lentas)
+            ahora = time.time()
+            if repetidas:
+                datos['peticiones_con_repetidas'] += 1
+                self.repetidas.extend({'fecha': ahora, 'vista': vista, 'metodo': metodo, 'sql': sql, 'veces': veces}
+                                      for sql, veces in repetidas)
+            self.lentas.extend({'fecha': ahora, 'vista': vista, 'metodo': metodo, 'sql': sql,
+                                'ms': round(segundos * 1000, 3)} for sql, segundos in lentas)
+
+    def reiniciar(self):
+        with self._candado:
+            self._vistas.clear()
+            self.lentas.clear()
+            self.repetidas.clear()
+            self.desde = time.time()
+
+    def resumen(self):
+        """Copia de todo el registro con medias calculadas, para la API JSON."""
+        with self._candado:
+            vistas = [dict(datos, vista=vista, metodo=metodo, cubetas=list(datos['cubetas']))
+                      for (vista, metodo), datos in self._vistas.items()]
+            lentas, repetidas = list(self.lentas), list(self.repetidas)
+        for datos in vistas:
+            peticiones = datos['peticiones']
+            datos['consultas_media'] = round(datos['consultas'] / peticiones, 2)
+            datos['bd_ms_media'] = round(datos['bd_segundos'] * 1000 / peticiones, 3)
+            datos['latencia_ms_media'] = round(datos['latencia_segundos'] * 1000 / peticiones, 3)
+            datos['bytes_media'] = round(datos['bytes'] / peticiones)
+        # Primero las vistas que más consultas hacen por petición: ahí suelen estar los N+1
+        vistas.sort(key=lambda datos: (-datos['consultas_media'], datos['vista'], datos['metodo']))
+        return {'pid': os.getpid(), 'desde': self.desde, 'cubetas': list(CUBETAS), 'vistas': vistas,
+                'consultas_lentas': lentas, 'sql_repetido': repetidas, 'pools': estadisticas_pools()}
+
+    def prometheus(self):
+        """Formato de texto de exposición de Prometheus (version=0.0.4)."""
+        resumen = self.resumen()
+        metricas = (
+            ('peticiones_total', 'counter', 'Peticiones atendidas', 'peticiones'),
+            ('consultas_sql_total', 'counter', 'Consultas SQL ejecutadas', 'consultas'),
+            ('bd_segundos_total', 'counter', 'Tiempo dentro de la base de datos', 'bd_segundos'),
+            ('respuesta_bytes_total', 'counter', 'Bytes de respuesta (sin contar flujos)', 'bytes'),
+            ('peticiones_con_sql_repetido_total', 'counter', 'Peticiones que repitieron una sentencia SQL',
+             'peticiones_con_repetidas'),
+            ('consultas_lentas_total', 'counter', 'Consultas por encima de METRICAS_CONSULTA_LENTA_MS',
+             'consultas_lentas'),
+            ('consultas_sql_max', 'gauge', 'Máximo de consultas SQL en una petición', 'consultas_max'),
+        )
+        lineas = []
+        for nombre, tipo, ayuda, campo in metricas:
+            lineas += [f'# HELP {PREFIJO}_{nombre} {ayuda}', f'# TYPE {PREFIJO}_{nombre} {tipo}']
+            lineas += [f'{PREFIJO}_{nombre}{{{_etiquetas(datos)}}} {datos[campo]}' for datos in resumen['vistas']]
+
+        nombre = f'{PREFIJO}_latencia_segundos'
+        lineas += [f'# HELP {nombre} Latencia total de la petición', f'# TYPE {nombre} histogram']
+        for datos in resumen['vistas']:
+            etiquetas, acumulado = _etiquetas(datos), 0
+            for limite, cantidad in zip(CUBETAS + ('+Inf',), datos['cubetas']):
+                acumulado += cantidad
+                lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            lineas.append(f'{nombre}_sum{{{etiquetas}}} {datos["latencia_segundos"]}')
+            lineas.append(f'{nombre}_count{{{etiquetas}}} {datos["peticiones"]}')
+
+        metricas_pool = (
+            ('pool_conexiones_abiertas', 'gauge', 'Conexiones abiertas (en uso + libres)', 'abiertas'),
+            ('pool_conexiones_en_uso', 'gauge', 'Conexiones prestadas', 'en_uso'),
+            ('pool_conexiones_max', 'gauge', 'Tamaño máximo del pool', 'tamano'),
+            ('pool_conexiones_creadas_total', 'counter', 'Conexiones abiertas contra la base de datos', 'creadas'),
+            ('pool_conexiones_reutilizadas_total', 'counter', 'Préstamos de una conexión ya abierta', 'reutilizadas'),
+            ('pool_esperas_total', 'counter', 'Préstamos que esperaron con el pool lleno', 'esperas'),
+            ('pool_agotado_total', 'counter', 'Préstamos que fallaron tras esperar', 'agotadas'),
+            ('pool_conexion_segundos_total', 'counter', 'Tiempo abriendo conexiones', 'conexion_segundos'),
+            ('pool_espera_segundos_total', 'counter', 'Tiempo esperando una conexión libre', 'espera_segundos'),
+        )
+        for nombre, tipo, ayuda, campo in metricas_pool:
+            lineas += [f'# HELP {PREFIJO}_{nombre} {ayuda}', f'# TYPE {PREFIJO}_{nombre} {tipo}']
+            lineas += [f'{PREFIJO}_{nombre}{{{_etiquetas_pool(pool)}}} {pool[campo]}'
+                       for pool in resumen['pools']]
+        nombre = f'{PREFIJO}_pool_conexiones_descartadas_total'
+        lineas += [f'# HELP {nombre} Conexiones cerradas por el pool, por motivo', f'# TYPE {nombre} counter']
+        lineas += [f'{nombre}{{{_etiquetas_pool(pool)},motivo="{motivo}"}} {veces}'
+                   for pool in resumen['pools'] for motivo, veces in sorted(pool['descartadas'].items())]
+        return '\n'.join(lineas) + '\n'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas(datos):
+    return f'vista="{_escapar(datos["vista"])}",metodo="{_escapar(datos["metodo"])}",pid="{os.getpid()}"'
+
+
+def _etiquetas_pool(pool):
+    return f'alias="{_escapar(pool["alias"])}",pid="{os.getpid()}"'
+
+
+registro = RegistroMetricas(maximo_muestras=getattr(settings, 'METRICAS_MUESTRAS', 50))
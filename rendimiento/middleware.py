@@ -0,0 +1,198 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from usuarios.permisos import is_administrador
+from .metricas import registro
+from .perfiles import CABECERA, Perfil, armados, limitador
+
+logger = logging.getLogger(__name__)
+
+
+def nombre_vista(request):
+    coincidencia = request.resolver_match
+    if coincidencia is None:
+        return '(sin ruta)'
+    return coincidencia.view_name or coincidencia._func_path
+
+
+class RecolectorConsultas:
+    # execute_wrapper de una petición: cuenta y cronometra cada consulta y agrupa por texto
+    # SQL (con %s en lugar de valores) para ver la misma sentencia repetida: un N+1
+    __slots__ = ('consultas', 'tiempo', 'sentencias', 'lentas', 'umbral_lenta')
+
+    def __init__(self, umbral_lenta):
+        self.consultas = 0
+        self.tiempo = 0.0
+        self.sentencias = {}
+        self.lentas = []
+        self.umbral_lenta = umbral_lenta
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.consultas += 1
+            self.tiempo += duracion
+            self.sentencias[sql] = self.sentencias.get(sql, 0) + 1
+            if duracion >= self.umbral_lenta:
+                self.lentas.append((sql, duracion))
+
+
+# Recolector de la petición en curso. Un execute_wrapper fijo en cada conexión lo busca aquí
+# en lugar de abrir uno por petición en connections.all(): las conexiones son locales al hilo
+# y bajo ASGI el ORM (también el asíncrono) consulta desde otro hilo, al que sync_to_async
+# copia el contexto, pero no las conexiones.
+_recolector_actual = ContextVar('recolector_consultas', default=None)
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    recolector = _recolector_actual.get()
+    if recolector is None:
+        return execute(sql, params, many, context)
+    return recolector(execute, sql, params, many, context)
+
+
+def _instalar(connection, **kwargs):
+    # El primero de la lista: execute_wrapper() saca el último al salir y no debe llevarse este
+    if _medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _medir_consulta)
+
+
+class MetricasMiddleware:
+    # Mide cada petición para rendimiento.metricas.registro: consultas SQL y tiempo en la
+    # base de datos (todas las conexiones), latencia total y tamaño de la respuesta, por vista.
+    # Señala en el log (logger 'rendimiento.middleware') las consultas más lentas que
+    # METRICAS_CONSULTA_LENTA_MS (WARNING) y las sentencias ejecutadas METRICAS_SQL_REPETIDO
+    # veces o más en una misma petición (INFO: un N+1 se repite en cada petición a la vista y
+    # ya se cuenta en el registro). Va primero en MIDDLEWARE para incluir sesión y autenticación.
+    # Con METRICAS_PETICIONES = False Django lo descarta al arrancar (MiddlewareNotUsed).
+    # En las respuestas en flujo la latencia llega hasta el primer byte y el tamaño no se cuenta.
+    # Síncrono y asíncrono: bajo ASGI no obliga a las vistas async a pasar por un hilo.
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICAS_PETICIONES', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.umbral_lenta = getattr(settings, 'METRICAS_CONSULTA_LENTA_MS', 200) / 1000
+        self.minimo_repetido = getattr(settings, 'METRICAS_SQL_REPETIDO', 3)
+        connection_created.connect(_instalar, dispatch_uid='rendimiento.metricas')
+        for conexion in connections.all(initialized_only=True):
+            _instalar(conexion)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recolector = RecolectorConsultas(self.umbral_lenta)
+        token = _recolector_actual.set(recolector)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recolector_actual.reset(token)
+        return self._registrar(request, response, recolector, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        recolector = RecolectorConsultas(self.umbral_lenta)
+        token = _recolector_actual.set(recolector)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recolector_actual.reset(token)
+        return self._registrar(request, response, recolector, time.perf_counter() - inicio)
+
+    def _registrar(self, request, response, recolector, latencia):
+        vista = nombre_vista(request)
+        repetidas = [(sql, veces) for sql, veces in recolector.sentencias.items() if veces >= self.minimo_repetido]
+        tamano = 0 if response.streaming else len(response.content)
+        registro.registrar(vista, request.method, recolector.consultas, recolector.tiempo, latencia,
+                           tamano, repetidas, recolector.lentas)
+
+        for sql, veces in repetidas:
+            logger.info('%s %s: la misma consulta %d veces (¿N+1?): %s', request.method, vista, veces, sql)
+        for sql, duracion in recolector.lentas:
+            logger.warning('%s %s: consulta lenta (%.0f ms): %s', request.method, vista, duracion * 1000, sql)
+        return response
+
+
+class PerfilMiddleware:
+    # Perfil bajo demanda de una petición (rendimiento/perfiles.py), desde process_view (ya se
+    # sabe la vista) hasta la respuesta, plantilla incluida. Se dispara con:
+    #   - la cabecera X-Perfilar de un administrador: el de la sesión, o el de un token JWT
+    #     válido (DRF lo autentica dentro de la vista, así que aquí se verifica aparte). Si no,
+    #     la cabecera se ignora: un anónimo o un token inventado no ocupan el turno de los perfiles
+    #   - una vista armada por un administrador en /api/perfiles/activar/
+    # Como mucho PERFILES_POR_MINUTO perfiles por proceso y uno a la vez; el resto de
+    # peticiones solo pagan la comprobación. El id del perfil guardado va en X-Perfil.
+    # Bajo ASGI no se usa: varias peticiones se intercalan en el mismo hilo y cProfile y el
+    # muestreo las mezclarían. Se declara asíncrono para no forzar el modo síncrono en la cadena.
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFILES_ACTIVOS', False) or iscoroutinefunction(get_response):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        perfil = getattr(request, '_perfil', None)
+        if perfil is None:
+            return response
+        try:
+            perfil.terminar()
+        finally:
+            limitador.soltar()
+        # Solo se empezó para un administrador (o una vista que armó uno): se guarda siempre
+        response['X-Perfil'] = perfil.guardar(request, nombre_vista(request), response)['id']
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        vista = nombre_vista(request)
+        if CABECERA in request.META and _puede_perfilar(request):
+            disparador = 'cabecera'
+        elif armados.pendiente(vista):
+            disparador = 'administrador'
+        else:
+            return None
+        if not limitador.tomar():
+            return None
+        if disparador == 'administrador':
+            armados.descontar(vista)
+        request._perfil = Perfil(PerfilMiddleware.__call__.__code__, disparador)
+        request._perfil.iniciar()
+        return None
+
+
+def _puede_perfilar(request):
+    # Antes de ocupar el turno: el usuario de la sesión o el del token JWT, ya verificado
+    if is_administrador(request.user):
+        return True
+    if 'HTTP_AUTHORIZATION' not in request.META:
+        return False
+    for clase in drf_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        if not issubclass(clase, JWTAuthentication):
+            continue
+        try:
+            resultado = clase().authenticate(request)
+        except APIException:
+            return False
+        if resultado is not None:
+            return is_administrador(resultado[0])
+    return False
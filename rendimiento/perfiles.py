@@ -0,0 +1,227 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Perfiles de peticiones bajo demanda (rendimiento.middleware.PerfilMiddleware).
+# Cada perfil combina:
+#   - cProfile: tiempos exactos por función, descargable como .pstats (snakeviz, pstats)
+#   - muestreo de la pila del hilo cada PERFILES_INTERVALO_MS: pilas colapsadas
+#     ("a;b;c 12" por línea) listas para flamegraph.pl o speedscope, y el reparto del
+#     tiempo entre las fases vista / serializador (DRF) / plantilla (Django)
+# Se guardan en PERFILES_DIR los últimos PERFILES_MAXIMO: <id>.json, <id>.pstats y <id>.colapsado.
+
+DIRECTORIO = getattr(settings, 'PERFILES_DIR', os.path.join(settings.BASE_DIR, 'perfiles'))
+MAXIMO = getattr(settings, 'PERFILES_MAXIMO', 20)
+POR_MINUTO = getattr(settings, 'PERFILES_POR_MINUTO', 6)
+INTERVALO = getattr(settings, 'PERFILES_INTERVALO_MS', 1) / 1000
+CABECERA = 'HTTP_X_PERFILAR'
+ID_VALIDO = re.compile(r'\d{8}-\d{6}-\d{9}')
+
+# Una muestra pertenece a la fase del marco más externo que coincida con su ruta
+FASES = (
+    ('plantilla', os.sep + os.path.join('django', 'template') + os.sep),
+    ('serializador', os.sep + os.path.join('rest_framework', 'serializers.py')),
+)
+
+
+class Limitador:
+    # Como mucho `maximo` perfiles por minuto en este proceso, y uno a la vez:
+    # cProfile frena la petición y desde Python 3.12 solo admite un perfilador activo
+    def __init__(self, maximo):
+        self.maximo = maximo
+        self.inicios = deque()
+        self.ocupado = threading.Lock()
+        self._candado = threading.Lock()
+
+    def tomar(self):
+        ahora = time.monotonic()
+        with self._candado:
+            while self.inicios and ahora - self.inicios[0] > 60:
+                self.inicios.popleft()
+            if len(self.inicios) >= self.maximo or not self.ocupado.acquire(blocking=False):
+                return False
+            self.inicios.append(ahora)
+            return True
+
+    def soltar(self):
+        self.ocupado.release()
+
+
+limitador = Limitador(POR_MINUTO)
+
+
+class Armados:
+    # Interruptor del administrador: perfilar las próximas N peticiones de una vista
+    # (POST /api/perfiles/activar/). Vive en la caché compartida para llegar a todos los
+    # workers; cada proceso la relee como mucho cada `intervalo` segundos para no
+    # consultarla en cada petición. El descuento no es atómico entre procesos: se pueden
+    # tomar unas pocas peticiones de más, nunca indefinidamente (caduca con `duracion`).
+    clave = 'perfiles:armados'
+
+    def __init__(self, intervalo=2, duracion=3600):
+        self.intervalo = intervalo
+        self.duracion = duracion
+        self.vistas = {}
+        self._leido = 0
+
+    def armar(self, vista, peticiones):
+        armados = cache.get(self.clave, {})
+        if peticiones > 0:
+            armados[vista] = peticiones
+        else:
+            armados.pop(vista, None)
+        cache.set(self.clave, armados, self.duracion)
+        self.vistas, self._leido = armados, time.monotonic()
+        return armados
+
+    def actuales(self):
+        return cache.get(self.clave, {})
+
+    def pendiente(self, vista):
+        ahora = time.monotonic()
+        if ahora - self._leido > self.intervalo:
+            self.vistas, self._leido = cache.get(self.clave, {}), ahora
+        return self.vistas.get(vista, 0) > 0
+
+    def descontar(self, vista):
+        armados = cache.get(self.clave, {})
+        if armados.get(vista, 0) > 1:
+            armados[vista] -= 1
+        else:
+            armados.pop(vista, None)
+        cache.set(self.clave, armados, self.duracion)
+        self.vistas = armados
+
+
+armados = Armados()
+
+
+class Muestreador(threading.Thread):
+    # Toma la pila del hilo `objetivo` cada `intervalo` segundos (en la práctica cada vez que
+    # obtiene el GIL: sys.getswitchinterval() es 5 ms por defecto). Corta la pila en `raiz`,
+    # el marco del middleware, para no repetir el servidor WSGI en cada línea.
+    def __init__(self, objetivo, raiz, intervalo):
+        super().__init__(name='perfil-muestreo', daemon=True)
+        self.objetivo = objetivo
+        self.raiz = raiz
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.fases = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            marco = sys._current_frames().get(self.objetivo)
+            pila, fase = [], 'vista'
+            while marco is not None:
+                codigo = marco.f_code
+                pila.append(f'{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})')
+                for nombre, ruta in FASES:
+                    if ruta in codigo.co_filename:
+                        fase = nombre
+                if codigo is self.raiz:
+                    break
+                marco = marco.f_back
+            if pila:
+                self.pilas[';'.join(reversed(pila))] += 1
+                self.fases[fase] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+
+class Perfil:
+    """Perfil de una petición: iniciar() antes de la vista y terminar() con la respuesta."""
+
+    def __init__(self, raiz, disparador):
+        self.disparador = disparador
+        self.perfilador = cProfile.Profile()
+        self.muestreador = Muestreador(threading.get_ident(), raiz, INTERVALO)
+
+    def iniciar(self):
+        self.inicio = time.perf_counter()
+        self.muestreador.start()
+        self.perfilador.enable()
+
+    def terminar(self):
+        self.perfilador.disable()
+        self.muestreador.parar()
+        self.duracion = time.perf_counter() - self.inicio
+
+    def guardar(self, request, vista, response):
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        ahora = time.time()
+        identificador = f'{time.strftime("%Y%m%d-%H%M%S", time.localtime(ahora))}-{time.time_ns() % 10**9:09d}'
+        base = os.path.join(DIRECTORIO, identificador)
+        self.perfilador.dump_stats(base + '.pstats')
+        with open(base + '.colapsado', 'w', encoding='utf-8') as archivo:
+            archivo.writelines(f'{pila} {veces}\n' for pila, veces in self.muestreador.pilas.most_common())
+
+        muestras = sum(self.muestreador.fases.values())
+        duracion_ms = self.duracion * 1000
+        metadatos = {
+            'id': identificador,
+            'fecha': ahora,
+            'vista': vista,
+            'metodo': request.method,
+            'ruta': request.get_full_path(),
+            'usuario': request.user.pk if request.user.is_authenticated else None,
+            'disparador': self.disparador,
+            'estado': response.status_code,
+            'duracion_ms': round(duracion_ms, 3),
+            'muestras': muestras,
+            # Reparto estimado por muestreo; con pocas muestras (peticiones muy rápidas) es orientativo
+            'fases_ms': {fase: round(duracion_ms * self.muestreador.fases[fase] / muestras, 3) if muestras else None
+                         for fase in ('vista', 'serializador', 'plantilla')},
+        }
+        with open(base + '.json', 'w', encoding='utf-8') as archivo:
+            json.dump(metadatos, archivo, ensure_ascii=False)
+        _podar()
+        return metadatos
+
+
+def _podar():
+    identificadores = sorted(nombre[:-5] for nombre in os.listdir(DIRECTORIO) if nombre.endswith('.json'))
+    for identificador in identificadores[:-MAXIMO] if MAXIMO else identificadores:
+        for extension in ('.json', '.pstats', '.colapsado'):
+            try:
+                os.remove(os.path.join(DIRECTORIO, identificador + extension))
+            except FileNotFoundError:
+                pass
+
+
+def listar():
+    if not os.path.isdir(DIRECTORIO):
+        return []
+    perfiles = []
+    for nombre in sorted(os.listdir(DIRECTORIO), reverse=True):
+        if nombre.endswith('.json'):
+            with open(os.path.join(DIRECTORIO, nombre), encoding='utf-8') as archivo:
+                perfiles.append(json.load(archivo))
+    return perfiles
+
+
+def ruta(identificador, extension):
+    """Ruta del archivo de un perfil, o None si el id no es válido o no existe."""
+    if not ID_VALIDO.fullmatch(identificador):
+        return None
+    camino = os.path.join(DIRECTORIO, identificador + extension)
+    return camino if os.path.exists(camino) else None
+
+
+def funciones(identificador, limite=30):
+    """Las `limite` funciones con más tiempo acumulado de un perfil (texto de pstats)."""
+    salida = io.StringIO()
+    pstats.Stats(ruta(identificador, '.pstats'), stream=salida).sort_stats('cumulative').print_stats(limite)
+    return salida.getvalue()
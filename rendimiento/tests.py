@@ -0,0 +1,95 @@
+import os
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from proyectos.models import Proyecto
+from usuarios.models import Usuario
+from .metricas import RegistroMetricas, registro
+from .middleware import MetricasMiddleware, PerfilMiddleware
+from .perfiles import limitador
+
+
+class PrometheusTests(SimpleTestCase):
+
+    def test_todas_las_series_llevan_el_pid(self):
+        metricas = RegistroMetricas()
+        metricas.registrar('listado-tarea', 'GET', 3, 0.01, 0.02, 100, [], [])
+        texto = metricas.prometheus()
+        series = [linea for linea in texto.splitlines() if linea and not linea.startswith('#')]
+        self.assertTrue(series)
+        for linea in series:
+            with self.subTest(linea=linea):
+                self.assertIn(f'pid="{os.getpid()}"', linea)
+        self.assertEqual(metricas.resumen()['pid'], os.getpid())
+
+
+@override_settings(METRICAS_PETICIONES=True, METRICAS_SQL_REPETIDO=2)
+class MetricasMiddlewareTests(TestCase):
+
+    def setUp(self):
+        registro.reiniciar()
+
+    def test_sql_repetido_va_al_log_como_info(self):
+        def vista(request):
+            for _ in range(2):
+                list(Proyecto.objects.all())
+            return HttpResponse('ok')
+
+        with self.assertLogs('rendimiento.middleware', level='INFO') as logs:
+            MetricasMiddleware(vista)(RequestFactory().get('/'))
+        self.assertEqual([entrada.levelname for entrada in logs.records], ['INFO'])
+        self.assertIn('¿N+1?', logs.records[0].getMessage())
+        [datos] = registro.resumen()['vistas']
+        self.assertEqual((datos['consultas'], datos['peticiones_con_repetidas']), (2, 1))
+
+
+@override_settings(PERFILES_ACTIVOS=True)
+class PerfilMiddlewareTests(TestCase):
+
+    def perfilar(self, usuario, **cabeceras):
+        # process_view corre dentro de get_response, como en el manejador de Django
+        def vista(request):
+            middleware.process_view(request, vista, (), {})
+            self.perfilada = hasattr(request, '_perfil')
+            return HttpResponse('ok')
+
+        middleware = PerfilMiddleware(vista)
+        request = RequestFactory().get('/', HTTP_X_PERFILAR='1', **cabeceras)
+        request.user = usuario
+        return middleware(request)
+
+    def test_la_cabecera_de_un_anonimo_se_ignora(self):
+        response = self.perfilar(AnonymousUser())
+        self.assertFalse(self.perfilada)
+        self.assertNotIn('X-Perfil', response)
+
+    def test_la_cabecera_de_un_no_administrador_se_ignora(self):
+        colaborador = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        self.perfilar(colaborador)
+        self.assertFalse(self.perfilada)
+
+    def test_un_bearer_inventado_no_ocupa_el_turno(self):
+        response = self.perfilar(AnonymousUser(), HTTP_AUTHORIZATION='Bearer a.b.c')
+        self.assertFalse(self.perfilada)
+        self.assertNotIn('X-Perfil', response)
+
+    def test_el_token_de_un_no_administrador_no_se_perfila(self):
+        colaborador = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+        token = AccessToken.for_user(colaborador)
+        self.perfilar(AnonymousUser(), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertFalse(self.perfilada)
+
+    def test_el_token_de_un_administrador_se_perfila(self):
+        administrador = Usuario.objects.create_user('admin', password='clave', rol='administrador')
+        token = AccessToken.for_user(administrador)
+        with mock.patch('rendimiento.middleware.Perfil.guardar', return_value={'id': 'prueba'}):
+            response = self.perfilar(AnonymousUser(), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertTrue(self.perfilada)
+        self.assertEqual(response['X-Perfil'], 'prueba')
+        # El turno se devolvió
+        self.assertTrue(limitador.ocupado.acquire(blocking=False))
+        limitador.ocupado.release()
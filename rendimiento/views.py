@@ -0,0 +1,84 @@
+from django.http import FileResponse, HttpResponse
+from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usuarios.permisos import EsAdministrador
+from . import perfiles
+from .metricas import registro
+
+
+class MetricasAPIView(APIView):
+    # GET    -> métricas por vista de este proceso (rendimiento/metricas.py), las vistas con
+    #           más consultas por petición primero, y las últimas consultas lentas y repetidas
+    # DELETE -> vuelve a cero el registro
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, *args, **kwargs):
+        return Response(registro.resumen())
+
+    def delete(self, request, *args, **kwargs):
+        registro.reiniciar()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MetricasPrometheusAPIView(APIView):
+    # Las mismas métricas en el formato de texto de Prometheus. El scraper se autentica
+    # como administrador con un token JWT (authorization en scrape_config).
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(registro.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class PerfilListAPIView(APIView):
+    # GET -> vistas armadas y los perfiles guardados (rendimiento/perfiles.py), el más reciente primero
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'armados': perfiles.armados.actuales(), 'perfiles': perfiles.listar()})
+
+
+class PerfilActivarAPIView(APIView):
+    # POST {"vista": "listado-tarea", "peticiones": 3} -> perfila las próximas 3 peticiones
+    # a esa vista (nombre de la URL), de cualquier usuario. "peticiones": 0 desarma.
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def post(self, request, *args, **kwargs):
+        vista = request.data.get('vista')
+        if not isinstance(vista, str) or not vista:
+            raise ValidationError({'vista': ['Indique el nombre de la vista (p. ej. listado-tarea).']})
+        try:
+            peticiones = int(request.data.get('peticiones', 1))
+        except (TypeError, ValueError):
+            raise ValidationError({'peticiones': ['Debe ser un número entero.']})
+        if not 0 <= peticiones <= perfiles.MAXIMO:
+            raise ValidationError({'peticiones': [f'Entre 0 y {perfiles.MAXIMO}.']})
+        return Response({'armados': perfiles.armados.armar(vista, peticiones)})
+
+
+class PerfilDetalleAPIView(APIView):
+    # GET -> datos del perfil y las funciones con más tiempo acumulado (pstats)
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, perfil, *args, **kwargs):
+        if perfiles.ruta(perfil, '.pstats') is None:
+            raise NotFound()
+        metadatos = next((datos for datos in perfiles.listar() if datos['id'] == perfil), {'id': perfil})
+        return Response(dict(metadatos, funciones=perfiles.funciones(perfil)))
+
+
+class PerfilDescargaAPIView(APIView):
+    # GET -> el perfil como archivo: .pstats (python -m pstats, snakeviz) o pilas colapsadas
+    # (flamegraph.pl, speedscope)
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+    formato = 'pstats'
+    extensiones = {'pstats': '.pstats', 'colapsado': '.colapsado'}
+
+    def get(self, request, perfil, *args, **kwargs):
+        extension = self.extensiones[self.formato]
+        camino = perfiles.ruta(perfil, extension)
+        if camino is None:
+            raise NotFound()
+        return FileResponse(open(camino, 'rb'), as_attachment=True, filename=f'{perfil}{extension}')
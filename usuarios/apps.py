@@ -1,7 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from gestionProyecto.caches import compartida
 
 
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'usuarios'
     verbose_name = "Gestión de Usuarios"
+
+    def ready(self):
+        # Invalidación de la caché de permisos
+        from . import signals  # noqa: F401
+
+        # En el modo sin estado las revocaciones se avisan por la caché default: si es de
+        # cada proceso, los demás workers seguirían aceptando los tokens revocados
+        if getattr(settings, 'JWT_SIN_ESTADO', False) and not compartida():
+            raise ImproperlyConfigured('JWT_SIN_ESTADO requiere una caché default compartida (CACHE_DEFAULT).')
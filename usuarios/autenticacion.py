@@ -0,0 +1,131 @@
+import math
+import time
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .permisos import is_administrador, obtener_usuario, proyectos_de
+
+
+class BackendCacheado(ModelBackend):
+    # Para las sesiones: AuthenticationMiddleware llama a get_user() en cada petición
+    def get_user(self, user_id):
+        usuario = obtener_usuario(user_id)
+        return usuario if self.user_can_authenticate(usuario) else None
+
+
+class JWTAutenticacionCacheada(JWTAuthentication):
+    # Igual que JWTAuthentication pero el Usuario sale de la caché de permisos
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        usuario = obtener_usuario(user_id)
+        if usuario is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not api_settings.USER_AUTHENTICATION_RULE(usuario):
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return usuario
+
+
+#---------------------------------------------------
+# Modo sin estado (opcional, settings.JWT_SIN_ESTADO)
+#---------------------------------------------------
+def agregar_claims(token, usuario):
+    # Datos firmados en el token para no consultar el usuario en cada petición
+    token['username'] = usuario.username
+    token['rol'] = usuario.rol
+    token['is_staff'] = usuario.is_staff
+    token['is_superuser'] = usuario.is_superuser
+    token['proyectos'] = [] if is_administrador(usuario) else sorted(proyectos_de(usuario))  # El administrador ve todo
+    token['emitido'] = time.time()  # 'iat' solo tiene segundos; la revocación necesita más precisión
+    return token
+
+
+class TokenConClaimsSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return agregar_claims(super().get_token(user), user)
+
+
+class TokenRefrescoSerializer(TokenRefreshSerializer):
+    # Al refrescar, el access token se arma con el rol y los proyectos actuales,
+    # no con los que quedaron copiados en el refresh token.
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.token_class(data.get('refresh', attrs['refresh']))
+        usuario = obtener_usuario(refresh[api_settings.USER_ID_CLAIM])
+        if usuario is None or not api_settings.USER_AUTHENTICATION_RULE(usuario):
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        data['access'] = str(agregar_claims(refresh.access_token, usuario))
+        return data
+
+
+class UsuarioToken(TokenUser):
+    # Usuario liviano construido solo con los claims del token
+    @property
+    def rol(self):
+        return self.token.get('rol', 'visor')
+
+    @property
+    def proyectos_ids(self):
+        return set(self.token.get('proyectos', []))
+
+
+class ListaRevocacion:
+    # Usuarios cuyos tokens emitidos antes de cierto instante ya no valen (cambio de rol,
+    # salida de un proyecto o desactivación). Ganar acceso no revoca: el token viejo
+    # solo ve de menos hasta el siguiente refresco. Una clave por usuario en la caché default
+    # (compartida entre procesos, ver UsuariosConfig.ready) que caduca con la vida del access
+    # token; lo consultado se recuerda en memoria `intervalo` segundos.
+    prefijo = 'jwt:revocado:'
+
+    def __init__(self, intervalo=5, maximo=10000):
+        self.intervalo = intervalo
+        self.maximo = maximo
+        self._consultados = {}  # user_id -> (instante de revocación o None, consultado_en)
+
+    def revocar(self, *user_ids):
+        ahora = time.time()
+        user_ids = [str(user_id) for user_id in user_ids if user_id is not None]
+        if not user_ids:
+            return
+        # Pasada la vida del access token, la entrada ya no puede rechazar nada
+        vida = math.ceil(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+        cache.set_many({self.prefijo + user_id: ahora for user_id in user_ids}, vida)
+        for user_id in user_ids:
+            self._consultados[user_id] = (ahora, ahora)
+
+    def esta_revocado(self, user_id, emitido):
+        user_id = str(user_id)
+        ahora = time.time()
+        revocado, consultado_en = self._consultados.get(user_id, (None, 0))
+        if ahora - consultado_en > self.intervalo:
+            revocado = cache.get(self.prefijo + user_id)
+            if len(self._consultados) >= self.maximo:
+                self._consultados.clear()
+            self._consultados[user_id] = (revocado, ahora)
+        return revocado is not None and emitido <= revocado
+
+
+lista_revocacion = ListaRevocacion()
+
+
+class JWTAutenticacionSinEstado(JWTStatelessUserAuthentication):
+    # Autentica sin tocar la base de datos: el usuario sale de los claims firmados.
+    # Los tokens sin claim 'rol' (emitidos antes de activar el modo) usan la caché.
+    def get_user(self, validated_token):
+        if 'rol' not in validated_token:
+            return JWTAutenticacionCacheada().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        emitido = validated_token.get('emitido', validated_token.get('iat', 0))
+        if lista_revocacion.esta_revocado(user_id, emitido):
+            raise InvalidToken('Token revocado')
+        return UsuarioToken(validated_token)
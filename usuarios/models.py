@@ -9,6 +9,9 @@ class Usuario(AbstractUser):
         ('visor', 'Visor'),
     )
     rol = models.CharField(max_length=20, choices=ROL_CHOICES, default='visor')
+    # Para la huella de las respuestas que muestran usuarios (proyectos/condicional.py); el
+    # last_login del inicio de sesión se guarda con update_fields y no la mueve
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     # Añade related_name para evitar conflictos con el modelo User de Django
     groups = models.ManyToManyField(
@@ -31,3 +34,8 @@ class Usuario(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['fecha_actualizacion'], name='usuario_actualizacion_idx'),
+        ]
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import BasePermission
+
+
+# Autorización centralizada. Las funciones de rol se usan con user_passes_test;
+# el usuario y su pertenencia a proyectos se guardan en caché (TTL) para no ir a
+# la base de datos en cada petición. usuarios/signals.py invalida la caché cuando
+# cambian el rol (RolUpdateView) o los colaboradores (ProyectoAsignacionUpdateView).
+# La invalidación solo llega a los demás procesos si la caché default es compartida
+# (CACHE_DEFAULT en settings); con locmem cada worker tarda hasta TTL en enterarse.
+
+TTL = getattr(settings, 'PERMISOS_CACHE_TTL', 300)
+
+
+def is_administrador(user):
+    return user.is_authenticated and user.rol == 'administrador'
+
+
+def is_colaborador_o_administrador(user):
+    return user.is_authenticated and (user.rol == 'colaborador' or user.rol == 'administrador')
+
+
+class EsColaboradorOAdministrador(BasePermission):
+    # Equivalente DRF de user_passes_test(is_colaborador_o_administrador)
+    def has_permission(self, request, view):
+        return is_colaborador_o_administrador(request.user)
+
+
+class EsAdministrador(BasePermission):
+    # Equivalente DRF de user_passes_test(is_administrador)
+    def has_permission(self, request, view):
+        return is_administrador(request.user)
+
+
+def _clave_usuario(user_id):
+    return f'permisos:usuario:{user_id}'
+
+
+def _clave_proyectos(user_id):
+    return f'permisos:proyectos:{user_id}'
+
+
+def obtener_usuario(user_id):
+    # Devuelve el Usuario desde la caché; None si no existe
+    from .models import Usuario
+
+    usuario = cache.get(_clave_usuario(user_id))
+    if usuario is None:
+        usuario = Usuario._default_manager.filter(pk=user_id).first()
+        if usuario is not None:
+            cache.set(_clave_usuario(user_id), usuario, TTL)
+    return usuario
+
+
+def proyectos_de(user):
+    # Ids de Proyecto.objects.visible_to(user) para quien no es administrador: los claims
+    # de los JWT sin estado. Las consultas filtran con visible_to directamente.
+    from proyectos.models import Proyecto
+
+    ids = getattr(user, 'proyectos_ids', None)  # UsuarioToken: vienen en el token
+    if ids is not None:
+        return ids
+    ids = cache.get(_clave_proyectos(user.pk))
+    if ids is None:
+        ids = set(Proyecto.objects.visible_to(user).values_list('pk', flat=True))
+        cache.set(_clave_proyectos(user.pk), ids, TTL)
+    return ids
+
+
+def invalidar_permisos(*user_ids):
+    claves = []
+    for user_id in user_ids:
+        if user_id is not None:
+            claves += [_clave_usuario(user_id), _clave_proyectos(user_id)]
+    cache.delete_many(claves)
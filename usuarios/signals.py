@@ -0,0 +1,59 @@
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from proyectos.models import Proyecto
+from .autenticacion import lista_revocacion
+from .models import Usuario
+from .permisos import invalidar_permisos
+
+
+# Invalida la caché de usuarios.permisos cuando cambian roles o asignaciones.
+# Si el usuario pierde permisos también se revocan sus JWT sin estado emitidos antes
+# del cambio, porque sus claims quedaron viejos.
+
+def revocar_permisos(*user_ids):
+    invalidar_permisos(*user_ids)
+    lista_revocacion.revocar(*user_ids)
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def usuario_modificado(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return  # Inicio de sesión: no cambia nada de lo que está en caché ni en los claims
+    revocar_permisos(instance.pk)
+
+
+@receiver(m2m_changed, sender=Proyecto.colaboradores.through)
+def colaboradores_modificados(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # En clear() no llega pk_set: se toman los colaboradores antes de borrarlos
+        if reverse:
+            revocar_permisos(instance.pk)
+        else:
+            revocar_permisos(*instance.colaboradores.values_list('pk', flat=True))
+    elif action == 'post_remove':
+        revocar_permisos(*([instance.pk] if reverse else pk_set))
+    elif action == 'post_add':
+        invalidar_permisos(*([instance.pk] if reverse else pk_set))
+
+
+@receiver(pre_save, sender=Proyecto)
+def proyecto_por_guardar(sender, instance, raw=False, **kwargs):
+    # Si cambia el creador, el anterior pierde el proyecto
+    if instance.pk and not raw:
+        instance._creado_por_anterior = (
+            Proyecto.objects.filter(pk=instance.pk).values_list('creado_por', flat=True).first())
+
+
+@receiver(post_save, sender=Proyecto)
+def proyecto_guardado(sender, instance, **kwargs):
+    invalidar_permisos(instance.creado_por_id)
+    anterior = getattr(instance, '_creado_por_anterior', None)
+    if anterior is not None and anterior != instance.creado_por_id:
+        revocar_permisos(anterior)
+
+
+@receiver(pre_delete, sender=Proyecto)
+def proyecto_eliminado(sender, instance, **kwargs):
+    invalidar_permisos(instance.creado_por_id, *instance.colaboradores.values_list('pk', flat=True))
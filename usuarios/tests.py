@@ -1,3 +1,73 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .autenticacion import ListaRevocacion
+from .models import Usuario
+
+
+class BackendsTests(TestCase):
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('colaborador', password='clave', rol='colaborador')
+
+    def test_el_login_usa_el_backend_cacheado(self):
+        self.assertTrue(self.client.login(username='colaborador', password='clave'))
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'usuarios.autenticacion.BackendCacheado')
+
+    def test_sesiones_abiertas_con_model_backend_siguen_valiendo(self):
+        sesion = self.client.session
+        sesion[SESSION_KEY] = str(self.usuario.pk)
+        sesion[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        sesion[HASH_SESSION_KEY] = self.usuario.get_session_auth_hash()
+        sesion.save()
+        response = self.client.get('/badgets/')
+        self.assertEqual(response.wsgi_request.user, self.usuario)
+
+
+class ListaRevocacionTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_revocaciones_de_procesos_distintos_no_se_pisan(self):
+        # Dos listas con la misma caché: como dos workers
+        emitido = time.time()
+        uno, otro = ListaRevocacion(), ListaRevocacion()
+        uno.revocar(1)
+        otro.revocar(2)
+        tercero = ListaRevocacion()
+        self.assertTrue(tercero.esta_revocado(1, emitido))
+        self.assertTrue(tercero.esta_revocado('2', emitido))
+        self.assertFalse(tercero.esta_revocado(3, emitido))
+
+    def test_los_tokens_emitidos_despues_valen(self):
+        lista = ListaRevocacion()
+        lista.revocar(1)
+        self.assertFalse(lista.esta_revocado(1, time.time() + 1))
+
+    def test_lo_consultado_se_recuerda_intervalo_segundos(self):
+        lista = ListaRevocacion(intervalo=60)
+        self.assertFalse(lista.esta_revocado(1, time.time()))
+        ListaRevocacion().revocar(1)
+        self.assertFalse(lista.esta_revocado(1, time.time() - 1))
+        lista.intervalo = 0
+        self.assertTrue(lista.esta_revocado(1, time.time() - 1))
+
+
+class ModoSinEstadoTests(SimpleTestCase):
+
+    @override_settings(JWT_SIN_ESTADO=True)
+    def test_requiere_cache_compartida(self):
+        with self.assertRaises(ImproperlyConfigured):
+            apps.get_app_config('usuarios').ready()
+
+    @override_settings(JWT_SIN_ESTADO=True, CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/cache'},
+    })
+    def test_con_cache_compartida_arranca(self):
+        apps.get_app_config('usuarios').ready()
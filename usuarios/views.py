@@ -6,20 +6,11 @@ from django.contrib import messages
 
 from rest_framework import generics, permissions, serializers
 from .models import Usuario
+from .permisos import is_administrador, is_colaborador_o_administrador
 from api.serializer import BasicUsuarioSerializer
 from .forms import CustomUserCreationForm # Para el registro basado en la API
 
 
-# Función para verificar si el usuario es administrador
-def is_administrador(user):
-    return user.is_authenticated and user.rol == 'administrador'
-
-
-# Función para verificar si el usuario es colaborador o administrador
-def is_colaborador_o_administrador(user):
-    return user.is_authenticated and (user.rol == 'colaborador' or user.rol == 'administrador')
-
-
 def registro(request):
     error = None
     if request.method == 'POST':